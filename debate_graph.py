@@ -0,0 +1,133 @@
+"""
+Debate graph factory for the Multi-Agent Debate DAG
+Builds and compiles the LangGraph workflow once per process and shares it across runs
+"""
+
+import string
+import threading
+from typing import Dict, List, Tuple, Union
+from utils.state import DebateState
+from utils.config import Config
+from utils.logger import RunLogger
+from utils import llm
+from utils.tracing import traced
+from nodes.user_input_node import UserInputNode
+from nodes.persona_agent_node import PersonaAgentNode
+from nodes.debate_controller import DebateController
+from nodes.memory_node import MemoryNode
+from nodes.judge_node import JudgeNode
+from nodes.summary_node import RunningSummaryNode
+
+class DebateGraph:
+    """Node instances and the compiled workflow shared by every debate run
+
+    Nodes hold no per-run state: inputs travel in DebateState and events go
+    through a RunLogger to whichever DebateLogger the caller bound for the run.
+    """
+
+    def __init__(self, async_mode: bool = False):
+        self.async_mode = async_mode
+        self.logger = RunLogger()
+        self._initialize_nodes()
+        self._create_graph()
+        self._add_graph_edges()
+        self.app = self.workflow.compile()
+
+    def _initialize_nodes(self):
+        """Initialize all debate nodes"""
+        self.user_input = UserInputNode(self.logger)
+        # One node argues for every persona; the two-seat names point at it too
+        self.agent = PersonaAgentNode(self.logger)
+        self.agent_a = self.agent_b = self.agent
+        self.controller = DebateController(self.logger)
+        self.memory = MemoryNode(self.logger)
+        self.judge = JudgeNode(self.logger)
+        self.summarizer = RunningSummaryNode(self.logger)
+
+    def _create_graph(self):
+        """Create the LangGraph workflow"""
+        # Imported here so --help and other paths that never build a graph start fast
+        from langgraph.graph import StateGraph
+
+        # Initialize the state graph
+        workflow = StateGraph(DebateState)
+
+        # Add nodes to the graph (LLM-backed nodes use their async variants
+        # in async mode so model calls don't block the event loop).
+        # Every node is wrapped in a latency span logged as a SPAN event.
+        def add_node(name, fn):
+            workflow.add_node(name, traced(name, fn, self.logger))
+
+        add_node("user_input", self.user_input.execute)
+        # Spans are named per seat (agent_a, agent_b, ...) so each persona's latency stays visible
+        workflow.add_node("agent", traced(lambda state: seat_node(state["speaker"]),
+                                          self.agent.aexecute if self.async_mode else self.agent.execute,
+                                          self.logger))
+        add_node("controller", self.controller.execute)
+        add_node("memory", self.memory.execute)
+        add_node("judge", self.judge.aexecute if self.async_mode else self.judge.execute)
+        add_node("summarizer", self.summarizer.aexecute if self.async_mode else self.summarizer.execute)
+
+        self.workflow = workflow
+
+    def _add_graph_edges(self):
+        """Add edges and conditional logic to the graph"""
+        from langgraph.graph import START, END
+
+        # Start with user input
+        self.workflow.add_edge(START, "user_input")
+
+        # After user input, go to controller
+        self.workflow.add_edge("user_input", "controller")
+
+        # From controller, fan out to the agent once per next speaker, or on to the judge
+        self.workflow.add_conditional_edges("controller", route_to_agent, ["agent", "summarizer", "judge"])
+
+        # Once every speaker of the step is done, update memory then back to controller
+        self.workflow.add_edge("agent", "memory")
+        self.workflow.add_edge("summarizer", "memory")
+        self.workflow.add_edge("memory", "controller")
+
+        # Judge ends the debate
+        self.workflow.add_edge("judge", END)
+
+def route_to_agent(state: DebateState) -> Union[str, List]:
+    """Determine which node to route to based on state
+
+    Each next speaker gets its own agent task (a Send), so the speakers of a
+    parallel round run concurrently and the step takes as long as the slowest.
+    With Config.RUNNING_SUMMARY the summarizer joins the same step, folding the
+    turns that just landed into the running summary in the background.
+    """
+    from langgraph.types import Send
+
+    # If debate is complete, go to judge
+    if state["is_complete"] or not state.get("next_speakers"):
+        return "judge"
+
+    sends = [Send("agent", {**state, "speaker": seat}) for seat in state["next_speakers"]]
+    if Config.RUNNING_SUMMARY and len(state["turns"]) > state.get("summarized_turns", 0):
+        sends.append(Send("summarizer", state))
+    return sends
+
+def seat_node(seat: int) -> str:
+    """Span name of a persona seat: agent_a, agent_b, ..."""
+    return f"agent_{string.ascii_lowercase[seat]}" if seat < 26 else f"agent_{seat + 1}"
+
+# Compiled graphs of this process, one per execution mode and backend setup
+_graphs: Dict[Tuple, DebateGraph] = {}
+_graphs_lock = threading.Lock()
+
+def _graph_key(async_mode: bool) -> Tuple:
+    # Nodes choose between a model and Mock Mode when built, so a backend change needs a new graph
+    return (async_mode, Config.LLM_BACKEND, llm.model_available(), Config.GEMINI_MODEL)
+
+def get_debate_graph(async_mode: bool = False) -> DebateGraph:
+    """Return this process's compiled debate graph, building it on first use"""
+    key = _graph_key(async_mode)
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            graph = DebateGraph(async_mode=async_mode)
+            _graphs[key] = graph
+        return graph
@@ -5,125 +5,267 @@ Main application file
 """
 
 import sys
+import asyncio
 import argparse
 import random
-from langgraph.graph import StateGraph, START, END
+import sqlite3
+from typing import List
 from utils.state import DebateState, create_initial_state
-from utils.logger import DebateLogger
+from utils.logger import DebateLogger, flush_buffered_logs, bind_logger, unbind_logger
 from utils.config import Config
-from nodes.user_input_node import UserInputNode
-from nodes.agent_a_node import AgentANode
-from nodes.agent_b_node import AgentBNode
-from nodes.debate_controller import DebateController
-from nodes.memory_node import MemoryNode
-from nodes.judge_node import JudgeNode
+from utils import llm
+from utils.tracing import start_recording, stop_recording
+from utils.scheduler import start_retry_budget, stop_retry_budget
+from utils.checkpoints import get_checkpointer, open_async_checkpointer
+from utils.results import get_results_store, result_from_state
+from debate_graph import DebateGraph, get_debate_graph
 
 class DebateSystem:
-    def __init__(self):
-        # Initialize logger with configured path
-        self.logger = DebateLogger(log_file=Config.LOG_PATH)
-        self._initialize_nodes()
-        self._create_graph()
-    
-    def _initialize_nodes(self):
-        """Initialize all debate nodes"""
-        self.user_input = UserInputNode(self.logger)
-        self.agent_a = AgentANode(self.logger)
-        self.agent_b = AgentBNode(self.logger)
-        self.controller = DebateController(self.logger)
-        self.memory = MemoryNode(self.logger)
-        self.judge = JudgeNode(self.logger)
-    
-    def _create_graph(self):
-        """Create the LangGraph workflow"""
-        # Initialize the state graph
-        workflow = StateGraph(DebateState)
-        
-        # Add nodes to the graph
-        workflow.add_node("user_input", self.user_input.execute)
-        workflow.add_node("agent_a", self.agent_a.execute)
-        workflow.add_node("agent_b", self.agent_b.execute)
-        workflow.add_node("controller", self.controller.execute)
-        workflow.add_node("memory", self.memory.execute)
-        workflow.add_node("judge", self.judge.execute)
-        
-        self.workflow = workflow
-
-    def _add_graph_edges(self):
-        """Add edges and conditional logic to the graph"""
-        
-        # Start with user input
-        self.workflow.add_edge(START, "user_input")
-        
-        # After user input, go to controller
-        self.workflow.add_edge("user_input", "controller")
-        
-        # From controller, decide which agent should speak
-        self.workflow.add_conditional_edges(
-            "controller",
-            self._route_to_agent,
-            {
-                "agent_a": "agent_a",
-                "agent_b": "agent_b", 
-                "judge": "judge"
-            }
-        )
-        
-        # After each agent, update memory then back to controller
-        self.workflow.add_edge("agent_a", "memory")
-        self.workflow.add_edge("agent_b", "memory")
-        self.workflow.add_edge("memory", "controller")
-        
-        # Judge ends the debate
-        self.workflow.add_edge("judge", END)
-        
-        # Compile the graph
-        self.app = self.workflow.compile()
-    
-    def _route_to_agent(self, state: DebateState) -> str:
-        """Determine which node to route to based on state"""
-        
-        # If debate is complete, go to judge
-        if state["is_complete"]:
-            return "judge"
-        
-        # Route to appropriate agent based on current_agent
-        if state["current_agent"].value == Config.AGENT_A_PERSONA:
-            return "agent_a"
-        elif state["current_agent"].value == Config.AGENT_B_PERSONA:
-            return "agent_b"
-        else:
-            return "judge"  # Fallback
+    def __init__(self, log_path: str = None, async_mode: bool = False, graph: DebateGraph = None,
+                 logger: DebateLogger = None):
+        # Initialize logger with configured path (or use the caller's, e.g. one streaming events)
+        self.logger = logger or DebateLogger(log_file=log_path or Config.LOG_PATH)
+        self.log_path = self.logger.log_file
+        self.async_mode = async_mode
+        
+        # The compiled graph is built once per process and shared by every run
+        self.graph = graph or get_debate_graph(async_mode)
+        self.app = self.graph.app
+        self.debate_id = None  # id of the latest run, used to resume it
+    
+    def _prepare_run(self, topic: str = None, agent_a_persona: str = None,
+                     agent_b_persona: str = None, seed: int = None, max_rounds: int = None,
+                     personas: List[str] = None) -> DebateState:
+        """Build the initial state for a run
+        
+        Per-run inputs default to the global Config so the CLI behaves as before,
+        while callers such as the tournament runner can vary them per debate.
+        personas (two or more, in speaking order) takes the place of the two seats.
+        """
+        if personas is not None and (len(personas) < 2 or len(set(personas)) < len(personas)):
+            raise ValueError("A debate needs at least two distinct personas")
+        topic = topic or Config.TOPIC
+        print(f"Initializing Multi-Agent Debate System (Topic: {topic})...")
+        
+        # Initialize state
+        initial_state = create_initial_state()
+        self.debate_id = initial_state["debate_id"]
+        print(f"Debate ID: {self.debate_id}")
+        # Log events carry the debate id, so one run can be read back from a shared log
+        self.logger.start_run(self.debate_id)
+        initial_state["topic"] = topic
+        if personas: initial_state["personas"] = list(personas)
+        if agent_a_persona: initial_state["personas"][0] = agent_a_persona
+        if agent_b_persona: initial_state["personas"][1] = agent_b_persona
+        initial_state["agent_a_persona"], initial_state["agent_b_persona"] = initial_state["personas"][:2]
+        if seed is not None: initial_state["seed"] = seed
+        if max_rounds: initial_state["max_rounds"] = max_rounds
+        return initial_state
+    
+    def _run_config(self, state: DebateState) -> dict:
+        # Checkpoints are keyed by debate_id, which is also the id to resume with
+        return {
+            "recursion_limit": self._recursion_limit(state),
+            "configurable": {"thread_id": state["debate_id"]}
+        }
+    
+    def _with_checkpointer(self, checkpointer):
+        """The shared compiled app, bound to checkpointer for this run (a cheap copy)"""
+        if checkpointer is None:
+            return self.app
+        return self.app.copy(update={"checkpointer": checkpointer})
+    
+    def _check_resumable(self, debate_id: str, snapshot) -> dict:
+        if not snapshot.values:
+            raise ValueError(f"No checkpoint found for debate {debate_id}")
+        if not snapshot.next:
+            raise ValueError(f"Debate {debate_id} already finished")
+        
+        self.debate_id = debate_id
+        self.logger.start_run(debate_id)
+        turns = len(snapshot.values["turns"])
+        print(f"Resuming debate {debate_id} after {turns} turns (next: {', '.join(snapshot.next)})...")
+        self.logger.log_step("RESUME", {"debate_id": debate_id, "turns": turns, "next": list(snapshot.next)})
+        return self._run_config(snapshot.values)
+    
+    def _resume_point(self, app, debate_id: str) -> dict:
+        """Run config that continues debate_id from its last checkpoint"""
+        if app.checkpointer is None:
+            raise ValueError("Checkpointing is disabled (set CHECKPOINT_ENABLED=true)")
+        return self._check_resumable(debate_id, app.get_state({"configurable": {"thread_id": debate_id}}))
+    
+    async def _aresume_point(self, app, debate_id: str) -> dict:
+        if app.checkpointer is None:
+            raise ValueError("Checkpointing is disabled (set CHECKPOINT_ENABLED=true)")
+        snapshot = await app.aget_state({"configurable": {"thread_id": debate_id}})
+        return self._check_resumable(debate_id, snapshot)
+    
+    def _discard_checkpoints(self, app):
+        # A finished debate has nothing to resume; keep the store small
+        if app.checkpointer is not None:
+            app.checkpointer.delete_thread(self.debate_id)
+    
+    async def _adiscard_checkpoints(self, app):
+        if app.checkpointer is not None:
+            await app.checkpointer.adelete_thread(self.debate_id)
+    
+    def _recursion_limit(self, state: DebateState) -> int:
+        """Graph steps a full debate needs: controller, agent and memory per turn, plus setup and judging
+        
+        An upper bound: a parallel round takes three steps for all of its turns.
+        """
+        return max(50, 3 * state["max_rounds"] + 10)
+    
+    def _finish_run(self, final_state: DebateState) -> DebateState:
+        # Final logging
+        self.logger.log_step("DEBATE_COMPLETE", 
+                           f"Final winner: {final_state['winner']}")
+        
+        cache = llm.get_cache()
+        if cache:
+            self.logger.log_step("CACHE_STATS", cache.stats())
+        
+        self._record_result(final_state)
+        
+        print(f"\n🎉 Debate completed successfully!")
+        print(f"📝 Full log saved to: {self.log_path}")
+        
+        return final_state
+    
+    def _record_result(self, final_state: DebateState):
+        """Add the finished debate to the results store (a write failure doesn't fail the run)"""
+        store = get_results_store()
+        if not store:
+            return
+        model = llm.get_model(Config.GEMINI_MODEL).model_name if llm.model_available() else "mock"
+        try:
+            store.record(result_from_state(final_state, log_path=self.log_path, model=model))
+        except sqlite3.Error as e:
+            print(f"⚠️ Warning: failed to record debate result in {store.path}: {e}")
     
-    def run_debate(self):
+    def _fail_run(self, e: Exception):
+        error_msg = f"Debate execution failed: {str(e)}"
+        print(f"❌ {error_msg}")
+        self.logger.log_step("ERROR", error_msg)
+        if Config.CHECKPOINT_ENABLED and self.debate_id:
+            print(f"💾 Progress is checkpointed. Resume with: python main.py --resume {self.debate_id}")
+        return None
+    
+    def _report_spans(self, recording):
+        """Log and print where this run's time went, per node"""
+        recorder = stop_recording(recording)
+        if not recorder or not recorder.spans:
+            return
+        self.logger.log_step("SPAN_SUMMARY", recorder.summary())
+        if Config.SPAN_SUMMARY:
+            print("\n⏱️ Node timing summary:")
+            print(recorder.format_table())
+    
+    def run_debate(self, topic: str = None, agent_a_persona: str = None,
+                   agent_b_persona: str = None, seed: int = None, max_rounds: int = None,
+                   personas: List[str] = None):
         """Execute the complete debate workflow"""
         
+        recording = start_recording()
+        # Events from the shared graph's nodes go to this system's log
+        bound = bind_logger(self.logger)
+        # Model call retries are capped per debate, not just per call
+        budget = start_retry_budget()
         try:
-            print(f"Initializing Multi-Agent Debate System (Topic: {Config.TOPIC})...")
-            self._add_graph_edges()
+            initial_state = self._prepare_run(topic, agent_a_persona, agent_b_persona, seed, max_rounds, personas)
+            
+            # State is checkpointed after every node so a failed run can be resumed
+            app = self._with_checkpointer(get_checkpointer())
+            final_state = app.invoke(initial_state, config=self._run_config(initial_state))
+            self._discard_checkpoints(app)
+            
+            return self._finish_run(final_state)
+            
+        except Exception as e:
+            return self._fail_run(e)
+        finally:
+            stop_retry_budget(budget)
+            unbind_logger(bound)
+            self._report_spans(recording)
+            self.logger.end_run()
+    
+    def resume_debate(self, debate_id: str):
+        """Continue a failed or interrupted debate from its last checkpoint"""
+        
+        recording = start_recording()
+        bound = bind_logger(self.logger)
+        budget = start_retry_budget()
+        try:
+            app = self._with_checkpointer(get_checkpointer())
+            config = self._resume_point(app, debate_id)
+            
+            # No input: the graph picks up at the node that didn't complete
+            final_state = app.invoke(None, config=config)
+            self._discard_checkpoints(app)
+            
+            return self._finish_run(final_state)
             
-            # Initialize state
-            initial_state = create_initial_state()
-            initial_state["topic"] = Config.TOPIC
+        except Exception as e:
+            return self._fail_run(e)
+        finally:
+            stop_retry_budget(budget)
+            unbind_logger(bound)
+            self._report_spans(recording)
+            self.logger.end_run()
+    
+    async def arun_debate(self, topic: str = None, agent_a_persona: str = None,
+                          agent_b_persona: str = None, seed: int = None, max_rounds: int = None,
+                          personas: List[str] = None):
+        """Execute the complete debate workflow on the running event loop
+        
+        Requires a DebateSystem created with async_mode=True.
+        """
+        
+        recording = start_recording()
+        # Events from the shared graph's nodes go to this system's log
+        bound = bind_logger(self.logger)
+        # Model call retries are capped per debate, not just per call
+        budget = start_retry_budget()
+        try:
+            initial_state = self._prepare_run(topic, agent_a_persona, agent_b_persona, seed, max_rounds, personas)
             
-            # Run the workflow with increased recursion limit
-            config = {"recursion_limit": 50}
-            final_state = self.app.invoke(initial_state, config=config)
+            async with open_async_checkpointer() as checkpointer:
+                app = self._with_checkpointer(checkpointer)
+                final_state = await app.ainvoke(initial_state, config=self._run_config(initial_state))
+                await self._adiscard_checkpoints(app)
             
-            # Final logging
-            self.logger.log_step("DEBATE_COMPLETE", 
-                               f"Final winner: {final_state['winner']}")
+            return self._finish_run(final_state)
             
-            print(f"\n🎉 Debate completed successfully!")
-            print(f"📝 Full log saved to: {Config.LOG_PATH}")
+        except Exception as e:
+            return self._fail_run(e)
+        finally:
+            stop_retry_budget(budget)
+            unbind_logger(bound)
+            self._report_spans(recording)
+            self.logger.end_run()
+    
+    async def aresume_debate(self, debate_id: str):
+        """Async variant of resume_debate (requires async_mode=True)"""
+        
+        recording = start_recording()
+        bound = bind_logger(self.logger)
+        budget = start_retry_budget()
+        try:
+            async with open_async_checkpointer() as checkpointer:
+                app = self._with_checkpointer(checkpointer)
+                config = await self._aresume_point(app, debate_id)
+                final_state = await app.ainvoke(None, config=config)
+                await self._adiscard_checkpoints(app)
             
-            return final_state
+            return self._finish_run(final_state)
             
         except Exception as e:
-            error_msg = f"Debate execution failed: {str(e)}"
-            print(f"❌ {error_msg}")
-            self.logger.log_step("ERROR", error_msg)
-            return None
+            return self._fail_run(e)
+        finally:
+            stop_retry_budget(budget)
+            unbind_logger(bound)
+            self._report_spans(recording)
+            self.logger.end_run()
 
 def parse_arguments():
     """Parse CLI arguments"""
@@ -133,7 +275,37 @@ def parse_arguments():
     parser.add_argument('--log-path', type=str, help='Path to log file')
     parser.add_argument('--agent-a', type=str, help='Persona for Agent A')
     parser.add_argument('--agent-b', type=str, help='Persona for Agent B')
-    return parser.parse_args()
+    parser.add_argument('--personas', type=str, nargs='+', metavar='PERSONA',
+                        help='Two or more personas in speaking order (replaces --agent-a/--agent-b)')
+    parser.add_argument('--parallel-rounds', choices=['none', 'opening', 'all'],
+                        help='Rounds whose turns are generated in parallel')
+    parser.add_argument('--judge-mode', choices=['sequential', 'concurrent', 'structured'],
+                        help='How the judge requests its summary and verdict')
+    parser.add_argument('--judge-panel', type=int, metavar='K',
+                        help='Judges voting on the winner (early-stopping majority; default: one judge)')
+    parser.add_argument('--running-summary', action=argparse.BooleanOptionalAction, default=None,
+                        help='Summarize the debate as it runs and give the judge the summary instead of every turn')
+    parser.add_argument('--cache', action=argparse.BooleanOptionalAction, default=None,
+                        help='Serve repeated model calls from the on-disk response cache')
+    parser.add_argument('--cache-path', type=str, help='Path to the SQLite response cache')
+    parser.add_argument('--buffered-log', action=argparse.BooleanOptionalAction, default=None,
+                        help='Queue log events and write them in batches from a background thread')
+    parser.add_argument('--stream', action=argparse.BooleanOptionalAction, default=None,
+                        help='Print agent and judge output as it streams from the model')
+    parser.add_argument('--async', dest='async_mode', action='store_true',
+                        help='Run model calls through the asyncio execution path')
+    parser.add_argument('--resume', type=str, metavar='DEBATE_ID',
+                        help='Continue a failed or interrupted debate from its last checkpoint')
+    parser.add_argument('--checkpoint', action=argparse.BooleanOptionalAction, default=None,
+                        help='Checkpoint debate state to SQLite after every node')
+    parser.add_argument('--results', action=argparse.BooleanOptionalAction, default=None,
+                        help='Record the completed debate in the SQLite results store')
+    parser.add_argument('--backend', choices=['gemini', 'fake'],
+                        help='Model backend ("fake" runs offline against a local stand-in model)')
+    args = parser.parse_args()
+    if args.judge_panel and args.judge_panel > 1 and (args.judge_mode or Config.JUDGE_MODE) == "structured":
+        parser.error("--judge-panel needs the sequential or concurrent judge mode")
+    return args
 
 def main():
     """Main entry point"""
@@ -148,12 +320,40 @@ def main():
     if args.log_path: config_updates['LOG_PATH'] = args.log_path
     if args.agent_a: config_updates['AGENT_A_PERSONA'] = args.agent_a
     if args.agent_b: config_updates['AGENT_B_PERSONA'] = args.agent_b
+    if args.personas: config_updates['PERSONAS'] = args.personas
+    if args.parallel_rounds: config_updates['PARALLEL_ROUNDS'] = args.parallel_rounds
+    if args.judge_mode: config_updates['JUDGE_MODE'] = args.judge_mode
+    if args.judge_panel is not None: config_updates['JUDGE_PANEL_SIZE'] = args.judge_panel
+    if args.running_summary is not None: config_updates['RUNNING_SUMMARY'] = args.running_summary
+    if args.cache is not None: config_updates['CACHE_ENABLED'] = args.cache
+    if args.cache_path: config_updates['CACHE_PATH'] = args.cache_path
+    if args.buffered_log is not None: config_updates['LOG_BUFFERED'] = args.buffered_log
+    if args.stream is not None: config_updates['STREAM'] = args.stream
+    if args.backend: config_updates['LLM_BACKEND'] = args.backend
+    if args.checkpoint is not None: config_updates['CHECKPOINT_ENABLED'] = args.checkpoint
+    elif args.resume: config_updates['CHECKPOINT_ENABLED'] = True  # keep checkpointing the resumed run
+    if args.results is not None: config_updates['RESULTS_ENABLED'] = args.results
     
     Config.update(**config_updates)
     
     try:
-        debate_system = DebateSystem()
-        final_state = debate_system.run_debate()
+        if args.async_mode:
+            debate_system = DebateSystem(async_mode=True)
+            if args.resume:
+                final_state = asyncio.run(debate_system.aresume_debate(args.resume))
+            else:
+                final_state = asyncio.run(debate_system.arun_debate())
+        else:
+            debate_system = DebateSystem()
+            if args.resume:
+                final_state = debate_system.resume_debate(args.resume)
+            else:
+                final_state = debate_system.run_debate()
+        
+        cache = llm.get_cache()
+        if cache:
+            stats = cache.stats()
+            print(f"💾 Response cache: {stats['hits']} hits, {stats['misses']} misses")
         
         if final_state:
             return 0  # Success
@@ -162,6 +362,7 @@ def main():
             
     except KeyboardInterrupt:
         print("\n\nDebate interrupted by user.")
+        flush_buffered_logs()  # Don't lose queued events of the interrupted run
         return 1
     except Exception as e:
         print(f"Fatal error: {str(e)}")
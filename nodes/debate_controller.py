@@ -1,17 +1,33 @@
-from utils.state import DebateState, AgentType
+import threading
+from collections import OrderedDict
+from typing import List
+from utils.state import DebateState, AgentType, debate_personas
 from utils.config import Config
 from utils.logger import DebateLogger
+from utils.text import RepetitionIndex, coherence_scorer
 
 class DebateController:
+    # Upper bound on per-debate indexes kept for debates that never completed
+    MAX_TRACKED_DEBATES = 1024
+    
     def __init__(self, logger: DebateLogger):
         self.logger = logger
+        self._repetition_indexes = OrderedDict()
+        # One controller serves every debate running on the shared graph
+        self._indexes_lock = threading.Lock()
     
     def execute(self, state: DebateState) -> DebateState:
         """Control debate flow and turn management"""
         
-        # Enforce strict 8-round limit (4 per agent = 8 turns total)
-        if len(state["turns"]) >= Config.MAX_ROUNDS:
+        # Score the topic drift of every turn added since the last step (a parallel
+        # round adds several) and keep each score with its turn
+        drift_scores = self._score_drift(state)
+        
+        # Enforce strict round limit (default 8: 4 per agent = 8 turns total)
+        if len(state["turns"]) >= state.get("max_rounds", Config.MAX_ROUNDS):
             state["is_complete"] = True
+            with self._indexes_lock:
+                self._repetition_indexes.pop(state.get("debate_id"), None)
             self.logger.log_step("DEBATE_COMPLETE", 
                                f"Debate completed after {len(state['turns'])} turns")
             print("=== DEBATE COMPLETED ===\n")
@@ -22,73 +38,107 @@ class DebateController:
             self.logger.log_step("WARNING", "Repetitive argument detected.")
             print("⚠️ Warning: Argument repetition detected.")
 
-        if not self._check_coherence(state):
-            self.logger.log_step("WARNING", "Topic drift detected.")
-            print("⚠️ Warning: Argument may be drifting from the topic.")
+        for drift_score in drift_scores:
+            if drift_score >= Config.DRIFT_THRESHOLD:
+                self.logger.log_step("WARNING", f"Topic drift detected (drift score {drift_score:.2f}).")
+                print("⚠️ Warning: Argument may be drifting from the topic.")
 
-        # For the very first call, let scientist go first
-        if len(state["turns"]) == 0:
-            state["current_agent"] = AgentType.SCIENTIST
-            state["current_round"] = 1
-            return state
-            
-        # Strict Turn Enforcement:
-        # If the last speaker was Scientist, next MUST be Philosopher
-        last_turn = state["turns"][-1]
-        if last_turn["agent"] == Config.AGENT_A_PERSONA:
-             state["current_agent"] = AgentType.PHILOSOPHER
-        else:
-             state["current_agent"] = AgentType.SCIENTIST
+        personas = debate_personas(state)
+        state["next_speakers"] = self._next_speakers(state, personas)
+        # Two-seat view of the (first) next speaker, for callers of the Scientist/Philosopher API
+        agent_types = list(AgentType)
+        first = state["next_speakers"][0]
+        state["current_agent"] = agent_types[first] if first < len(agent_types) else None
         
         # Update round number (1-indexed)
         # 1-2 turns = Round 1
-        # 3-4 turns = Round 2 ...
-        state["current_round"] = (len(state["turns"]) // 2) + 1
+        # 3-4 turns = Round 2 ... (with N personas, N turns per round)
+        state["current_round"] = (len(state["turns"]) // len(personas)) + 1
+        
+        # For the very first call, the opening speaker(s) need no announcement
+        if len(state["turns"]) == 0:
+            return state
         
         # Log current state
         self.logger.log_step("CONTROLLER", {
             "round": state["current_round"],
-            "next_agent": state["current_agent"].value,
+            "next_agent": ", ".join(personas[seat] for seat in state["next_speakers"]),
             "turns_count": len(state["turns"])
         })
         
         return state
+    
+    def _next_speakers(self, state: DebateState, personas: List[str]) -> List[int]:
+        """Seats that speak next: every seat of a parallel round, else the next in order"""
+        turns = len(state["turns"])
+        if turns % len(personas) == 0 and self._parallel_round(turns // len(personas) + 1):
+            # Don't overshoot the turn limit in the last round
+            remaining = state.get("max_rounds", Config.MAX_ROUNDS) - turns
+            return list(range(len(personas)))[:remaining]
+        
+        # Strict Turn Enforcement: personas speak in seat order, the first seat after the last
+        if not turns:
+            return [0]
+        last_agent = state["turns"][-1]["agent"]
+        last_seat = personas.index(last_agent) if last_agent in personas else -1
+        return [(last_seat + 1) % len(personas)]
+    
+    def _parallel_round(self, round_num: int) -> bool:
+        """Whether a round's turns are independent, so they can be generated at once"""
+        mode = Config.PARALLEL_ROUNDS
+        return mode == "all" or (mode == "opening" and round_num == 1)
 
-    def _check_coherence(self, state: DebateState) -> bool:
-        """Lightweight check for topic drift"""
-        if not state["turns"] or not state["topic"]:
-            return True
-            
-        latest_arg = state["turns"][-1]["text"].lower()
-        topic_words = set(w for w in state["topic"].lower().split() if len(w) > 2)
+    def _score_drift(self, state: DebateState) -> List[float]:
+        """Drift of each unscored argument from the topic (0.0 on topic, 1.0 fully off)
         
-        if not topic_words:
-            return True
+        Unscored turns are the ones added since the last step, at the end of turns.
+        The score is stored on the turn's own drift_score field (a top-level key of
+        Turn.to_dict() in logs and reports), not in a meta dict.
+        """
+        turns = state["turns"]
+        if not turns or not state["topic"]:
+            return []
             
-        # Check if at least one key topic word is mentioned
-        return any(word in latest_arg for word in topic_words)
+        # Topic model is built once per topic and shared across calls
+        scorer = coherence_scorer(state["topic"])
+        if not scorer.topic_stems:
+            return []  # nothing to drift from (a topic made only of stopwords)
+        
+        start = len(turns)
+        while start > 0 and turns[start - 1].get("drift_score") is None:
+            start -= 1
+        scores = []
+        for turn in turns[start:]:
+            score = scorer.drift_score(turn["text"])
+            turn["drift_score"] = round(score, 3)
+            scores.append(score)
+        return scores
 
     def _check_repetition(self, state: DebateState) -> bool:
         """Check if the latest argument is substantially repeated"""
         if len(state["turns"]) < 2:
             return False
             
-        latest_arg = state["turns"][-1]["text"].lower()
-        previous_args = [t["text"].lower() for t in state["turns"][:-1]]
+        # Index every turn except the latest, then probe it with the latest
+        index = self._repetition_index(state)
+        index.extend(t["text"] for t in state["turns"][index.size:-1])
         
-        # Basic word overlap check
-        latest_words = set(w for w in latest_arg.split() if len(w) > 3)
-        if not latest_words:
-            return False
-            
-        for prev_arg in previous_args:
-            prev_words = set(w for w in prev_arg.split() if len(w) > 3)
-            if not prev_words:
-                continue
-                
-            overlap = len(latest_words.intersection(prev_words))
-            # 70% word overlap threshold for repetition
-            if overlap > len(latest_words) * 0.7:
-                return True
+        # 70% word overlap threshold for repetition
+        return index.is_repeated(state["turns"][-1]["text"])
+
+    def _repetition_index(self, state: DebateState) -> RepetitionIndex:
+        """Per-debate index, caught up incrementally as turns arrive"""
+        debate_id = state.get("debate_id")
+        if debate_id is None:
+            return RepetitionIndex(threshold=0.7)
         
-        return False
\ No newline at end of file
+        with self._indexes_lock:
+            index = self._repetition_indexes.get(debate_id)
+            # Turns were rewound (e.g. a resumed debate): rebuild from scratch
+            if index is None or index.size > len(state["turns"]) - 1:
+                index = RepetitionIndex(threshold=0.7)
+            self._repetition_indexes[debate_id] = index
+            self._repetition_indexes.move_to_end(debate_id)
+            while len(self._repetition_indexes) > self.MAX_TRACKED_DEBATES:
+                self._repetition_indexes.popitem(last=False)
+        return index
\ No newline at end of file
@@ -1,16 +1,27 @@
-import google.generativeai as genai
-from utils.state import DebateState
+import json
+import asyncio
+import threading
+import contextvars
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Optional
+from utils.state import DebateState, debate_personas
 from utils.config import Config
 from utils.logger import DebateLogger
+from utils import llm
+
+# The verdict criteria; each panel judge weighs one of them most heavily
+CRITERIA = ("logical consistency", "use of evidence/reasoning", "rebuttal effectiveness")
 
 class JudgeNode:
     def __init__(self, logger: DebateLogger):
         self.logger = logger
         self.client = None
+        self.model_name = Config.GEMINI_MODEL
         
-        if Config.GEMINI_API_KEY:
-            genai.configure(api_key=Config.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        if llm.model_available():
+            # Shared handle; the underlying client is created on the first request
+            self.model = llm.get_model(self.model_name)
             self.client = True
         else:
             print("⚠️ Warning: GEMINI_API_KEY not found. Judge running in Mock Mode.")
@@ -19,15 +30,84 @@ class JudgeNode:
         print("\n=== JUDGE EVALUATION ===")
         print("Analyzing debate arguments...\n")
         
-        # 1. Generate Summary
-        summary = self._generate_summary(state)
+        # Build the transcript once and share it between both requests
+        transcript = self._build_transcript(state)
+        self._warn_unused_panel()
+        
+        if Config.JUDGE_MODE == "structured":
+            # Summary and verdict from a single structured-output call
+            summary, verdict = self._generate_judgment(state, transcript)
+        elif Config.JUDGE_MODE == "concurrent":
+            # Summary and verdict are independent, so overlap the two round trips
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending_summary = executor.submit(contextvars.copy_context().run,
+                                                  self._generate_summary, state, transcript)
+                verdict = self._decide_winner(state, transcript)
+                summary = pending_summary.result()
+        else:
+            summary = self._generate_summary(state, transcript)
+            verdict = self._decide_winner(state, transcript)
+        
+        # 1. Record Summary
+        self._record_summary(state, summary, printed=self._streams_summary())
+        
+        # 2. Record Winner
+        self._record_verdict(state, verdict)
+        
+        return state
+
+    async def aexecute(self, state: DebateState) -> DebateState:
+        """Async variant of execute for graphs run with ainvoke"""
+        print("\n=== JUDGE EVALUATION ===")
+        print("Analyzing debate arguments...\n")
+        
+        transcript = self._build_transcript(state)
+        self._warn_unused_panel()
+        
+        if Config.JUDGE_MODE == "structured":
+            summary, verdict = await self._agenerate_judgment(state, transcript)
+        elif Config.JUDGE_MODE == "concurrent":
+            summary, verdict = await asyncio.gather(
+                self._agenerate_summary(state, transcript),
+                self._adecide_winner(state, transcript)
+            )
+        else:
+            summary = await self._agenerate_summary(state, transcript)
+            verdict = await self._adecide_winner(state, transcript)
+        
+        self._record_summary(state, summary, printed=self._streams_summary())
+        self._record_verdict(state, verdict)
+        
+        return state
+
+    def _build_transcript(self, state: DebateState) -> str:
+        turns = state["turns"]
+        if not (Config.RUNNING_SUMMARY and state.get("summary")):
+            # Build full transcript from turns
+            return "\n".join([f"{t['agent']}: {t['text']}" for t in turns])
+        
+        # Earlier turns are covered by the running summary; the latest exchange (one turn
+        # per persona) and anything not yet summarized stay verbatim
+        start = min(state.get("summarized_turns", 0), max(0, len(turns) - len(debate_personas(state))))
+        latest = "\n".join(f"{t['agent']}: {t['text']}" for t in turns[start:])
+        return f"Summary of the debate so far:\n{state['summary']}\n\nLatest exchange:\n{latest}"
+
+    def _warn_unused_panel(self):
+        if Config.JUDGE_MODE == "structured" and Config.JUDGE_PANEL_SIZE > 1:
+            print("⚠️ Warning: JUDGE_PANEL_SIZE is ignored in structured judge mode; one judge decides.")
+
+    def _streams_summary(self) -> bool:
+        """The summary is streamed to the console (the verdict is parsed first, so never is)"""
+        return bool(Config.STREAM and self.client and Config.JUDGE_MODE != "structured")
+
+    def _record_summary(self, state: DebateState, summary: str, printed: bool = False):
         state["judgment"] = summary # Store in judgment or separate field
         
         self.logger.log_step("JUDGE_SUMMARY", summary)
-        print(f"[Judge] Summary of debate:\n{summary}\n")
-        
-        # 2. Determine Winner
-        verdict = self._evaluate_winner(state)
+        if not printed:
+            print(f"[Judge] Summary of debate:\n{summary}\n")
+
+    def _record_verdict(self, state: DebateState, verdict: dict):
         state["winner"] = verdict["winner"]
         state["judgment"] += f"\n\nWinner: {verdict['winner']}\nReasoning: {verdict['reasoning']}"
         
@@ -37,92 +117,345 @@ class JudgeNode:
         print(f"[Judge] Winner: {verdict['winner']}")
         print(f"Reason: {verdict['reasoning']}\n")
         print("="*50 + "\n")
-        
-        return state
 
-    def _generate_summary(self, state: DebateState) -> str:
-        """Summarize the full debate using Gemini"""
-        
-        # Build full transcript from turns
-        transcript = "\n".join([f"{t['agent']}: {t['text']}" for t in state["turns"]])
-        
-        prompt = f"""You are an impartial Debate Judge. Summarize the following debate on '{state['topic']}' in 2-3 sentences. Focus on the main clash between the two sides.
+    def _summary_prompt(self, state: DebateState, transcript: str) -> str:
+        return f"""You are an impartial Debate Judge. Summarize the following debate on '{state['topic']}' in 2-3 sentences. Focus on the main clash between the two sides.
 
 Debate Transcript:
 {transcript}
 
 Summary:"""
 
+    def _summary_config(self):
+        return {
+            "temperature": 0.5,
+            "max_output_tokens": 200
+        }
+
+    def _mock_summary(self) -> str:
+        return "Mock Judge Summary: The debate explored various facets of the topic with both sides presenting structured arguments."
+
+    def _summary_error(self, e: Exception) -> str:
+        self.logger.log_step("ERROR_SUMMARY", f"Failed to generate summary: {str(e)}")
+        message = f"Summary generation failed: {str(e)}"
+        if self._streams_summary():
+            print(f"{message}\n")
+        return message
+
+    def _generate_summary(self, state: DebateState, transcript: str) -> str:
+        """Summarize the full debate using Gemini"""
+        
         if not self.client:
-            return "Mock Judge Summary: The debate explored various facets of the topic with both sides presenting structured arguments."
+            return self._mock_summary()
 
         try:
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.5,
-                max_output_tokens=200
-            )
-            response = self.model.generate_content(prompt, generation_config=generation_config)
-            return response.text.strip()
+            if self._streams_summary():
+                print("[Judge] Summary of debate:")
+                summary, _ = llm.generate_stream(self.model, self._summary_prompt(state, transcript),
+                                                 self._summary_config(), llm.print_chunk)
+                print("\n")
+                return summary
+            return llm.generate(self.model, self._summary_prompt(state, transcript), self._summary_config())
             
         except Exception as e:
-            self.logger.log_step("ERROR_SUMMARY", f"Failed to generate summary: {str(e)}")
-            return f"Summary generation failed: {str(e)}"
+            return self._summary_error(e)
 
-    def _evaluate_winner(self, state: DebateState) -> dict:
-        """Decide the winner using Gemini"""
+    async def _agenerate_summary(self, state: DebateState, transcript: str) -> str:
+        """Summarize the full debate using Gemini's async API"""
         
-        transcript = "\n".join([f"{t['agent']}: {t['text']}" for t in state["turns"]])
-        
-        prompt = f"""You are an expert Debate Judge. Evaluate the following debate on '{state['topic']}'.
+        if not self.client:
+            return self._mock_summary()
+
+        try:
+            if self._streams_summary():
+                print("[Judge] Summary of debate:")
+                summary, _ = await llm.agenerate_stream(self.model, self._summary_prompt(state, transcript),
+                                                        self._summary_config(), llm.print_chunk)
+                print("\n")
+                return summary
+            return await llm.agenerate(self.model, self._summary_prompt(state, transcript), self._summary_config())
+            
+        except Exception as e:
+            return self._summary_error(e)
+
+    def _verdict_prompt(self, state: DebateState, transcript: str, judge: dict = None) -> str:
+        # Panel judges each weigh one criterion most heavily; a lone judge keeps the original prompt
+        focus = f"\nWeigh {judge['criterion']} most heavily.\n" if judge else ""
+        return f"""You are an expert Debate Judge. Evaluate the following debate on '{state['topic']}'.
         
 Criteria:
 1. Logical consistency
 2. Use of evidence/reasoning
 3. Rebuttal effectiveness
-
+{focus}
 Transcript:
 {transcript}
 
-Who won? The {Config.AGENT_A_PERSONA} or the {Config.AGENT_B_PERSONA}?
+Who won? The {' or the '.join(debate_personas(state))}?
 Provide the output in this format:
 WINNER: [Persona Name]
 REASONING: [1-2 sentences explaining why]
 
 Your evaluation:"""
 
+    def _verdict_config(self, judge: dict = None):
+        return {
+            "temperature": judge["temperature"] if judge else 0.3,
+            "max_output_tokens": 250
+        }
+
+    def _verdict_model(self, judge: dict = None):
+        if judge is None or judge["model"] == self.model_name:
+            return self.model
+        return llm.get_model(judge["model"])
+
+    def _mock_verdict(self, state: DebateState) -> dict:
+        return {
+            "winner": state["agent_a_persona"],
+            "reasoning": f"Mock Evaluation: The {state['agent_a_persona']} provided more data-driven points in this simulated run."
+        }
+
+    def _parse_verdict(self, evaluation: str) -> dict:
+        # Parse the response
+        lines = evaluation.split('\n')
+        winner = "Tie"
+        reasoning = "Unable to determine winner"
+        
+        for line in lines:
+            if "WINNER:" in line:
+                winner = line.split(":", 1)[1].strip().strip("[]")
+            elif "REASONING:" in line:
+                reasoning = line.split(":", 1)[1].strip()
+        
+        return {
+            "winner": winner,
+            "reasoning": reasoning
+        }
+
+    def _verdict_error(self, e: Exception, log: bool = True) -> dict:
+        if log:
+            self.logger.log_step("ERROR_EVALUATION", f"Failed to evaluate winner: {str(e)}")
+        return {
+            "winner": "Error",
+            "reasoning": f"Evaluation failed: {str(e)}"
+        }
+
+    def _evaluate_winner(self, state: DebateState, transcript: str, judge: dict = None,
+                         decided: threading.Event = None) -> dict:
+        """Decide the winner using Gemini (as one panel judge when judge is given)
+        
+        Failures of panel votes that finish after the vote was decided aren't logged.
+        """
+        
         if not self.client:
-            return {
-                "winner": "Scientist",
-                "reasoning": "Mock Evaluation: The Scientist provided more data-driven points in this simulated run."
-            }
+            return self._mock_verdict(state)
 
         try:
-            generation_config = genai.types.GenerationConfig(
-                temperature=0.3,
-                max_output_tokens=250
-            )
-            response = self.model.generate_content(prompt, generation_config=generation_config)
-            evaluation = response.text.strip()
+            evaluation = llm.generate(self._verdict_model(judge), self._verdict_prompt(state, transcript, judge),
+                                      self._verdict_config(judge))
+            return self._parse_verdict(evaluation)
             
-            # Parse the response
-            lines = evaluation.split('\n')
-            winner = "Tie"
-            reasoning = "Unable to determine winner"
+        except Exception as e:
+            return self._verdict_error(e, log=decided is None or not decided.is_set())
+
+    async def _aevaluate_winner(self, state: DebateState, transcript: str, judge: dict = None) -> dict:
+        """Decide the winner using Gemini's async API"""
+        
+        if not self.client:
+            return self._mock_verdict(state)
+
+        try:
+            evaluation = await llm.agenerate(self._verdict_model(judge), self._verdict_prompt(state, transcript, judge),
+                                             self._verdict_config(judge))
+            return self._parse_verdict(evaluation)
             
-            for line in lines:
-                if "WINNER:" in line:
-                    winner = line.split(":", 1)[1].strip().strip("[]")
-                elif "REASONING:" in line:
-                    reasoning = line.split(":", 1)[1].strip()
+        except Exception as e:
+            return self._verdict_error(e)
+
+    def _panel_judges(self) -> List[dict]:
+        """Model, temperature and criterion of each panel judge, cycling through the configured lists"""
+        models = Config.JUDGE_PANEL_MODELS or [self.model_name]
+        temperatures = Config.JUDGE_PANEL_TEMPERATURES or [0.3]
+        return [{"judge": i + 1,
+                 "model": models[i % len(models)],
+                 "temperature": temperatures[i % len(temperatures)],
+                 "criterion": CRITERIA[i % len(CRITERIA)]}
+                for i in range(Config.JUDGE_PANEL_SIZE)]
+
+    def _vote(self, state: DebateState, verdict: dict) -> Optional[str]:
+        """Persona a verdict votes for, or None for ties, errors and unrecognised names"""
+        winner = verdict["winner"].lower()
+        personas = debate_personas(state)
+        exact = [p for p in personas if p.lower() == winner]
+        # Tolerate drift such as "The Scientist" as long as it names exactly one persona
+        named = exact or [p for p in personas if p.lower() in winner]
+        return named[0] if len(named) == 1 else None
+
+    def _tally(self, state: DebateState, verdicts: List[dict]) -> Counter:
+        return Counter(vote for vote in (self._vote(state, v) for v in verdicts) if vote is not None)
+
+    def _decided(self, state: DebateState, verdicts: List[dict], outstanding: int) -> bool:
+        """Whether the outstanding judges can no longer change the plurality winner"""
+        ranked = [count for _, count in self._tally(state, verdicts).most_common(2)] + [0, 0]
+        return ranked[0] > ranked[1] + outstanding
+
+    def _decide_winner(self, state: DebateState, transcript: str) -> dict:
+        """One judge's verdict, or the panel's vote when JUDGE_PANEL_SIZE > 1"""
+        if Config.JUDGE_PANEL_SIZE <= 1:
+            return self._evaluate_winner(state, transcript)
+        
+        judges = self._panel_judges()
+        decided = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=max(1, min(Config.JUDGE_PANEL_CONCURRENCY, len(judges))))
+        pending = {executor.submit(contextvars.copy_context().run, self._panel_vote, state, transcript, judge, decided)
+                   for judge in judges}
+        verdicts = []
+        try:
+            while pending and not self._decided(state, verdicts, len(pending)):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                verdicts.extend(future.result() for future in done)
+        finally:
+            # Queued judges never start. Blocking calls already in flight can't be
+            # interrupted, so they finish in the background: their votes are dropped
+            # and, with decided set, their failures aren't logged
+            decided.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        return self._record_panel(state, judges, verdicts)
+
+    async def _adecide_winner(self, state: DebateState, transcript: str) -> dict:
+        """Async variant of _decide_winner; undecided judges' requests are cancelled"""
+        if Config.JUDGE_PANEL_SIZE <= 1:
+            return await self._aevaluate_winner(state, transcript)
+        
+        judges = self._panel_judges()
+        limit = asyncio.Semaphore(max(1, Config.JUDGE_PANEL_CONCURRENCY))
+        
+        async def vote(judge):
+            async with limit:
+                return {**judge, **await self._aevaluate_winner(state, transcript, judge)}
+        
+        pending = {asyncio.ensure_future(vote(judge)) for judge in judges}
+        verdicts = []
+        try:
+            while pending and not self._decided(state, verdicts, len(pending)):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                verdicts.extend(task.result() for task in done)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        return self._record_panel(state, judges, verdicts)
+
+    def _panel_vote(self, state: DebateState, transcript: str, judge: dict, decided: threading.Event) -> dict:
+        return {**judge, **self._evaluate_winner(state, transcript, judge, decided)}
+
+    def _record_panel(self, state: DebateState, judges: List[dict], verdicts: List[dict]) -> dict:
+        """Log the panel's votes and agreement and return its verdict
+        
+        verdicts are in completion order, so the reasoning quoted is that of the
+        first judge to vote for the winner.
+        """
+        votes = self._tally(state, verdicts)
+        ranked = votes.most_common()
+        cast = sum(votes.values())
+        if ranked and (len(ranked) == 1 or ranked[0][1] > ranked[1][1]):
+            winner = ranked[0][0]
+            reasoning = next(v["reasoning"] for v in verdicts if self._vote(state, v) == winner)
+        elif ranked:
+            winner = "Tie"
+            reasoning = f"The panel split: {', '.join(f'{p} {n}' for p, n in ranked)}"
+        elif verdicts and all(v["winner"] == "Error" for v in verdicts):
+            winner, reasoning = "Error", verdicts[0]["reasoning"]
+        else:
+            winner, reasoning = "Tie", "No panel judge named a winner"
+        
+        agreement = ranked[0][1] / cast if cast else 0.0
+        state["panel"] = {
+            "judges": len(judges),
+            "verdicts": sorted(verdicts, key=lambda v: v["judge"]),
+            "votes": dict(votes),
+            "agreement": agreement,
+            "cancelled": len(judges) - len(verdicts)
+        }
+        self.logger.log_step("JUDGE_PANEL", state["panel"])
+        print(f"[Judge] Panel: {', '.join(f'{p} {n}' for p, n in ranked) or 'no votes'} "
+              f"({len(verdicts)} of {len(judges)} judges voted, {agreement:.0%} agreement)")
+        
+        return {
+            "winner": winner,
+            "reasoning": f"{reasoning} (Panel: {ranked[0][1] if ranked else 0} of {len(verdicts)} votes)"
+        }
+
+    def _judgment_prompt(self, state: DebateState, transcript: str) -> str:
+        return f"""You are an expert, impartial Debate Judge. Evaluate the following debate on '{state['topic']}'.
+
+Criteria:
+1. Logical consistency
+2. Use of evidence/reasoning
+3. Rebuttal effectiveness
+
+Transcript:
+{transcript}
+
+Respond with a JSON object with exactly these keys:
+"summary": 2-3 sentences on the main clash between the two sides,
+"winner": {self._winner_choices(state)},
+"reasoning": 1-2 sentences explaining why."""
+
+    def _winner_choices(self, state: DebateState) -> str:
+        quoted = [f'"{persona}"' for persona in debate_personas(state)]
+        if len(quoted) == 2:
+            return f"either {quoted[0]} or {quoted[1]}"
+        return f"one of {', '.join(quoted)}"
+
+    def _judgment_config(self):
+        return {
+            "temperature": 0.3,
+            "max_output_tokens": 450,
+            "response_mime_type": "application/json"
+        }
+
+    def _parse_judgment(self, evaluation: str) -> tuple:
+        try:
+            data = json.loads(evaluation)
+        except ValueError:
+            data = None
+        
+        if not isinstance(data, dict):
+            # Model ignored the JSON contract; fall back to the line format
+            return evaluation, self._parse_verdict(evaluation)
+        
+        verdict = {
+            "winner": str(data.get("winner") or "Tie").strip(),
+            "reasoning": str(data.get("reasoning") or "Unable to determine winner").strip()
+        }
+        return str(data.get("summary", "")).strip(), verdict
+
+    def _judgment_error(self, e: Exception) -> tuple:
+        return self._summary_error(e), self._verdict_error(e)
+
+    def _generate_judgment(self, state: DebateState, transcript: str) -> tuple:
+        """Summary, winner and reasoning from one structured-output call"""
+        
+        if not self.client:
+            return self._mock_summary(), self._mock_verdict(state)
+
+        try:
+            evaluation = llm.generate(self.model, self._judgment_prompt(state, transcript), self._judgment_config())
+            return self._parse_judgment(evaluation)
             
-            return {
-                "winner": winner,
-                "reasoning": reasoning
-            }
+        except Exception as e:
+            return self._judgment_error(e)
+
+    async def _agenerate_judgment(self, state: DebateState, transcript: str) -> tuple:
+        """Async variant of _generate_judgment"""
+        
+        if not self.client:
+            return self._mock_summary(), self._mock_verdict(state)
+
+        try:
+            evaluation = await llm.agenerate(self.model, self._judgment_prompt(state, transcript), self._judgment_config())
+            return self._parse_judgment(evaluation)
             
         except Exception as e:
-            self.logger.log_step("ERROR_EVALUATION", f"Failed to evaluate winner: {str(e)}")
-            return {
-                "winner": "Error",
-                "reasoning": f"Evaluation failed: {str(e)}"
-            }
\ No newline at end of file
+            return self._judgment_error(e)
\ No newline at end of file
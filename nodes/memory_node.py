@@ -1,7 +1,8 @@
 from utils.config import Config
-from utils.state import DebateState, AgentType
+from utils.state import DebateState, Turn, debate_personas
 from utils.logger import DebateLogger
-from typing import Dict, List, Any
+from utils.text import estimate_tokens, truncate_to_tokens
+from typing import Dict, List, Optional
 
 class MemoryNode:
     def __init__(self, logger: DebateLogger):
@@ -10,44 +11,123 @@ class MemoryNode:
     def execute(self, state: DebateState) -> DebateState:
         """Update and manage memory for agents"""
         
+        # Record the turns the speakers just generated, in seat order
+        self._collect_pending(state)
+        
+        # Index turns that arrived since the last update
+        self._update_turn_index(state)
+        
         # Update context slices for the NEXT agent's turn
-        state["agent_a_context"] = self.get_relevant_context(state, Config.AGENT_A_PERSONA)
-        state["agent_b_context"] = self.get_relevant_context(state, Config.AGENT_B_PERSONA)
+        personas = debate_personas(state)
+        state["contexts"] = {persona: self.get_relevant_context(state, persona) for persona in personas}
+        state["agent_a_context"] = state["contexts"][personas[0]]
+        state["agent_b_context"] = state["contexts"][personas[1]]
         
-        # Log memory state
+        # Log memory state; the turn's text is already in its ROUND_<n>_<ROLE> event
         self.logger.log_step("MEMORY_UPDATE", {
             "total_turns": len(state["turns"]),
-            "latest_turn": state["turns"][-1] if state["turns"] else None
+            "latest_turn_index": len(state["turns"]) - 1 if state["turns"] else None
         })
         
         return state
     
+    def _collect_pending(self, state: DebateState):
+        pending = state.get("pending_turns")
+        if not pending:
+            return
+        for persona in debate_personas(state):
+            if persona in pending:
+                state["turns"].append(pending[persona])
+        # None clears the channel (see merge_pending)
+        state["pending_turns"] = None
+    
+    def _update_turn_index(self, state: DebateState) -> Dict[str, List[int]]:
+        """Append new turn positions to the per-persona index kept in state"""
+        index = state.setdefault("persona_turns", {})
+        indexed = sum(len(positions) for positions in index.values())
+        
+        # Turns were rewound (e.g. a resumed debate): rebuild from scratch
+        if indexed > len(state["turns"]):
+            index.clear()
+            indexed = 0
+        
+        for position in range(indexed, len(state["turns"])):
+            index.setdefault(state["turns"][position]["agent"], []).append(position)
+        return index
+    
+    def _last_position(self, index: Dict[str, List[int]], agent_persona: str,
+                       opponent: bool = False) -> Optional[int]:
+        """Latest turn position by (or, with opponent=True, against) a persona"""
+        best = None
+        for persona, positions in index.items():
+            if (persona != agent_persona) != opponent or not positions:
+                continue
+            if best is None or positions[-1] > best:
+                best = positions[-1]
+        return best
+    
     def get_relevant_context(self, state: DebateState, agent_persona: str) -> str:
         """
         Provides each agent only the memory relevant to their next turn.
         Requirement: 'provide each agent only the memory relevant to their next turn'
+        
+        Uses the per-persona turn index, which execute refreshes once per update.
         """
         if not state["turns"]:
             return "No previous arguments."
             
+        turns = state["turns"]
+        index = state["persona_turns"]
         relevant_text = "--- RELEVANT DEBATE HISTORY ---\n"
         
         # Get last turn
-        last_turn = state["turns"][-1]
+        last_position = len(turns) - 1
+        last_turn = turns[last_position]
         
         if last_turn['agent'] == agent_persona:
             relevant_text += f"YOUR PREVIOUS ARGUMENT: {last_turn['text']}\n"
             # Try to find the opponent's previous argument if available
-            opp_turn = next((t for t in reversed(state["turns"][:-1]) if t['agent'] != agent_persona), None)
-            if opp_turn:
-                relevant_text += f"OPPONENT'S LAST POINT: {opp_turn['text']}\n"
+            other_position = self._last_position(index, agent_persona, opponent=True)
+            if other_position is not None:
+                relevant_text += f"OPPONENT'S LAST POINT: {turns[other_position]['text']}\n"
             else:
                 relevant_text += "Opponent has not spoken yet.\n"
         else:
             relevant_text += f"OPPONENT'S LAST ARGUMENT ({last_turn['agent']}): {last_turn['text']}\n"
             # Get agent's own previous argument if it exists
-            own_last_turn = next((t for t in reversed(state["turns"][:-1]) if t['agent'] == agent_persona), None)
-            if own_last_turn:
-                relevant_text += f"YOUR PREVIOUS POINT: {own_last_turn['text']}\n"
+            other_position = self._last_position(index, agent_persona)
+            if other_position is not None:
+                relevant_text += f"YOUR PREVIOUS POINT: {turns[other_position]['text']}\n"
+        
+        shown = {last_position, other_position}
+        relevant_text += self._earlier_exchanges(turns, shown,
+                                                 Config.MEMORY_TOKEN_BUDGET - estimate_tokens(relevant_text))
             
-        return relevant_text
\ No newline at end of file
+        return relevant_text
+    
+    def _earlier_exchanges(self, turns: List[Turn], shown: set, budget: int) -> str:
+        """Older turns, newest first, until the token budget runs out
+        
+        Work is bounded by the budget rather than the debate length; the
+        oldest turn that only partly fits is truncated.
+        """
+        header = "--- EARLIER EXCHANGES ---\n"
+        budget -= estimate_tokens(header)
+        earlier = []
+        
+        position = len(turns) - 1
+        while position >= 0 and budget > 0:
+            if position not in shown:
+                turn = turns[position]
+                line = f"[Round {turn.get('round', '?')}] {turn['agent']}: {turn['text']}\n"
+                cost = estimate_tokens(line)
+                if cost > budget:
+                    line = truncate_to_tokens(line.rstrip("\n"), budget) + "\n"
+                    cost = budget
+                earlier.append(line)
+                budget -= cost
+            position -= 1
+        
+        if not earlier:
+            return ""
+        return header + "".join(reversed(earlier))
\ No newline at end of file
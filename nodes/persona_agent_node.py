@@ -0,0 +1,208 @@
+from typing import Any, Dict, Optional
+from utils.state import DebateState, Turn, debate_personas, seat_role
+from utils.config import Config
+from utils.logger import DebateLogger
+from utils import llm
+
+# Goal and mock argument of the first two seats (the Scientist and Philosopher roles);
+# later seats argue from their persona without a fixed angle
+SEAT_GOALS = (
+    "Provide a strong, logical argument from a scientific perspective.",
+    "Provide a deep, philosophical counter-argument or perspective.",
+)
+DEFAULT_GOAL = "Provide a strong argument from your own perspective that engages the other participants."
+
+SEAT_MOCKS = (
+    "[Mock Scientist Argument] Based on the topic '{topic}', statistical analysis suggests a high correlation between logic and evidence.",
+    "[Mock Philosopher Argument] From a philosophical lens, '{topic}' invites us to question the very nature of existence and consciousness.",
+)
+DEFAULT_MOCK = "[Mock {persona} Argument] Seen as a {persona}, '{topic}' raises considerations the other sides have not weighed."
+
+class PersonaAgentNode:
+    """Argues for the debate's personas
+
+    One instance serves every seat: route_to_agent sends it a copy of the state
+    with the seat to speak for in "speaker", once per speaker, so the speakers of
+    a parallel round run as concurrent graph tasks. The turn is returned in
+    pending_turns and moved into turns by MemoryNode.
+    """
+
+    # Fixed seat for the single-persona subclasses (AgentANode, AgentBNode)
+    seat: Optional[int] = None
+    label = "Persona agents"
+
+    def __init__(self, logger: DebateLogger):
+        self.logger = logger
+        self.client = None
+        self.model_name = Config.GEMINI_MODEL
+
+        if llm.model_available():
+            # Shared handle; the underlying client is created on the first request
+            self.model = llm.get_model(self.model_name)
+            self.client = True # Flag to indicate active client
+        else:
+            print(f"⚠️ Warning: GEMINI_API_KEY not found. {self.label} running in Mock Mode.")
+
+    def execute(self, state: DebateState) -> Dict[str, Any]:
+        # Check if it's our turn
+        seat = self._speaker(state)
+        if seat is None:
+            return {}
+
+        # Get memory context
+        context = self._context(state, seat)
+
+        # Generate argument (streamed to the console when enabled)
+        if self._streams(state):
+            argument, timings = self._stream_argument(state, seat, context)
+            return self._record_turn(state, seat, argument, timings)
+
+        argument = self._generate_argument(state, seat, context)
+
+        return self._record_turn(state, seat, argument)
+
+    async def aexecute(self, state: DebateState) -> Dict[str, Any]:
+        """Async variant of execute for graphs run with ainvoke"""
+        seat = self._speaker(state)
+        if seat is None:
+            return {}
+
+        context = self._context(state, seat)
+        if self._streams(state):
+            argument, timings = await self._astream_argument(state, seat, context)
+            return self._record_turn(state, seat, argument, timings)
+
+        argument = await self._agenerate_argument(state, seat, context)
+
+        return self._record_turn(state, seat, argument)
+
+    def _speaker(self, state: DebateState) -> Optional[int]:
+        """Seat to argue for, or None when it isn't this node's turn"""
+        if self.seat is None:
+            return state["speaker"]
+        return self.seat if self.seat in state.get("next_speakers", ()) else None
+
+    def _persona(self, state: DebateState, seat: int) -> str:
+        return debate_personas(state)[seat]
+
+    def _context(self, state: DebateState, seat: int) -> str:
+        context = state.get("contexts", {}).get(self._persona(state, seat))
+        if context is None and seat < 2:
+            context = state.get(("agent_a_context", "agent_b_context")[seat], "")
+        return context or ""
+
+    def _streams(self, state: DebateState) -> bool:
+        # Chunks of simultaneous turns would interleave on the console; those print when done
+        return bool(Config.STREAM and self.client and len(state.get("next_speakers", ())) <= 1)
+
+    def _record_turn(self, state: DebateState, seat: int, argument: str,
+                     timings: dict = None) -> Dict[str, Any]:
+        """Log and print a generated argument and return it as a pending turn
+
+        timings is set for streamed arguments, which were already printed.
+        """
+        persona = self._persona(state, seat)
+
+        # Log to system log
+        self.logger.log_step(f"ROUND_{state['current_round']}_{seat_role(seat)}", argument)
+
+        # Print to console
+        if timings is None:
+            print(f"\n[Round {state['current_round']}] {persona}: {argument}")
+
+        # Structured memory; streamed turns also keep their timings
+        turn = Turn(round=state["current_round"], agent=persona, text=argument, **(timings or {}))
+        return {"pending_turns": {persona: turn}}
+
+    def _build_prompt(self, state: DebateState, seat: int, context: str) -> str:
+        goal = SEAT_GOALS[seat] if seat < len(SEAT_GOALS) else DEFAULT_GOAL
+        return f"""You are a {self._persona(state, seat)} in a debate about: "{state['topic']}".
+        
+Context from previous turns:
+{context}
+
+Your goal: {goal}
+Limit your response to 2-3 concise sentences.
+
+Your argument (Round {state["current_round"]}/{state.get("max_rounds", Config.MAX_ROUNDS)}):"""
+
+    def _generation_config(self, state: DebateState):
+        # Plain dict so it can be hashed into the response cache key
+        return {
+            "temperature": 0.0 if state.get("seed") is not None else 0.7,
+            "max_output_tokens": 150
+        }
+
+    def _mock_argument(self, state: DebateState, seat: int) -> str:
+        # Fallback for simulation without API key
+        template = SEAT_MOCKS[seat] if seat < len(SEAT_MOCKS) else DEFAULT_MOCK
+        return template.format(topic=state["topic"], persona=self._persona(state, seat))
+
+    def _handle_error(self, seat: int, e: Exception):
+        # The scheduler has already retried transient failures; fail the debate
+        # rather than recording the error text as an argument
+        self.logger.log_step(f"ERROR_{seat_role(seat)}", f"Failed to generate argument: {str(e)}")
+
+    def _generate_argument(self, state: DebateState, seat: int, context: str) -> str:
+        """Generate argument using Gemini"""
+
+        if not self.client:
+            return self._mock_argument(state, seat)
+
+        try:
+            return llm.generate(self.model,
+                                self._build_prompt(state, seat, context),
+                                self._generation_config(state))
+
+        except Exception as e:
+            self._handle_error(seat, e)
+            raise
+
+    async def _agenerate_argument(self, state: DebateState, seat: int, context: str) -> str:
+        """Generate argument using Gemini's async API"""
+
+        if not self.client:
+            return self._mock_argument(state, seat)
+
+        try:
+            return await llm.agenerate(self.model,
+                                       self._build_prompt(state, seat, context),
+                                       self._generation_config(state))
+
+        except Exception as e:
+            self._handle_error(seat, e)
+            raise
+
+    def _stream_argument(self, state: DebateState, seat: int, context: str) -> tuple:
+        """Generate argument with Gemini streaming, echoing chunks as they arrive"""
+        print(f"\n[Round {state['current_round']}] {self._persona(state, seat)}: ", end="", flush=True)
+
+        try:
+            argument, timings = llm.generate_stream(self.model,
+                                                    self._build_prompt(state, seat, context),
+                                                    self._generation_config(state),
+                                                    llm.print_chunk)
+        except Exception as e:
+            print()
+            self._handle_error(seat, e)
+            raise
+
+        print()
+        return argument, timings
+
+    async def _astream_argument(self, state: DebateState, seat: int, context: str) -> tuple:
+        """Async variant of _stream_argument"""
+        print(f"\n[Round {state['current_round']}] {self._persona(state, seat)}: ", end="", flush=True)
+
+        try:
+            argument, timings = await llm.agenerate_stream(self.model,
+                                                           self._build_prompt(state, seat, context),
+                                                           self._generation_config(state),
+                                                           llm.print_chunk)
+        except Exception as e:
+            print()
+            self._handle_error(seat, e)
+            raise
+
+        print()
+        return argument, timings
\ No newline at end of file
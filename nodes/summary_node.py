@@ -0,0 +1,104 @@
+from typing import Any, Dict, List
+from utils.state import DebateState, Turn, debate_personas, join_personas
+from utils.config import Config
+from utils.logger import DebateLogger
+from utils import llm
+
+class RunningSummaryNode:
+    """Keeps a compact running summary of the debate for the judge
+
+    route_to_agent sends it alongside the next speaker(s), so each update
+    runs while the next argument is being generated. An update folds only the
+    turns that landed since the previous one into the summary, so its cost
+    doesn't grow with the debate, and neither does the judge's prompt.
+    """
+
+    def __init__(self, logger: DebateLogger):
+        self.logger = logger
+        self.client = None
+        self.model_name = Config.GEMINI_MODEL
+
+        if llm.model_available():
+            # Shared handle; the underlying client is created on the first request
+            self.model = llm.get_model(self.model_name)
+            self.client = True
+        else:
+            print("⚠️ Warning: GEMINI_API_KEY not found. Running summary in Mock Mode.")
+
+    def execute(self, state: DebateState) -> Dict[str, Any]:
+        new_turns = self._new_turns(state)
+        if not new_turns:
+            return {}
+        return self._record_summary(state, new_turns, self._update_summary(state, new_turns))
+
+    async def aexecute(self, state: DebateState) -> Dict[str, Any]:
+        """Async variant of execute for graphs run with ainvoke"""
+        new_turns = self._new_turns(state)
+        if not new_turns:
+            return {}
+        return self._record_summary(state, new_turns, await self._aupdate_summary(state, new_turns))
+
+    def _new_turns(self, state: DebateState) -> List[Turn]:
+        return state["turns"][state.get("summarized_turns", 0):]
+
+    def _record_summary(self, state: DebateState, new_turns: List[Turn], summary: str) -> Dict[str, Any]:
+        if summary is None:
+            # Keep the previous summary; the judge sees the unsummarized turns verbatim
+            return {}
+        summarized = state.get("summarized_turns", 0) + len(new_turns)
+        self.logger.log_step("RUNNING_SUMMARY", {"summarized_turns": summarized, "summary": summary})
+        return {"summary": summary, "summarized_turns": summarized}
+
+    def _summary_prompt(self, state: DebateState, new_turns: List[Turn]) -> str:
+        arguments = "\n".join(f"[Round {t.get('round', '?')}] {t['agent']}: {t['text']}" for t in new_turns)
+        return f"""You are keeping a running summary of a debate on '{state['topic']}' for the judge.
+
+Summary so far:
+{state.get('summary') or '(the debate has just started)'}
+
+New arguments:
+{arguments}
+
+Rewrite the summary to include the new arguments. Keep each side's main claims, evidence and rebuttals and drop repetition. Use at most 6 sentences.
+
+Updated summary:"""
+
+    def _summary_config(self, state: DebateState):
+        # Plain dict so it can be hashed into the response cache key
+        return {
+            "temperature": 0.0 if state.get("seed") is not None else 0.3,
+            "max_output_tokens": Config.RUNNING_SUMMARY_TOKENS
+        }
+
+    def _mock_summary(self, state: DebateState, new_turns: List[Turn]) -> str:
+        rounds = max(t.get("round") or 0 for t in new_turns)
+        return f"Mock Running Summary: {join_personas(debate_personas(state))} have argued through round {rounds}."
+
+    def _summary_error(self, e: Exception):
+        # A missed update only makes the judge read more raw turns; the debate goes on
+        self.logger.log_step("ERROR_RUNNING_SUMMARY", f"Failed to update running summary: {str(e)}")
+        return None
+
+    def _update_summary(self, state: DebateState, new_turns: List[Turn]):
+        """Fold new_turns into the summary using Gemini (None on failure)"""
+
+        if not self.client:
+            return self._mock_summary(state, new_turns)
+
+        try:
+            return llm.generate(self.model, self._summary_prompt(state, new_turns), self._summary_config(state))
+
+        except Exception as e:
+            return self._summary_error(e)
+
+    async def _aupdate_summary(self, state: DebateState, new_turns: List[Turn]):
+        """Async variant of _update_summary"""
+
+        if not self.client:
+            return self._mock_summary(state, new_turns)
+
+        try:
+            return await llm.agenerate(self.model, self._summary_prompt(state, new_turns), self._summary_config(state))
+
+        except Exception as e:
+            return self._summary_error(e)
\ No newline at end of file
@@ -1,5 +1,6 @@
-from utils.state import DebateState, AgentType
+from utils.state import DebateState, AgentType, debate_personas, join_personas
 from utils.logger import DebateLogger
+from utils.config import Config
 
 class UserInputNode:
     def __init__(self, logger: DebateLogger):
@@ -8,9 +9,15 @@ class UserInputNode:
     def execute(self, state: DebateState) -> DebateState:
         """Get debate topic from user input with validation"""
         print("\n=== MULTI-AGENT DEBATE SYSTEM ===")
-        print("Two AI agents will debate on your chosen topic.")
-        print("Agent A: Scientist | Agent B: Philosopher")
-        print("8 rounds total (4 arguments per agent)\n")
+        personas = debate_personas(state)
+        if len(personas) == 2:
+            print("Two AI agents will debate on your chosen topic.")
+            print(f"Agent A: {state['agent_a_persona']} | Agent B: {state['agent_b_persona']}")
+        else:
+            print(f"{len(personas)} AI agents will debate on your chosen topic.")
+            print(" | ".join(personas))
+        max_rounds = state.get("max_rounds", Config.MAX_ROUNDS)
+        print(f"{max_rounds} rounds total ({max_rounds // len(personas)} arguments per agent)\n")
         
         # Get topic from user with validation
         while not state["topic"]:
@@ -35,9 +42,12 @@ class UserInputNode:
         # Log the initialization
         self.logger.log_step("USER_INPUT", f"Debate Topic: {state['topic']}")
         self.logger.log_step("INITIALIZATION", 
-                           f"Starting debate between {AgentType.SCIENTIST.value} and {AgentType.PHILOSOPHER.value}")
+                           f"Starting debate between {join_personas(personas)}")
         
         print(f"\nStarting debate on: '{state['topic']}'")
-        print(f"Round 1 - {state['current_agent'].value} will go first...\n")
+        if Config.PARALLEL_ROUNDS in ("opening", "all"):
+            print("Round 1 - opening statements from every persona at once...\n")
+        else:
+            print(f"Round 1 - {state['agent_a_persona']} will go first...\n")
         
         return state
\ No newline at end of file
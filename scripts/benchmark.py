@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the Multi-Agent Debate DAG
+
+Runs full debates against the local fake model (no API key or network
+needed), sweeping debate length and concurrency, and writes the results
+as JSON so runs can be diffed between versions.
+
+Usage: python -m scripts.benchmark --rounds 4 8 16 --concurrency 1 4 16
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import tracemalloc
+from typing import Any, Dict, List
+from utils.config import Config
+from tournament import TournamentRunner
+from debate_graph import get_debate_graph
+from utils.log_storage import iter_events
+
+TOPICS = [
+    "Should AI be regulated like medicine?",
+    "Is space exploration worth the cost?",
+    "Should cities ban private cars?",
+    "Is nuclear power essential to fight climate change?",
+]
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+def latency_stats(values_s: List[float]) -> Dict[str, float]:
+    values = [v * 1000 for v in values_s]
+    return {
+        "mean": round(sum(values) / len(values), 1) if values else 0.0,
+        "p50": round(percentile(values, 50), 1),
+        "p95": round(percentile(values, 95), 1),
+        "p99": round(percentile(values, 99), 1),
+    }
+
+def load_span_summary(log_path: str) -> Dict[str, Dict[str, Any]]:
+    """Return the SPAN_SUMMARY payload of a debate log (empty if missing)"""
+    summary = {}
+    for entry in iter_events(log_path):
+        if entry.get("event_type") == "SPAN_SUMMARY":
+            summary = entry["payload"]
+    return summary
+
+def node_overhead(log_paths: List[str]) -> Dict[str, Dict[str, float]]:
+    """Mean wall time and time outside model calls per node execution"""
+    totals: Dict[str, Dict[str, float]] = {}
+    for log_path in log_paths:
+        for node, row in load_span_summary(log_path).items():
+            total = totals.setdefault(node, {"calls": 0, "wall_ms": 0.0, "overhead_ms": 0.0})
+            total["calls"] += row["calls"]
+            total["wall_ms"] += row["wall_ms"]
+            total["overhead_ms"] += row["overhead_ms"]
+    return {
+        node: {
+            "calls": int(total["calls"]),
+            "wall_ms_per_call": round(total["wall_ms"] / total["calls"], 3),
+            "overhead_ms_per_call": round(total["overhead_ms"] / total["calls"], 3),
+        }
+        for node, total in sorted(totals.items()) if total["calls"]
+    }
+
+def run_point(max_rounds: int, concurrency: int, debates: int, async_mode: bool) -> Dict[str, Any]:
+    """Run one (MAX_ROUNDS, concurrency) configuration and measure it"""
+    Config.update(MAX_ROUNDS=max_rounds)
+    jobs = [{"topic": TOPICS[i % len(TOPICS)], "seed": i} for i in range(debates)]
+
+    with tempfile.TemporaryDirectory(prefix="debate_bench_") as output_dir:
+        runner = TournamentRunner(output_dir, concurrency=concurrency, async_mode=async_mode)
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        # Debates print every turn; keep the benchmark output readable
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            summary = runner.run(jobs)
+        wall_time = time.perf_counter() - started
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+
+        with open(runner.results_path, 'r') as f:
+            results = [json.loads(line) for line in f if line.strip()]
+        completed = [r for r in results if r["status"] == "completed"]
+        nodes = node_overhead([r["log_path"] for r in completed])
+
+    return {
+        "max_rounds": max_rounds,
+        "concurrency": concurrency,
+        "debates": debates,
+        "completed": len(completed),
+        "failed": summary["failed"],
+        "wall_time_s": round(wall_time, 3),
+        "debates_per_sec": round(len(completed) / wall_time, 3) if wall_time > 0 else 0.0,
+        "debate_latency_ms": latency_stats([r["duration_s"] for r in completed]),
+        "nodes": nodes,
+        "peak_memory_mb": round(peak_bytes / (1024 * 1024), 2),
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def parse_arguments():
+    """Parse CLI arguments"""
+    parser = argparse.ArgumentParser(description='Offline benchmark using the fake model backend')
+    parser.add_argument('--rounds', type=int, nargs='+', default=[4, 8, 16],
+                        help='MAX_ROUNDS values to sweep')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16],
+                        help='Concurrency levels to sweep')
+    parser.add_argument('--debates', type=int, default=16, help='Debates per configuration')
+    parser.add_argument('--async', dest='async_mode', action='store_true',
+                        help='Run debates through the asyncio execution path')
+    parser.add_argument('--latency-ms', type=float, default=Config.FAKE_LLM_LATENCY_MS,
+                        help='Mean fake model latency per call')
+    parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'lognormal'],
+                        default=Config.FAKE_LLM_LATENCY_DIST, help='Fake model latency distribution')
+    parser.add_argument('--jitter', type=float, default=Config.FAKE_LLM_JITTER,
+                        help='Latency spread (uniform: fraction of mean, lognormal: sigma)')
+    parser.add_argument('--output-tokens', type=int, default=Config.FAKE_LLM_OUTPUT_TOKENS,
+                        help='Words per fake model response')
+    parser.add_argument('--error-rate', type=float, default=Config.FAKE_LLM_ERROR_RATE,
+                        help='Fraction of fake model calls that fail')
+    parser.add_argument('--output', type=str, default='benchmark_output/results.json',
+                        help='Where to write the JSON results')
+    return parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = parse_arguments()
+
+    Config.update(LLM_BACKEND="fake",
+                  FAKE_LLM_LATENCY_MS=args.latency_ms,
+                  FAKE_LLM_LATENCY_DIST=args.latency_dist,
+                  FAKE_LLM_JITTER=args.jitter,
+                  FAKE_LLM_OUTPUT_TOKENS=args.output_tokens,
+                  FAKE_LLM_ERROR_RATE=args.error_rate,
+                  SPAN_SUMMARY=False,
+                  CACHE_ENABLED=False,
+                  RESULTS_ENABLED=False,  # keep synthetic debates out of the results store
+                  CHECKPOINT_ENABLED=False,
+                  STREAM=False)
+
+    print(f"🧪 Benchmarking with the fake backend ({args.latency_dist}, {args.latency_ms:g} ms/call, "
+          f"error rate {args.error_rate:g})")
+    print(f"{'rounds':>7}{'conc':>6}{'ok':>5}{'deb/s':>9}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'peak MB':>9}")
+
+    # Build the shared graph up front so the first point doesn't pay for it
+    get_debate_graph(args.async_mode)
+    tracemalloc.start()
+    points = []
+    for max_rounds in args.rounds:
+        for concurrency in args.concurrency:
+            point = run_point(max_rounds, concurrency, args.debates, args.async_mode)
+            points.append(point)
+            latency = point["debate_latency_ms"]
+            print(f"{max_rounds:>7}{concurrency:>6}{point['completed']:>5}{point['debates_per_sec']:>9.2f}"
+                  f"{latency['p50']:>10.1f}{latency['p95']:>10.1f}{latency['p99']:>10.1f}"
+                  f"{point['peak_memory_mb']:>9.1f}")
+    tracemalloc.stop()
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "mode": "async" if args.async_mode else "threads",
+        "backend": {
+            "latency_ms": args.latency_ms,
+            "latency_dist": args.latency_dist,
+            "jitter": args.jitter,
+            "output_tokens": args.output_tokens,
+            "error_rate": args.error_rate,
+        },
+        "debates_per_point": args.debates,
+        "points": points,
+    }
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"📝 Results saved to: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,75 +3,16 @@
 Generate DAG diagram for the Multi-Agent Debate System
 """
 
-from langgraph.graph import StateGraph, START, END
-from utils.state import DebateState
-from utils.logger import DebateLogger
 from utils.config import Config
-from nodes.user_input_node import UserInputNode
-from nodes.agent_a_node import AgentANode
-from nodes.agent_b_node import AgentBNode
-from nodes.debate_controller import DebateController
-from nodes.memory_node import MemoryNode
-from nodes.judge_node import JudgeNode
+from debate_graph import get_debate_graph
 
 def create_dag_diagram():
     """Create and save the DAG diagram"""
     
     print("Generating DAG diagram...")
     
-    # Initialize logger and nodes
-    logger = DebateLogger("dag_generation.log")
-    user_input = UserInputNode(logger)
-    agent_a = AgentANode(logger)
-    agent_b = AgentBNode(logger)
-    controller = DebateController(logger)
-    memory = MemoryNode(logger)
-    judge = JudgeNode(logger)
-    
-    # Create the workflow (same as in main.py)
-    workflow = StateGraph(DebateState)
-    
-    # Add nodes
-    workflow.add_node("user_input", user_input.execute)
-    workflow.add_node("agent_a", agent_a.execute)
-    workflow.add_node("agent_b", agent_b.execute)
-    workflow.add_node("controller", controller.execute)
-    workflow.add_node("memory", memory.execute)
-    workflow.add_node("judge", judge.execute)
-    
-    # Add edges (simplified version for diagram)
-    workflow.add_edge(START, "user_input")
-    workflow.add_edge("user_input", "controller")
-    
-    # Conditional routing
-    def route_to_agent(state):
-        if state.get("is_complete", False):
-            return "judge"
-        elif state.get("current_agent") and state["current_agent"].value == Config.AGENT_A_PERSONA:
-            return "agent_a"
-        else:
-            return "agent_b"
-    
-    workflow.add_conditional_edges(
-        "controller",
-        route_to_agent,
-        {
-            "agent_a": "agent_a",
-            "agent_b": "agent_b", 
-            "judge": "judge"
-        }
-    )
-    
-    workflow.add_edge("agent_a", "memory")
-    workflow.add_edge("agent_b", "memory")
-    workflow.add_edge("memory", "controller")
-    workflow.add_edge("judge", END)
-    
-    # Compile the graph
-    app = workflow.compile()
-    
-    # Compile the graph
-    app = workflow.compile()
+    # Same compiled graph the debate runs use (building it makes no API calls)
+    app = get_debate_graph().app
     
     try:
         # Generate the diagram using graphviz if possible
@@ -97,19 +38,20 @@ def create_dag_diagram():
             dot.node('START', 'Start', shape='circle')
             dot.node('user_input', 'User Input', shape='box')
             dot.node('controller', 'Controller', shape='diamond')
-            dot.node('agent_a', f'Agent A ({Config.AGENT_A_PERSONA})', shape='box')
-            dot.node('agent_b', f'Agent B ({Config.AGENT_B_PERSONA})', shape='box')
+            personas = Config.PERSONAS or [Config.AGENT_A_PERSONA, Config.AGENT_B_PERSONA]
+            dot.node('agent', f"Persona Agent ({', '.join(personas)})", shape='box')
+            dot.node('summarizer', 'Running Summary', shape='box', style='dashed')
             dot.node('memory', 'Memory', shape='box')
             dot.node('judge', 'Judge', shape='box')
             dot.node('END', 'End', shape='circle')
             
             dot.edge('START', 'user_input')
             dot.edge('user_input', 'controller')
-            dot.edge('controller', 'agent_a', label='scientist turn')
-            dot.edge('controller', 'agent_b', label='philosopher turn')
+            dot.edge('controller', 'agent', label='one task per speaker')
+            dot.edge('controller', 'summarizer', label='RUNNING_SUMMARY', style='dashed')
             dot.edge('controller', 'judge', label='debate complete')
-            dot.edge('agent_a', 'memory')
-            dot.edge('agent_b', 'memory')
+            dot.edge('agent', 'memory', label='all speakers done')
+            dot.edge('summarizer', 'memory', style='dashed')
             dot.edge('memory', 'controller')
             dot.edge('judge', 'END')
             
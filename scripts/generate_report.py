@@ -1,8 +1,20 @@
-import json
 import os
+import sys
+import time
+import argparse
+import warnings
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from fpdf import FPDF
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.log_index import load_index, list_runs, qualified_run_id, read_run
+from utils.log_storage import find_logs, segment_paths
+from utils.results import ROUND_EVENT, PERSONAS_PAYLOAD
+from utils.state import AgentType, role_seat, split_personas
+
 class DebateReport(FPDF):
     def header(self):
         self.set_font('Arial', 'B', 15)
@@ -14,42 +26,50 @@ class DebateReport(FPDF):
         self.set_font('Arial', 'I', 8)
         self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
 
-def generate_pdf_report(jsonl_path, output_path):
+def summarize_run(entries):
+    """Topic, winner, judgment and turns of one debate's log events"""
+    summary = {
+        "run_id": None,
+        "topic": "Unknown",
+        "winner": "Unknown",
+        "judgment": "No judgment found.",
+        "turns": []
+    }
+    # Turn events name the speaker's seat; INITIALIZATION names the personas
+    personas = [agent_type.value for agent_type in AgentType]
+
+    for entry in entries:
+        event = entry.get('event_type')
+        payload = entry.get('payload')
+        summary["run_id"] = summary["run_id"] or entry.get('run_id')
+
+        if event == 'USER_INPUT' and 'Debate Topic:' in str(payload):
+            summary["topic"] = payload.split(': ', 1)[1]
+        elif event == 'JUDGE_WINNER':
+            summary["winner"] = payload.replace('Winner: ', '')
+        elif event == 'JUDGE_REASONING':
+            summary["judgment"] = payload
+        elif event == 'INITIALIZATION' and PERSONAS_PAYLOAD.match(str(payload)):
+            personas = split_personas(PERSONAS_PAYLOAD.match(payload).group(1))
+        elif ROUND_EVENT.match(event):
+            round_num, role = ROUND_EVENT.match(event).groups()
+            seat = role_seat(role)
+            summary["turns"].append((int(round_num), seat, personas[seat] if seat < len(personas) else role.title(),
+                                     payload))
+
+    # Turns of a parallel round are logged as they finish; show them in seat order
+    summary["turns"] = [(round_num, agent, text) for round_num, _, agent, text in sorted(summary["turns"])]
+    return summary
+
+def render_report(summary, output_path):
     pdf = DebateReport()
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
     pdf.set_font("Arial", size=12)
 
-    if not os.path.exists(jsonl_path):
-        print(f"Error: {jsonl_path} not found")
-        return
-
-    # Metadata
-    topic = "Unknown"
-    winner = "Unknown"
-    judgment = "No judgment found."
-    turns = []
-
-    with open(jsonl_path, 'r') as f:
-        for line in f:
-            entry = json.loads(line)
-            event = entry.get('event_type')
-            payload = entry.get('payload')
-
-            if event == 'USER_INPUT' and 'Debate Topic:' in str(payload):
-                topic = payload.split(': ', 1)[1]
-            elif event == 'JUDGE_WINNER':
-                winner = payload.replace('Winner: ', '')
-            elif event == 'JUDGE_REASONING':
-                judgment = payload
-            elif 'ROUND_' in event and '_SCIENTIST' in event:
-                turns.append(('Scientist', payload))
-            elif 'ROUND_' in event and '_PHILOSOPHER' in event:
-                turns.append(('Philosopher', payload))
-
     # Title Section
     pdf.set_font('Arial', 'B', 14)
-    pdf.cell(0, 10, f"Topic: {topic}", 0, 1)
+    pdf.cell(0, 10, f"Topic: {summary['topic']}", 0, 1)
     pdf.set_font('Arial', '', 10)
     pdf.cell(0, 5, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1)
     pdf.ln(10)
@@ -59,8 +79,7 @@ def generate_pdf_report(jsonl_path, output_path):
     pdf.cell(0, 10, "Debate Transcript", 0, 1)
     pdf.ln(2)
 
-    for i, (agent, text) in enumerate(turns):
-        round_num = (i // 2) + 1
+    for round_num, agent, text in summary["turns"]:
         pdf.set_font('Arial', 'B', 10)
         pdf.cell(0, 5, f"Round {round_num} - {agent}:", 0, 1)
         pdf.set_font('Arial', '', 10)
@@ -74,19 +93,183 @@ def generate_pdf_report(jsonl_path, output_path):
     pdf.ln(5)
     
     pdf.set_font('Arial', 'B', 12)
-    pdf.cell(0, 10, f"Winner: {winner}", 0, 1)
+    pdf.cell(0, 10, f"Winner: {summary['winner']}", 0, 1)
     pdf.ln(2)
     
     pdf.set_font('Arial', 'B', 10)
     pdf.cell(0, 5, "Reasoning:", 0, 1)
     pdf.set_font('Arial', '', 10)
-    pdf.multi_cell(0, 5, judgment)
+    pdf.multi_cell(0, 5, summary["judgment"])
 
     pdf.output(output_path)
+
+def generate_pdf_report(jsonl_path, output_path, run_id=None):
+    """Render one debate from a JSONL log (the latest run unless run_id is given)"""
+    if not segment_paths(jsonl_path):
+        print(f"Error: {jsonl_path} not found")
+        return
+
+    # Seek straight to the run's events via the log's index instead of parsing every run
+    index = load_index(jsonl_path, update=True)
+    if run_id is not None and run_id not in index:
+        print(f"Error: run {run_id} not found in {jsonl_path}")
+        return
+
+    render_report(summarize_run(read_run(jsonl_path, run_id, index)), output_path)
     print(f"✅ Professional PDF report saved to: {output_path}")
 
+# Per-worker state for batch mode: each log's index is loaded once per process
+_worker_indexes = {}
+
+def _init_worker():
+    # fpdf's core fonts need no loading, so the only per-worker setup is silencing
+    # their deprecation notices (which would otherwise repeat in every worker)
+    warnings.simplefilter("ignore", DeprecationWarning)
+    _worker_indexes.clear()
+
+def _render_job(job):
+    """Render one (log_path, run_id, output_path) job in a worker; returns the index row"""
+    log_path, run_id, output_path = job
+    index = _worker_indexes.get(log_path)
+    if index is None:
+        index = _worker_indexes[log_path] = load_index(log_path)
+    summary = summarize_run(read_run(log_path, run_id, index))
+    try:
+        render_report(summary, output_path)
+        error = None
+    except Exception as e:  # one bad transcript shouldn't sink the batch
+        error = str(e)
+    return {"run_id": qualified_run_id(log_path, run_id), "topic": summary["topic"], "winner": summary["winner"],
+            "turns": len(summary["turns"]), "report": os.path.basename(output_path), "error": error}
+
+def find_runs(source, run_ids=None):
+    """(log_path, run_id) for every run in a log file or a directory of .jsonl logs
+
+    Rotated and compressed segments are read as part of their log.
+    With run_ids, only those runs (in that order). Legacy ids repeat across logs, so
+    they may be qualified as <log name>:<id> (see qualified_run_id); unknown or
+    ambiguous ids raise KeyError.
+    """
+    if not segment_paths(source) and not os.path.isdir(source):
+        raise FileNotFoundError(f"{source} not found")
+    if os.path.isdir(source):
+        logs = find_logs(source)
+    else:
+        logs = [source]
+
+    runs = []
+    for log_path in logs:
+        # Index any unindexed tail here, once, rather than in every worker
+        runs.extend((log_path, run_id) for run_id in load_index(log_path, update=True))
+    if run_ids is None:
+        return runs
+
+    by_id, bare = {}, {}
+    for log_path, run_id in runs:
+        by_id[qualified_run_id(log_path, run_id)] = (log_path, run_id)
+        bare.setdefault(run_id, []).append((log_path, run_id))
+    # A bare legacy id still works as long as only one log has it
+    by_id.update({run_id: found[0] for run_id, found in bare.items() if len(found) == 1 and run_id not in by_id})
+    missing = [run_id for run_id in run_ids if run_id not in by_id]
+    if missing:
+        raise KeyError(f"Runs not found (or not unique) in {source}: {', '.join(missing)}")
+    return [by_id[run_id] for run_id in run_ids]
+
+def render_index(rows, output_path):
+    """Combined index of a batch: win counts, then one line per debate"""
+    pdf = DebateReport()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, f"Debate Index ({len(rows)} debates)", 0, 1)
+    pdf.set_font('Arial', '', 10)
+    pdf.cell(0, 5, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1)
+    pdf.ln(5)
+
+    wins = Counter(row["winner"] for row in rows)
+    pdf.set_font('Arial', 'B', 12)
+    pdf.cell(0, 8, "Wins", 0, 1)
+    pdf.set_font('Arial', '', 10)
+    for winner, count in wins.most_common():
+        pdf.cell(0, 5, f"{winner}: {count}", 0, 1)
+    pdf.ln(5)
+
+    widths = (12, 34, 98, 30, 16)
+    pdf.set_font('Arial', 'B', 10)
+    for width, title in zip(widths, ("#", "Debate", "Topic", "Winner", "Turns")):
+        pdf.cell(width, 7, title, 1, 0)
+    pdf.ln()
+    pdf.set_font('Arial', '', 9)
+    for number, row in enumerate(rows, 1):
+        topic = row["topic"] if len(row["topic"]) <= 60 else row["topic"][:57] + "..."
+        winner = "report failed" if row["error"] else row["winner"]
+        for width, value in zip(widths, (number, row["run_id"][:16], topic, winner, row["turns"])):
+            pdf.cell(width, 6, str(value), 1, 0)
+        pdf.ln()
+
+    pdf.output(output_path)
+
+def report_name(log_path, run_id):
+    """PDF file name of one run's batch report, unique across the logs of a batch"""
+    return f"debate_{qualified_run_id(log_path, run_id).replace(':', '_')}.pdf"
+
+def generate_batch_reports(runs, output_dir, workers=None):
+    """Render one report per (log_path, run_id) in a process pool, plus index.pdf
+
+    Returns the index rows, in the order of runs.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(log_path, run_id, os.path.join(output_dir, report_name(log_path, run_id))) for log_path, run_id in runs]
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker keeps IPC overhead low without leaving workers idle at the end
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        if workers == 1 or len(jobs) <= 1:
+            _worker_indexes.clear()
+            rows = [_render_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                rows = list(pool.map(_render_job, jobs, chunksize=chunksize))
+
+        render_index(rows, os.path.join(output_dir, "index.pdf"))
+    return rows
+
+def parse_arguments():
+    """Parse CLI arguments"""
+    parser = argparse.ArgumentParser(description='Generate PDF reports for debates in JSONL logs')
+    parser.add_argument('log_file', nargs='?', default="final_debate_log.jsonl",
+                        help='Debate log (or, with --batch, a log or a directory of logs)')
+    parser.add_argument('report_file', nargs='?', default="debate_report.pdf", help='Output PDF')
+    parser.add_argument('--run-id', type=str, help='Debate to report on (default: the latest run)')
+    parser.add_argument('--list-runs', action='store_true', help='List the runs in the log and exit')
+    parser.add_argument('--batch', action='store_true',
+                        help='One report per debate plus index.pdf, rendered in parallel')
+    parser.add_argument('--run-ids', nargs='+', help='With --batch: only these debates')
+    parser.add_argument('--output-dir', type=str, default="reports", help='With --batch: output directory')
+    parser.add_argument('--workers', type=int, help='With --batch: worker processes (default: CPU count)')
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    import sys
-    log_file = sys.argv[1] if len(sys.argv) > 1 else "final_debate_log.jsonl"
-    report_file = sys.argv[2] if len(sys.argv) > 2 else "debate_report.pdf"
-    generate_pdf_report(log_file, report_file)
+    args = parse_arguments()
+
+    if args.list_runs:
+        for run_id, events in list_runs(args.log_file):
+            print(f"{run_id}\t{events} events")
+    elif args.batch:
+        started = time.perf_counter()
+        try:
+            runs = find_runs(args.log_file, args.run_ids)
+        except (KeyError, FileNotFoundError) as e:
+            print(f"Error: {e.args[0] if isinstance(e, KeyError) else e}")
+            sys.exit(1)
+        rows = generate_batch_reports(runs, args.output_dir, args.workers)
+        failed = [row for row in rows if row["error"]]
+        for row in failed:
+            print(f"⚠️ Report for {row['run_id']} failed: {row['error']}")
+        print(f"✅ {len(rows) - len(failed)} reports and index.pdf saved to {args.output_dir}/ "
+              f"in {time.perf_counter() - started:.1f}s")
+    else:
+        generate_pdf_report(args.log_file, args.report_file, args.run_id)
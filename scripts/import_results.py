@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Backfill the debate results store from JSONL logs
+
+Every debate in the given logs (or directories of logs) that reached a
+verdict becomes a results row with its turns. Debates already in the store,
+e.g. recorded live when they finished, are kept as they are.
+
+Usage: python -m scripts.import_results final_debate_log.jsonl tournament_output/logs
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Iterator, List
+from utils.config import Config
+from utils import log_storage
+from utils.log_index import load_index, qualified_run_id, read_run
+from utils.results import ResultsStore, result_from_events
+
+BATCH_SIZE = 500
+
+def find_logs(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, _ in os.walk(path):
+                yield from log_storage.find_logs(root)
+        else:
+            yield path
+
+def import_logs(store: ResultsStore, paths: List[str]) -> dict:
+    """Import every finished debate in paths; returns counts of logs, runs seen and rows written"""
+    stats = {"logs": 0, "runs": 0, "imported": 0, "skipped": 0}
+    batch = []
+    for log_path in find_logs(paths):
+        stats["logs"] += 1
+        index = load_index(log_path, update=True)
+        for run_id in index:
+            stats["runs"] += 1
+            debate_id = qualified_run_id(log_path, run_id)
+            result = result_from_events(debate_id, read_run(log_path, run_id, index), log_path=log_path)
+            if result is None:
+                stats["skipped"] += 1  # failed or unfinished debate
+                continue
+            batch.append(result)
+            if len(batch) >= BATCH_SIZE:
+                stats["imported"] += store.record_many(batch, replace=False)
+                batch = []
+    stats["imported"] += store.record_many(batch, replace=False)
+    return stats
+
+def parse_arguments():
+    """Parse CLI arguments"""
+    parser = argparse.ArgumentParser(description='Import debate outcomes from JSONL logs into the results store')
+    parser.add_argument('paths', nargs='+', help='Log files or directories of logs')
+    parser.add_argument('--db', type=str, default=Config.RESULTS_PATH, help='Results database')
+    parser.add_argument('--topic', type=str, help='Win rates for topics containing this phrase')
+    return parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = parse_arguments()
+    store = ResultsStore(args.db)
+
+    started = time.perf_counter()
+    stats = import_logs(store, args.paths)
+    print(f"📥 Imported {stats['imported']} debates from {stats['logs']} logs "
+          f"({stats['runs']} runs, {stats['skipped']} without a verdict) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    rates = store.win_rates(topic_contains=args.topic)
+    scope = f" on topics containing '{args.topic}'" if args.topic else ""
+    print(f"\n🏆 Win rates{scope} ({store.count()} debates stored, "
+          f"queried in {(time.perf_counter() - started) * 1000:.1f} ms):")
+    for persona, row in rates.items():
+        print(f"  {persona}: {row['wins']}/{row['debates']} ({row['win_rate']:.0%})")
+    store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
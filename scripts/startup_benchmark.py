@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Multi-Agent Debate DAG
+
+Times fresh interpreter runs of common invocations and, with -X importtime,
+reports which imports dominate each one. Results are written as JSON so
+startup can be tracked between versions.
+
+Usage: python -m scripts.startup_benchmark --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+# Builds the model handle a real run would use, without making a request
+REAL_CLIENT_SNIPPET = (
+    "import main\n"
+    "from utils import llm\n"
+    "llm.create_model()\n"
+)
+
+def cases(log_dir: str) -> Dict[str, Tuple[List[str], Dict[str, str]]]:
+    """Invocation name -> (arguments after the interpreter, extra environment)"""
+    return {
+        "help": (["main.py", "--help"], {}),
+        "mock": (["main.py", "--topic", "Startup check", "--log-path", os.path.join(log_dir, "mock.jsonl")],
+                 {"GEMINI_API_KEY": "", "LLM_BACKEND": "gemini", "MAX_ROUNDS": "2", "SPAN_SUMMARY": "false",
+                  "CHECKPOINT_ENABLED": "false"}),
+        "real": (["-c", REAL_CLIENT_SNIPPET],
+                 {"GEMINI_API_KEY": "startup-benchmark-placeholder", "LLM_BACKEND": "gemini"}),
+    }
+
+def run_once(args: List[str], env: Dict[str, str], importtime: bool = False) -> Tuple[float, str]:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    started = time.perf_counter()
+    completed = subprocess.run(command, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {completed.returncode}: {completed.stderr[-500:]}")
+    return elapsed, completed.stderr
+
+def top_imports(importtime_output: str, limit: int) -> List[Dict[str, int]]:
+    """Top-level packages by cumulative import time (microseconds)"""
+    totals = {}
+    for line in importtime_output.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, module = line[len("import time:"):].split("|")
+        # Nested imports are indented; top-level ones already include them
+        if module.startswith("  "):
+            continue
+        totals[module.strip()] = int(cumulative_us)
+    ranked = sorted(totals.items(), key=lambda item: -item[1])[:limit]
+    return [{"module": module, "cumulative_us": us} for module, us in ranked]
+
+def parse_arguments():
+    """Parse CLI arguments"""
+    parser = argparse.ArgumentParser(description='Cold-start benchmark for common invocations')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per invocation')
+    parser.add_argument('--cases', nargs='+', choices=['help', 'mock', 'real'],
+                        default=['help', 'mock', 'real'], help='Invocations to time')
+    parser.add_argument('--top', type=int, default=8, help='Slowest top-level imports to report per case')
+    parser.add_argument('--output', type=str, default='benchmark_output/startup.json',
+                        help='Where to write the JSON results')
+    return parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = parse_arguments()
+    results = {}
+
+    print(f"{'case':<8}{'median s':>10}{'min s':>9}{'max s':>9}  slowest import")
+    with tempfile.TemporaryDirectory(prefix="debate_startup_") as log_dir:
+        for name in args.cases:
+            case_args, extra_env = cases(log_dir)[name]
+            env = dict(os.environ, **extra_env)
+            timings = [run_once(case_args, env)[0] for _ in range(args.repeat)]
+            _, importtime_output = run_once(case_args, env, importtime=True)
+            imports = top_imports(importtime_output, args.top)
+
+            results[name] = {
+                "median_s": round(statistics.median(timings), 4),
+                "min_s": round(min(timings), 4),
+                "max_s": round(max(timings), 4),
+                "runs": args.repeat,
+                "top_imports": imports,
+            }
+            slowest = f"{imports[0]['module']} ({imports[0]['cumulative_us'] / 1000:.0f} ms)" if imports else "-"
+            print(f"{name:<8}{results[name]['median_s']:>10.3f}{results[name]['min_s']:>9.3f}"
+                  f"{results[name]['max_s']:>9.3f}  {slowest}")
+
+    report = {"python": platform.python_version(), "cases": results}
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"📝 Results saved to: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
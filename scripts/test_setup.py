@@ -17,6 +17,7 @@ def test_imports():
         
         # Test node imports
         from nodes.user_input_node import UserInputNode
+        from nodes.persona_agent_node import PersonaAgentNode
         from nodes.agent_a_node import AgentANode
         from nodes.agent_b_node import AgentBNode
         from nodes.debate_controller import DebateController
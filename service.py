@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Debate service for the Multi-Agent Debate DAG
+Accepts debate jobs over HTTP into a bounded queue, runs them on a worker
+pool that shares the compiled graph, and streams progress as server-sent events
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import queue
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from utils.config import Config
+from utils.logger import DebateLogger
+from main import DebateSystem
+from debate_graph import get_debate_graph
+
+MAX_ROUNDS_LIMIT = 100
+
+class JobRejected(Exception):
+    """The job request is invalid (HTTP 400)"""
+
+class QueueFull(Exception):
+    """The job queue is at capacity (HTTP 503)"""
+
+class ServiceJob:
+    """One queued debate, its progress events and its outcome"""
+
+    def __init__(self, job_id: str, request: Dict[str, Any]):
+        self.id = job_id
+        self.request = request
+        self.status = "queued"  # queued | running | completed | failed
+        self.result: Dict[str, Any] = {}
+        self.events: List[str] = []
+        self.created_at = time.time()
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def publish(self, entry: Dict[str, Any]):
+        """DebateLogger on_event hook: keep each log entry as a serialized SSE message"""
+        message = f"event: {entry['event_type']}\ndata: {json.dumps(entry)}\n\n"
+        with self._changed:
+            self.events.append(message)
+            self._changed.notify_all()
+
+    def finish(self, status: str, **result):
+        with self._changed:
+            self.status = status
+            self.result = result
+            self.events.append(f"event: done\ndata: {json.dumps(self.to_dict())}\n\n")
+            self._changed.notify_all()
+
+    def wait_for_events(self, seen: int, timeout: float) -> List[str]:
+        """Events after the first `seen`, blocking up to timeout for new ones"""
+        with self._changed:
+            if len(self.events) <= seen and not self.done:
+                self._changed.wait(timeout)
+            return self.events[seen:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "status": self.status, "request": self.request, **self.result}
+
+class DebateService:
+    """Bounded job queue drained by a pool of worker threads"""
+
+    # Finished jobs kept for status and event replay, oldest dropped first
+    MAX_FINISHED_JOBS = 1000
+
+    def __init__(self, workers: int = 4, queue_size: int = 64, log_dir: str = "logs/service"):
+        self.workers = workers
+        self.log_dir = log_dir
+        self._queue: "queue.Queue[Optional[ServiceJob]]" = queue.Queue(maxsize=queue_size)
+        self._jobs: "OrderedDict[str, ServiceJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        # Compile the shared graph before taking traffic
+        get_debate_graph()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"debate-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def submit(self, request: Dict[str, Any]) -> ServiceJob:
+        """Validate and enqueue a job; raises JobRejected or QueueFull"""
+        request = self._validate(request)
+        # Random ids so restarts never append to an earlier job's log file
+        job = ServiceJob(uuid.uuid4().hex[:12], request)
+        with self._lock:
+            # Register before queueing so a worker can't finish it before it's visible
+            self._jobs[job.id] = job
+            self._trim_jobs()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+            raise QueueFull(f"Job queue is full ({self._queue.maxsize} waiting)")
+        return job
+
+    def get(self, job_id: str) -> Optional[ServiceJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "running": statuses.count("running"),
+            "completed": statuses.count("completed"),
+            "failed": statuses.count("failed"),
+        }
+
+    def _validate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            raise JobRejected("Request body must be a JSON object")
+        topic = str(request.get("topic") or "").strip()
+        if not topic:
+            raise JobRejected("topic is required")
+        max_rounds = request.get("max_rounds")
+        # bool is an int subclass, but JSON true/false isn't a round count or seed
+        if max_rounds is not None and (type(max_rounds) is not int or not 1 <= max_rounds <= MAX_ROUNDS_LIMIT):
+            raise JobRejected(f"max_rounds must be an integer between 1 and {MAX_ROUNDS_LIMIT}")
+        seed = request.get("seed")
+        if seed is not None and type(seed) is not int:
+            raise JobRejected("seed must be an integer")
+        personas = request.get("personas")
+        if personas is not None and (not isinstance(personas, list) or len(personas) < 2 or
+                                     not all(isinstance(p, str) and p.strip() for p in personas) or
+                                     len(set(personas)) < len(personas)):
+            raise JobRejected("personas must be a list of two or more distinct names")
+        return {
+            "topic": topic,
+            "agent_a": personas[0] if personas else request.get("agent_a") or Config.AGENT_A_PERSONA,
+            "agent_b": personas[1] if personas else request.get("agent_b") or Config.AGENT_B_PERSONA,
+            "personas": personas,
+            "seed": seed,
+            "max_rounds": max_rounds or Config.MAX_ROUNDS,
+        }
+
+    def _trim_jobs(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._run_job(job)
+
+    def _run_job(self, job: ServiceJob):
+        job.status = "running"
+        request = job.request
+        logger = DebateLogger(log_file=os.path.join(self.log_dir, f"debate_{job.id}.jsonl"),
+                              on_event=job.publish)
+        started = time.perf_counter()
+        error = "Debate execution failed"
+        try:
+            final_state = DebateSystem(logger=logger).run_debate(topic=request["topic"],
+                                                                 agent_a_persona=request["agent_a"],
+                                                                 agent_b_persona=request["agent_b"],
+                                                                 seed=request["seed"],
+                                                                 max_rounds=request["max_rounds"],
+                                                                 personas=request["personas"])
+        except Exception as e:
+            final_state = None
+            error = str(e)
+        finally:
+            logger.close()
+
+        duration = round(time.perf_counter() - started, 3)
+        if final_state:
+            job.finish("completed", winner=final_state["winner"], turns=len(final_state["turns"]),
+                       duration_s=duration, log_path=logger.log_file)
+        else:
+            job.finish("failed", error=error, duration_s=duration, log_path=logger.log_file)
+        with self._lock:
+            self._trim_jobs()
+
+class DebateRequestHandler(BaseHTTPRequestHandler):
+    """POST /debates, GET /debates/<id>, GET /debates/<id>/events, GET /health"""
+
+    service: DebateService = None
+    KEEPALIVE_INTERVAL = 15.0
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/debates":
+            return self._send_json(404, {"error": "Not found"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job = self.service.submit(request)
+        except (ValueError, JobRejected) as e:
+            return self._send_json(400, {"error": str(e)})
+        except QueueFull as e:
+            # Backpressure: the client should retry once workers catch up
+            return self._send_json(503, {"error": str(e)}, headers={"Retry-After": "5"})
+        self._send_json(202, {"id": job.id, "status": job.status,
+                              "events": f"/debates/{job.id}/events"})
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if parts == ["health"]:
+            return self._send_json(200, self.service.stats())
+        if len(parts) in (2, 3) and parts[0] == "debates":
+            job = self.service.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": f"Unknown debate {parts[1]}"})
+            if len(parts) == 2:
+                return self._send_json(200, job.to_dict())
+            if parts[2] == "events":
+                return self._stream_events(job)
+        self._send_json(404, {"error": "Not found"})
+
+    def _stream_events(self, job: ServiceJob):
+        """Replay the job's events so far, then stream new ones until it finishes"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        seen = 0
+        try:
+            while True:
+                events = job.wait_for_events(seen, self.KEEPALIVE_INTERVAL)
+                if events:
+                    seen += len(events)
+                    self.wfile.write("".join(events).encode("utf-8"))
+                elif not job.done:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+                if job.done and seen >= len(job.events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return  # Client went away; the debate keeps running
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Dict[str, str] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Debates already print their own progress; keep request lines short
+        sys.stderr.write(f"[service] {self.address_string()} {format % args}\n")
+
+def create_server(service: DebateService, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    """HTTP server bound to service (port 0 picks a free port)"""
+    handler = type("BoundDebateRequestHandler", (DebateRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def parse_arguments():
+    """Parse CLI arguments"""
+    parser = argparse.ArgumentParser(description='Debate service with a job queue and worker pool')
+    parser.add_argument('--host', type=str, default=Config.SERVICE_HOST, help='Address to bind')
+    parser.add_argument('--port', type=int, default=Config.SERVICE_PORT, help='Port to listen on')
+    parser.add_argument('--workers', type=int, default=Config.SERVICE_WORKERS,
+                        help='Debates running at once')
+    parser.add_argument('--queue-size', type=int, default=Config.SERVICE_QUEUE_SIZE,
+                        help='Jobs allowed to wait before new ones are rejected with 503')
+    parser.add_argument('--log-dir', type=str, default='logs/service', help='Directory for per-debate logs')
+    parser.add_argument('--backend', choices=['gemini', 'fake'], help='Model backend')
+    return parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = parse_arguments()
+    if args.backend:
+        Config.update(LLM_BACKEND=args.backend)
+
+    service = DebateService(workers=args.workers, queue_size=args.queue_size, log_dir=args.log_dir)
+    service.start()
+    server = create_server(service, args.host, args.port)
+    print(f"🛰️ Debate service listening on http://{args.host}:{server.server_port} "
+          f"({args.workers} workers, queue size {args.queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
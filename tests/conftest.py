@@ -0,0 +1,8 @@
+import pytest
+from utils.config import Config
+
+@pytest.fixture(autouse=True)
+def isolated_stores(tmp_path, monkeypatch):
+    # Tests that turn checkpointing or results on must not write into the working tree
+    monkeypatch.setattr(Config, "CHECKPOINT_PATH", str(tmp_path / "checkpoints.sqlite"))
+    monkeypatch.setattr(Config, "RESULTS_PATH", str(tmp_path / "results.sqlite"))
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from utils.config import Config
+from utils import llm
+from main import DebateSystem
+from debate_graph import DebateGraph
+
+class FakeAsyncModel:
+    """Async-only stand-in that tracks how many requests are in flight"""
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return type("Response", (), {"text": "WINNER: Scientist\nREASONING: Async evidence.\n"})()
+
+@pytest.fixture(autouse=True)
+def mock_mode(monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", None)
+
+def _attach(system, model):
+    for node in (system.graph.agent_a, system.graph.agent_b, system.graph.judge):
+        node.client = True
+        node.model = model
+
+def test_async_debate_uses_async_generation(tmp_path):
+    model = FakeAsyncModel()
+    system = DebateSystem(log_path=str(tmp_path / "log.jsonl"), async_mode=True,
+                          graph=DebateGraph(async_mode=True))
+    _attach(system, model)
+
+    final_state = asyncio.run(system.arun_debate(topic="Should AI be regulated like medicine?"))
+
+    assert final_state is not None
+    assert len(final_state["turns"]) == Config.MAX_ROUNDS
+    # One call per turn plus the judge's summary and verdict
+    assert model.calls == Config.MAX_ROUNDS + 2
+    assert final_state["winner"] == "Scientist"
+
+def test_request_semaphore_caps_in_flight_calls(monkeypatch):
+    monkeypatch.setattr(Config, "MAX_CONCURRENT_REQUESTS", 3)
+    model = FakeAsyncModel()
+
+    async def burst():
+        await asyncio.gather(*(llm.agenerate(model, "prompt", None) for _ in range(10)))
+
+    asyncio.run(burst())
+    assert model.calls == 10
+    assert model.peak == 3
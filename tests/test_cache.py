@@ -0,0 +1,53 @@
+import time
+from utils.config import Config
+from utils.cache import ResponseCache
+from utils import llm
+
+class CountingModel:
+    model_name = "models/fake"
+    def __init__(self):
+        self.calls = 0
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        return type("Response", (), {"text": f" answer to {prompt} "})()
+
+def test_hits_and_misses(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    key = cache.make_key("gemini", "prompt", {"temperature": 0.0})
+    assert cache.get(key) is None
+    cache.put(key, "gemini", "response")
+    assert cache.get(key) == "response"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_key_covers_model_prompt_and_config():
+    base = ResponseCache.make_key("gemini", "prompt", {"temperature": 0.0})
+    assert base == ResponseCache.make_key("gemini", "prompt", {"temperature": 0.0})
+    assert base != ResponseCache.make_key("other", "prompt", {"temperature": 0.0})
+    assert base != ResponseCache.make_key("gemini", "prompt!", {"temperature": 0.0})
+    assert base != ResponseCache.make_key("gemini", "prompt", {"temperature": 0.7})
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.put("a", "m", "A")
+    time.sleep(0.01)
+    cache.put("b", "m", "B")
+    time.sleep(0.01)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", "m", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.stats()["evictions"] == 1
+
+def test_generate_replays_from_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "CACHE_ENABLED", True)
+    monkeypatch.setattr(Config, "CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    model = CountingModel()
+    config = {"temperature": 0.0, "max_output_tokens": 150}
+
+    first = llm.generate(model, "Is AI sentient?", config)
+    second = llm.generate(model, "Is AI sentient?", config)
+
+    assert first == second == "answer to Is AI sentient?"
+    assert model.calls == 1
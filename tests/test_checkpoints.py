@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from utils.config import Config
+from nodes.memory_node import MemoryNode
+from main import DebateSystem
+from debate_graph import DebateGraph
+
+@pytest.fixture(autouse=True)
+def mock_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", None)
+    monkeypatch.setattr(Config, "LLM_BACKEND", "gemini")
+    monkeypatch.setattr(Config, "SPAN_SUMMARY", False)
+    monkeypatch.setattr(Config, "CHECKPOINT_ENABLED", True)
+    monkeypatch.setattr(Config, "CHECKPOINT_PATH", str(tmp_path / "checkpoints.sqlite"))
+
+def _graph_failing_once(async_mode=False, after_turns=3):
+    """Graph whose memory node raises the first time it sees after_turns turns"""
+    original = MemoryNode.execute
+    failed = []
+
+    def flaky_execute(self, state):
+        if len(state["turns"]) == after_turns and not failed:
+            failed.append(True)
+            raise RuntimeError("429 Resource exhausted")
+        return original(self, state)
+
+    # The graph binds node methods when built, so only this graph sees the patch
+    MemoryNode.execute = flaky_execute
+    try:
+        return DebateGraph(async_mode=async_mode)
+    finally:
+        MemoryNode.execute = original
+
+def test_failed_debate_resumes_from_last_checkpoint(tmp_path):
+    graph = _graph_failing_once()
+    system = DebateSystem(log_path=str(tmp_path / "log.jsonl"), graph=graph)
+
+    assert system.run_debate(topic="Should AI be regulated like medicine?") is None
+    debate_id = system.debate_id
+
+    final_state = system.resume_debate(debate_id)
+    assert final_state is not None
+    assert len(final_state["turns"]) == Config.MAX_ROUNDS
+    # The failed step was retried, not duplicated: speakers still strictly alternate
+    speakers = [t["agent"] for t in final_state["turns"]]
+    assert all(a != b for a, b in zip(speakers, speakers[1:]))
+
+    # Finished debates drop their checkpoints
+    assert system.resume_debate(debate_id) is None
+
+def test_async_resume(tmp_path):
+    graph = _graph_failing_once(async_mode=True)
+    system = DebateSystem(log_path=str(tmp_path / "log.jsonl"), async_mode=True, graph=graph)
+
+    assert asyncio.run(system.arun_debate(topic="Should AI be regulated like medicine?")) is None
+    final_state = asyncio.run(system.aresume_debate(system.debate_id))
+    assert final_state is not None
+    assert len(final_state["turns"]) == Config.MAX_ROUNDS
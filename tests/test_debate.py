@@ -1,9 +1,11 @@
 import unittest
-from utils.state import create_initial_state, AgentType, DebateState
+from unittest import mock
+from utils.state import create_initial_state, AgentType, DebateState, Turn
 from utils.config import Config
 from nodes.debate_controller import DebateController
 from nodes.memory_node import MemoryNode
 from utils.logger import DebateLogger
+from utils.text import estimate_tokens
 
 class MockLogger(DebateLogger):
     def __init__(self):
@@ -60,11 +62,36 @@ class TestDebateLogic(unittest.TestCase):
         
         # Coherent argument
         state["turns"] = [{"agent": "Scientist", "text": "Climate change require urgent solutions.", "round": 1}]
-        self.assertTrue(self.controller._check_coherence(state))
+        self.assertLess(self.controller._score_drift(state)[0], Config.DRIFT_THRESHOLD)
         
         # Drifting argument (no keywords like climate, change, solutions, carbon, emissions)
         state["turns"] = [{"agent": "Scientist", "text": "The price of bananas is increasing.", "round": 1}]
-        self.assertFalse(self.controller._check_coherence(state))
+        self.assertGreaterEqual(self.controller._score_drift(state)[0], Config.DRIFT_THRESHOLD)
+
+    def test_every_turn_of_a_parallel_round_is_scored(self):
+        """All turns added since the last step get a drift score and a drift check"""
+        state = create_initial_state()
+        state["topic"] = "Climate Change Solutions"
+        state["personas"] = ["Scientist", "Philosopher", "Economist"]
+        state["turns"] = [Turn(round=1, agent="Scientist", text="The price of bananas is increasing."),
+                          Turn(round=1, agent="Philosopher", text="Climate change needs solutions."),
+                          Turn(round=1, agent="Economist", text="Football season starts soon.")]
+
+        state = self.controller.execute(state)
+
+        self.assertTrue(all(turn["drift_score"] is not None for turn in state["turns"]))
+        drift_warnings = [payload for step, payload in self.logger.logs
+                          if step == "WARNING" and "drift" in payload]
+        self.assertEqual(len(drift_warnings), 2)
+
+        # Already scored turns aren't scored (or warned about) again
+        state = self.controller.execute(state)
+        self.assertEqual(len([p for s, p in self.logger.logs if s == "WARNING" and "drift" in p]), 2)
+
+        # A topic without content words can't be drifted from
+        state["topic"] = "Is it?"
+        state["turns"].append(Turn(round=2, agent="Scientist", text="Bananas."))
+        self.assertEqual(self.controller._score_drift(state), [])
 
     def test_memory_context(self):
         """Test that memory node provides relevant context slices"""
@@ -82,5 +109,67 @@ class TestDebateLogic(unittest.TestCase):
         self.assertIn("YOUR PREVIOUS POINT", state["agent_a_context"])
         self.assertIn("Data proves X.", state["agent_a_context"])
 
+    def test_turns_are_compact_and_logged_by_index(self):
+        """Turns share persona strings and MEMORY_UPDATE doesn't repeat their text"""
+        state = create_initial_state()
+        scientist = "".join(["Scien", "tist"])  # a distinct string object
+        state["turns"] = [Turn(round=1, agent=scientist, text="Data proves X."),
+                          Turn(round=1, agent="Philosopher", text="But what about Y?")]
+        self.assertIs(state["turns"][0]["agent"], Turn(round=2, agent="Scientist", text="")["agent"])
+        self.assertLessEqual(state["turns"][0].timestamp, state["turns"][1].timestamp)
+        self.assertEqual(state["turns"][1].get("round"), 1)
+
+        self.memory.execute(state)
+        step, payload = self.logger.logs[-1]
+        self.assertEqual(step, "MEMORY_UPDATE")
+        self.assertEqual(payload, {"total_turns": 2, "latest_turn_index": 1})
+        self.assertIn("But what about Y?", state["agent_a_context"])
+
+    def _turns(self, count, text="Point {i}."):
+        personas = ("Scientist", "Philosopher")
+        return [Turn(round=i // 2 + 1, agent=personas[i % 2], text=text.format(i=i)) for i in range(count)]
+
+    def test_earlier_exchanges_truncate_the_oldest_turn_to_the_budget(self):
+        """Older turns fill the budget newest first; the oldest that partly fits is cut"""
+        # Every line is 58 characters (15 tokens) and the header 7 tokens
+        turns = self._turns(4, text="T{i} " + "x" * 33)
+        earlier = self.memory._earlier_exchanges(turns, set(), 7 + 15 * 2 + 5)
+
+        lines = earlier.splitlines()
+        self.assertEqual(lines[0], "--- EARLIER EXCHANGES ---")
+        self.assertEqual(len(lines), 4)  # turn 0 no longer fits
+        self.assertTrue(lines[1].endswith("...") and len(lines[1]) == 5 * 4)
+        self.assertTrue(lines[2].startswith("[Round 2] Scientist: T2"))
+        self.assertTrue(lines[3].startswith("[Round 2] Philosopher: T3"))
+
+    def test_context_lists_earlier_exchanges_in_order_within_budget(self):
+        state = create_initial_state()
+        state["turns"] = self._turns(8)
+        with mock.patch.object(Config, "MEMORY_TOKEN_BUDGET", 400):
+            state = self.memory.execute(state)
+        context = state["agent_a_context"]
+
+        # The latest two turns are quoted above; the rest follow oldest first
+        earlier = context.split("--- EARLIER EXCHANGES ---\n")[1]
+        self.assertEqual([line.split(": ", 1)[1] for line in earlier.splitlines()],
+                         [f"Point {i}." for i in range(6)])
+
+        with mock.patch.object(Config, "MEMORY_TOKEN_BUDGET", 60):
+            state = self.memory.execute(state)
+        self.assertLessEqual(estimate_tokens(state["agent_a_context"]), 60)
+        self.assertNotIn("Point 0.", state["agent_a_context"])
+
+    def test_turn_index_is_rebuilt_when_turns_are_rewound(self):
+        """A resumed debate can restore fewer turns than were indexed"""
+        state = create_initial_state()
+        state["turns"] = self._turns(4)
+        state = self.memory.execute(state)
+        self.assertEqual(state["persona_turns"], {"Scientist": [0, 2], "Philosopher": [1, 3]})
+
+        state["turns"] = state["turns"][:1]
+        state = self.memory.execute(state)
+        self.assertEqual(state["persona_turns"], {"Scientist": [0]})
+        self.assertIn("Opponent has not spoken yet.", state["agent_a_context"])
+
 if __name__ == '__main__':
     unittest.main()
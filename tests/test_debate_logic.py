@@ -2,6 +2,7 @@ import pytest
 from utils.state import create_initial_state, AgentType
 from utils.config import Config
 from nodes.debate_controller import DebateController
+from nodes.persona_agent_node import PersonaAgentNode
 from utils.logger import DebateLogger
 import os
 
@@ -81,6 +82,37 @@ def test_round_limit(controller):
     state = controller.execute(state)
     assert state["is_complete"] is True
 
+def test_personas_take_turns_in_seat_order(controller, monkeypatch):
+    monkeypatch.setattr(Config, "PARALLEL_ROUNDS", "opening")
+    state = create_initial_state()
+    state["personas"] = ["Scientist", "Philosopher", "Economist"]
+    
+    # The opening round is independent: every persona speaks at once
+    state = controller.execute(state)
+    assert state["next_speakers"] == [0, 1, 2]
+    
+    for persona in state["personas"]:
+        state["turns"].append({"round": 1, "agent": persona, "text": f"{persona} opens."})
+    
+    # Later rounds alternate through all seats
+    state = controller.execute(state)
+    assert state["next_speakers"] == [0] and state["current_round"] == 2
+    state["turns"].append({"round": 2, "agent": "Scientist", "text": "Evidence matters."})
+    state = controller.execute(state)
+    assert state["next_speakers"] == [1]
+    state["turns"].append({"round": 2, "agent": "Philosopher", "text": "So does meaning."})
+    state = controller.execute(state)
+    assert state["next_speakers"] == [2] and state["current_agent"] is None
+
+def test_agent_prompt_uses_the_debate_turn_limit(controller):
+    state = create_initial_state()
+    state["topic"] = "Is AI sentient?"
+    state["max_rounds"] = 20
+    state["current_round"] = 3
+
+    prompt = PersonaAgentNode(controller.logger)._build_prompt(state, 0, "")
+    assert "(Round 3/20)" in prompt
+
 def teardown_module(module):
     if os.path.exists("test_log.jsonl"):
         os.remove("test_log.jsonl")
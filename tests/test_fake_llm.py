@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+from utils.config import Config
+from utils.fake_llm import FakeGenerativeModel, FakeLLMError
+from utils import llm
+from main import DebateSystem
+
+def test_fake_model_answers_judge_prompts_in_parseable_format():
+    model = FakeGenerativeModel(latency_ms=0, seed=1)
+    prompt = "Who won? The Physicist or the Theologian?\nWINNER: [Persona Name]"
+    text = model.generate_content(prompt).text
+    assert text.startswith("WINNER: ")
+    assert text.split("\n")[0].split(": ")[1] in ("Physicist", "Theologian")
+
+def test_fake_model_stream_and_async_match_blocking_text():
+    prompt = "Argue for regulation."
+    blocking = FakeGenerativeModel(latency_ms=0, seed=3).generate_content(prompt)
+    streamed = "".join(c.text for c in FakeGenerativeModel(latency_ms=0, seed=3).generate_content(prompt, stream=True))
+    async_text = asyncio.run(FakeGenerativeModel(latency_ms=0, seed=3).generate_content_async(prompt)).text
+    assert blocking.text == streamed == async_text
+    assert blocking.usage_metadata.candidates_token_count == 60
+
+def test_fake_model_error_rate():
+    model = FakeGenerativeModel(latency_ms=0, error_rate=1.0)
+    with pytest.raises(FakeLLMError):
+        model.generate_content("prompt")
+
+def test_long_debate_on_fake_backend(tmp_path, monkeypatch):
+    """Debates longer than the old fixed recursion limit of 50 steps complete"""
+    monkeypatch.setattr(Config, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(Config, "FAKE_LLM_LATENCY_MS", 0.0)
+    monkeypatch.setattr(Config, "MAX_ROUNDS", 20)
+    monkeypatch.setattr(Config, "CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "SPAN_SUMMARY", False)
+    llm.reset_models()
+
+    assert isinstance(llm.create_model(), FakeGenerativeModel)
+    system = DebateSystem(log_path=str(tmp_path / "debate.jsonl"))
+    final_state = system.run_debate(topic="Should AI be regulated like medicine?", seed=7)
+    system.logger.close()
+
+    assert final_state is not None
+    assert len(final_state["turns"]) == 20
+    assert final_state["winner"] in (final_state["agent_a_persona"], final_state["agent_b_persona"])
@@ -0,0 +1,67 @@
+import json
+import threading
+import pytest
+from utils.config import Config
+from main import DebateSystem
+from debate_graph import DebateGraph, get_debate_graph
+
+@pytest.fixture(autouse=True)
+def mock_mode(monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", None)
+    monkeypatch.setattr(Config, "LLM_BACKEND", "gemini")
+    monkeypatch.setattr(Config, "SPAN_SUMMARY", False)
+
+def _events(path):
+    with open(path) as f:
+        return [json.loads(line)["event_type"] for line in f]
+
+def test_graph_is_compiled_once_and_shared(tmp_path):
+    first = DebateSystem(log_path=str(tmp_path / "a.jsonl"))
+    second = DebateSystem(log_path=str(tmp_path / "b.jsonl"))
+    assert first.app is second.app is get_debate_graph().app
+
+    # Repeated runs on one system reuse the same compiled app
+    assert first.run_debate(topic="Should AI be regulated like medicine?")
+    assert first.run_debate(topic="Is remote work better for productivity?")
+    assert second.run_debate(topic="Should cities ban cars downtown?")
+
+    # Each system's events land in its own log, even though nodes are shared
+    assert _events(tmp_path / "a.jsonl").count("USER_INPUT") == 2
+    assert _events(tmp_path / "b.jsonl").count("USER_INPUT") == 1
+
+class BarrierModel:
+    """Answers only once every speaker of the round is waiting, i.e. when they run concurrently"""
+    def __init__(self, parties):
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def generate_content(self, prompt, generation_config=None):
+        self.barrier.wait()
+        return type("Response", (), {"text": "An independent opening."})()
+
+def test_parallel_round_runs_every_persona_at_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "PARALLEL_ROUNDS", "all")
+    monkeypatch.setattr(Config, "CHECKPOINT_ENABLED", False)
+    monkeypatch.setattr(Config, "RESULTS_ENABLED", False)
+    personas = ["Scientist", "Philosopher", "Economist"]
+    system = DebateSystem(log_path=str(tmp_path / "log.jsonl"), graph=DebateGraph())
+    system.graph.agent.client = True
+    system.graph.agent.model = BarrierModel(len(personas))
+
+    final_state = system.run_debate(topic="Should AI be regulated like medicine?", personas=personas, max_rounds=6)
+
+    assert [(t["round"], t["agent"]) for t in final_state["turns"]] == [(r, p) for r in (1, 2) for p in personas]
+    rounds = [e for e in _events(tmp_path / "log.jsonl") if e.startswith("ROUND_")]
+    assert sorted(rounds[:3]) == ["ROUND_1_PERSONA_3", "ROUND_1_PHILOSOPHER", "ROUND_1_SCIENTIST"]
+
+def test_running_summary_tracks_every_turn_but_the_last(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "RUNNING_SUMMARY", True)
+    monkeypatch.setattr(Config, "CHECKPOINT_ENABLED", False)
+    monkeypatch.setattr(Config, "RESULTS_ENABLED", False)
+    system = DebateSystem(log_path=str(tmp_path / "log.jsonl"), graph=DebateGraph())
+
+    final_state = system.run_debate(topic="Should AI be regulated like medicine?")
+
+    # Each update ran alongside the next speaker; the final turn is left to the judge verbatim
+    assert final_state["summarized_turns"] == Config.MAX_ROUNDS - 1
+    assert final_state["summary"].startswith("Mock Running Summary")
+    assert _events(tmp_path / "log.jsonl").count("RUNNING_SUMMARY") == Config.MAX_ROUNDS - 1
@@ -0,0 +1,202 @@
+import json
+import time
+import asyncio
+import threading
+import pytest
+from utils.config import Config
+from utils.state import create_initial_state
+from nodes.judge_node import JudgeNode
+from utils.logger import DebateLogger
+
+class MockLogger(DebateLogger):
+    def __init__(self):
+        self.logs = []
+        self.log_file = "mock_log.jsonl"
+    def log_step(self, step_name, content):
+        self.logs.append((step_name, content))
+
+class FakeModel:
+    """Sync stand-in answering by prompt type"""
+    def __init__(self, barrier=None):
+        self.barrier = barrier
+        self.prompts = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        if self.barrier:
+            # Both judge requests must be in flight at the same time to pass
+            self.barrier.wait()
+        if "JSON object" in prompt:
+            text = json.dumps({"summary": "A close clash.", "winner": "Philosopher", "reasoning": "Deeper rebuttals."})
+        elif "Summarize" in prompt:
+            text = "Both sides argued well."
+        else:
+            text = "WINNER: Philosopher\nREASONING: Better rebuttals."
+        return type("Response", (), {"text": text})()
+
+@pytest.fixture
+def state():
+    state = create_initial_state()
+    state["topic"] = "Should AI be regulated like medicine?"
+    state["turns"] = [
+        {"agent": "Scientist", "text": "Trials reduce harm.", "round": 1},
+        {"agent": "Philosopher", "text": "Harm is not the only value.", "round": 1},
+    ]
+    return state
+
+def _judge(model):
+    judge = JudgeNode(MockLogger())
+    judge.client = True
+    judge.model = model
+    return judge
+
+def test_concurrent_mode_overlaps_requests(monkeypatch, state):
+    monkeypatch.setattr(Config, "JUDGE_MODE", "concurrent")
+    model = FakeModel(barrier=threading.Barrier(2, timeout=5))
+
+    state = _judge(model).execute(state)
+
+    assert len(model.prompts) == 2
+    assert state["winner"] == "Philosopher"
+    assert state["judgment"].startswith("Both sides argued well.")
+
+def test_structured_mode_uses_one_call(monkeypatch, state):
+    monkeypatch.setattr(Config, "JUDGE_MODE", "structured")
+    model = FakeModel()
+
+    state = _judge(model).execute(state)
+
+    assert len(model.prompts) == 1
+    assert state["winner"] == "Philosopher"
+    assert "A close clash." in state["judgment"]
+    assert "Deeper rebuttals." in state["judgment"]
+
+def test_running_summary_replaces_earlier_turns(monkeypatch, state):
+    monkeypatch.setattr(Config, "JUDGE_MODE", "sequential")
+    monkeypatch.setattr(Config, "RUNNING_SUMMARY", True)
+    state["turns"] = state["turns"] + [
+        {"agent": "Scientist", "text": "Oversight needs evidence.", "round": 2},
+        {"agent": "Philosopher", "text": "Evidence needs values.", "round": 2},
+    ]
+    state["summary"] = "Round 1: harm reduction against other values."
+    state["summarized_turns"] = 3  # the last turn landed after the latest update
+    model = FakeModel()
+
+    _judge(model).execute(state)
+
+    for prompt in model.prompts:
+        assert "Round 1: harm reduction against other values." in prompt
+        assert "Trials reduce harm." not in prompt
+        # The latest exchange is quoted even where the summary already covers it
+        assert "Oversight needs evidence." in prompt and "Evidence needs values." in prompt
+
+class PanelModel:
+    """Answers panel verdicts by temperature; votes beyond the first `answering` are slow and fail"""
+    def __init__(self, winners, answering=None):
+        self.winners = winners
+        self.answering = answering
+        self.calls = []
+        self.finished = 0
+        self.lock = threading.Lock()
+
+    def _reply(self, prompt, generation_config):
+        if "Summarize" in prompt:
+            return type("Response", (), {"text": "Both sides argued well."})()
+        winner = self.winners[generation_config["temperature"]]
+        return type("Response", (), {"text": f"WINNER: {winner}\nREASONING: Judged at {generation_config['temperature']}."})()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self.lock:
+            self.calls.append(prompt)
+            blocked = "Summarize" not in prompt and self.answering is not None and \
+                sum("Summarize" not in p for p in self.calls) > self.answering
+        try:
+            if blocked:
+                time.sleep(0.5)
+                raise RuntimeError("late judge failed")
+            return self._reply(prompt, generation_config)
+        finally:
+            with self.lock:
+                self.finished += 1
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        with self.lock:
+            self.calls.append(prompt)
+            blocked = "Summarize" not in prompt and self.answering is not None and \
+                sum("Summarize" not in p for p in self.calls) > self.answering
+        if blocked:
+            await asyncio.sleep(5)  # cancelled once the vote is decided
+        return self._reply(prompt, generation_config)
+
+@pytest.fixture
+def panel(monkeypatch):
+    monkeypatch.setattr(Config, "JUDGE_MODE", "concurrent")
+    monkeypatch.setattr(Config, "JUDGE_PANEL_SIZE", 5)
+    monkeypatch.setattr(Config, "JUDGE_PANEL_TEMPERATURES", [0.1, 0.2, 0.3, 0.4, 0.5])
+    monkeypatch.setattr(Config, "JUDGE_PANEL_CONCURRENCY", 3)
+
+def test_panel_stops_once_the_majority_is_decided(panel, state):
+    # The first three judges agree; later votes can't change the result
+    model = PanelModel({t: "Philosopher" for t in (0.1, 0.2, 0.3, 0.4, 0.5)}, answering=3)
+    judge = _judge(model)
+
+    started = time.perf_counter()
+    state = judge.execute(state)
+
+    # The slow judges already in flight aren't waited for
+    assert time.perf_counter() - started < 0.4
+    # ...and when they fail later, their votes are dropped and not logged
+    deadline = time.perf_counter() + 2
+    while model.finished < len(model.calls) and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    assert model.finished == len(model.calls)
+    assert "ERROR_EVALUATION" not in [step for step, _ in judge.logger.logs]
+    assert state["winner"] == "Philosopher"
+    assert state["panel"]["votes"] == {"Philosopher": 3}
+    assert state["panel"]["agreement"] == 1.0
+    assert state["panel"]["cancelled"] == 2
+    assert [step for step, _ in judge.logger.logs].count("JUDGE_PANEL") == 1
+
+def test_async_panel_cancels_outstanding_judges(panel, state):
+    model = PanelModel({t: "Philosopher" for t in (0.1, 0.2, 0.3, 0.4, 0.5)}, answering=3)
+
+    started = time.perf_counter()
+    state = asyncio.run(_judge(model).aexecute(state))
+
+    assert time.perf_counter() - started < 2
+    assert state["winner"] == "Philosopher"
+    assert state["panel"]["cancelled"] == 2
+
+def test_panel_records_each_verdict(panel, monkeypatch, state):
+    monkeypatch.setattr(Config, "JUDGE_PANEL_SIZE", 4)
+    # Format drift ("The Scientist") still counts as a vote; a "Tie" verdict abstains
+    model = PanelModel({0.1: "The Scientist", 0.2: "Philosopher", 0.3: "Tie", 0.4: "Scientist"})
+
+    state = _judge(model).execute(state)
+
+    assert state["winner"] == "Scientist"
+    assert state["panel"]["votes"] == {"Scientist": 2, "Philosopher": 1}
+    assert state["panel"]["agreement"] == pytest.approx(2 / 3)
+    assert [v["winner"] for v in state["panel"]["verdicts"]] == ["The Scientist", "Philosopher", "Tie", "Scientist"]
+    # Each judge weighs a different criterion, cycling through them
+    assert [v["criterion"] for v in state["panel"]["verdicts"]] == [
+        "logical consistency", "use of evidence/reasoning", "rebuttal effectiveness", "logical consistency"]
+    assert sum("Weigh rebuttal effectiveness most heavily." in p for p in model.calls) == 1
+
+def test_structured_mode_warns_that_the_panel_is_unused(panel, monkeypatch, state, capsys):
+    monkeypatch.setattr(Config, "JUDGE_MODE", "structured")
+    model = FakeModel()
+
+    state = _judge(model).execute(state)
+
+    assert len(model.prompts) == 1
+    assert "JUDGE_PANEL_SIZE is ignored" in capsys.readouterr().out
+
+def test_split_panel_is_a_tie(panel, monkeypatch, state):
+    monkeypatch.setattr(Config, "JUDGE_PANEL_SIZE", 2)
+    model = PanelModel({0.1: "Scientist", 0.2: "Philosopher"})
+
+    state = _judge(model).execute(state)
+
+    assert state["winner"] == "Tie"
+    assert "Scientist 1" in state["judgment"] and "Philosopher 1" in state["judgment"]
@@ -0,0 +1,56 @@
+import time
+from utils.config import Config
+from utils import llm
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+class StreamingModel:
+    model_name = "models/fake-stream"
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        def chunks():
+            for piece in ("Evidence ", "matters ", "most."):
+                time.sleep(0.01)
+                yield Chunk(piece)
+        return chunks()
+
+def test_generate_stream_assembles_chunks_and_times_them(monkeypatch):
+    monkeypatch.setattr(Config, "CACHE_ENABLED", False)
+    received = []
+
+    text, timings = llm.generate_stream(StreamingModel(), "prompt", {}, received.append)
+
+    assert received == ["Evidence ", "matters ", "most."]
+    assert text == "Evidence matters most."
+    assert 0 < timings["ttft_ms"] < timings["generation_ms"]
+
+def test_generate_stream_replays_cache_as_one_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "CACHE_ENABLED", True)
+    monkeypatch.setattr(Config, "CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    llm.generate_stream(StreamingModel(), "prompt", {}, lambda _: None)
+
+    received = []
+    text, _ = llm.generate_stream(StreamingModel(), "prompt", {}, received.append)
+    assert received == [text] == ["Evidence matters most."]
+
+def test_model_handles_are_shared_and_created_lazily(monkeypatch):
+    created = []
+    monkeypatch.setattr(Config, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(Config, "MODEL_POOL_SIZE", 2)
+    monkeypatch.setattr(llm, "create_model", lambda name=None: created.append(name) or FakeModelHandle(name))
+    llm.reset_models()
+
+    first, second = llm.get_model("model-x"), llm.get_model("model-x")
+    assert created == []  # no client until the first request
+
+    for model in (first, second, first, second, first):
+        model.generate_content("prompt")
+    assert created == ["model-x", "model-x"]  # pool of two, reused round-robin
+    llm.reset_models()
+
+class FakeModelHandle:
+    def __init__(self, name):
+        self.model_name = name
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        return Chunk(prompt)
@@ -0,0 +1,121 @@
+import json
+import os
+import pytest
+import threading
+from utils.config import Config
+from utils.logger import DebateLogger, flush_buffered_logs
+from utils.log_index import load_index, list_runs, read_run
+from utils.log_storage import compress_pending, iter_events, segment_paths
+
+def _read(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_buffered_log_matches_unbuffered_format(tmp_path):
+    plain = DebateLogger(log_file=str(tmp_path / "plain.jsonl"), buffered=False)
+    buffered = DebateLogger(log_file=str(tmp_path / "buffered.jsonl"), buffered=True)
+
+    for logger in (plain, buffered):
+        logger.log_step("USER_INPUT", "Debate Topic: Is AI sentient?")
+        logger.log_step("CONTROLLER", {"round": 1, "next_agent": "Scientist", "turns_count": 0})
+    buffered.close()
+
+    plain_events = _read(plain.log_file)
+    buffered_events = _read(buffered.log_file)
+    assert [e["event_type"] for e in buffered_events] == ["USER_INPUT", "CONTROLLER"]
+    for a, b in zip(plain_events, buffered_events):
+        assert a.keys() == b.keys()
+        assert a["payload"] == b["payload"]
+
+def test_buffered_payload_is_snapshotted(tmp_path):
+    logger = DebateLogger(log_file=str(tmp_path / "log.jsonl"), buffered=True)
+    payload = {"total_turns": 1}
+    logger.log_step("MEMORY_UPDATE", payload)
+    payload["total_turns"] = 2  # mutated before the writer thread runs
+    logger.flush()
+
+    assert _read(logger.log_file)[0]["payload"] == {"total_turns": 1}
+    logger.close()
+
+def test_index_locates_interleaved_runs(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    first, second = DebateLogger(log_file=path, buffered=False), DebateLogger(log_file=path, buffered=True)
+    first.start_run("run-a")
+    second.start_run("run-b")
+    for round_num in range(3):
+        first.log_step("CONTROLLER", {"round": round_num})
+        second.log_step("CONTROLLER", {"round": round_num})
+        second.flush()
+    first.end_run()
+    second.close()
+
+    index = load_index(path)
+    assert list(index) == ["run-a", "run-b"]
+    assert sum(events for *_, events in index["run-a"]) == 3
+    assert [e["payload"]["round"] for e in read_run(path, "run-b")] == [0, 1, 2]
+    assert all(e["run_id"] == "run-a" for e in read_run(path, "run-a"))
+
+def test_index_covers_unindexed_tail_and_legacy_logs(tmp_path):
+    path = tmp_path / "log.jsonl"
+    # Runs logged before run ids existed, split at each USER_INPUT
+    path.write_text("".join(json.dumps({"event_type": event, "payload": ""}) + "\n"
+                            for event in ("USER_INPUT", "CONTROLLER", "USER_INPUT", "JUDGE_WINNER")))
+    logger = DebateLogger(log_file=str(path), buffered=False)
+    logger.start_run("run-c")
+    logger.log_step("USER_INPUT", "Debate Topic: Is AI sentient?")  # segment not yet indexed
+
+    runs = list_runs(str(path))
+    assert [events for _, events in runs] == [2, 2, 1]
+    assert runs[-1][0] == "run-c"
+    assert read_run(str(path))[0]["payload"] == "Debate Topic: Is AI sentient?"
+    logger.end_run()
+
+@pytest.mark.parametrize("buffered", [False, True])
+def test_rotated_and_compressed_segments_read_transparently(tmp_path, monkeypatch, buffered):
+    monkeypatch.setattr(Config, "LOG_ROTATE_BYTES", 400)
+    monkeypatch.setattr(Config, "LOG_COMPRESS", False)  # compressed below, deterministically
+    path = str(tmp_path / "log.jsonl")
+    logger = DebateLogger(log_file=path, buffered=buffered)
+    logger.start_run("run-a")
+    for round_num in range(12):
+        logger.log_step("CONTROLLER", {"round": round_num})
+        logger.flush()
+    logger.end_run()
+    logger.close()
+    compress_pending(path)
+
+    segments = [os.path.basename(p) for p in segment_paths(path)]
+    assert len(segments) > 2 and segments[-1] == "log.jsonl"
+    assert all(name.endswith(".gz") for name in segments[:-1])
+
+    assert list_runs(path) == [("run-a", 12)]
+    assert [e["payload"]["round"] for e in read_run(path, "run-a")] == list(range(12))
+    assert [e["payload"]["round"] for e in iter_events(path)] == list(range(12))
+
+@pytest.mark.parametrize("policy, syncs", [("never", 0), ("close", 1), ("event", 3)])
+def test_unbuffered_fsync_follows_the_policy(tmp_path, monkeypatch, policy, syncs):
+    monkeypatch.setattr(Config, "LOG_FSYNC", policy)
+    calls = []
+    monkeypatch.setattr(os, "fsync", calls.append)
+    logger = DebateLogger(log_file=str(tmp_path / "log.jsonl"), buffered=False)
+
+    logger.start_run("run-1")
+    for step in ("USER_INPUT", "CONTROLLER", "JUDGE_WINNER"):
+        logger.log_step(step, "payload")
+    logger.end_run()
+
+    assert len(calls) == syncs
+
+def test_buffered_logging_resumes_after_the_writer_stops(tmp_path):
+    logger = DebateLogger(log_file=str(tmp_path / "log.jsonl"), buffered=True)
+    logger.log_step("USER_INPUT", "before")
+    flush_buffered_logs()  # e.g. the Ctrl+C handler
+
+    logger.log_step("USER_INPUT", "after")
+    flusher = threading.Thread(target=logger.flush, daemon=True)
+    flusher.start()
+    flusher.join(timeout=5)
+
+    assert not flusher.is_alive()
+    assert [e["payload"] for e in _read(logger.log_file)] == ["before", "after"]
+    logger.close()
@@ -0,0 +1,89 @@
+import os
+import pytest
+from utils.config import Config
+from utils.logger import DebateLogger
+from utils.log_storage import compress_pending
+from utils.log_index import read_run
+from scripts.generate_report import find_runs, generate_batch_reports, generate_pdf_report, summarize_run
+
+def _log_debate(logger, run_id, topic, winner):
+    logger.start_run(run_id)
+    logger.log_step("USER_INPUT", f"Debate Topic: {topic}")
+    logger.log_step("ROUND_1_SCIENTIST", "Evidence first.")
+    logger.log_step("ROUND_2_PHILOSOPHER", "Meaning first.")
+    logger.log_step("JUDGE_WINNER", f"Winner: {winner}")
+    logger.end_run()
+
+def test_batch_reports_every_run_with_an_index(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    shared = DebateLogger(log_file=str(logs / "shared.jsonl"), buffered=False)
+    _log_debate(shared, "run-a", "Is AI sentient?", "Scientist")
+    _log_debate(shared, "run-b", "Should AI be regulated?", "Philosopher")
+    _log_debate(DebateLogger(log_file=str(logs / "single.jsonl"), buffered=False), "run-c", "Is math invented?", "Scientist")
+
+    runs = find_runs(str(logs))
+    assert sorted(run_id for _, run_id in runs) == ["run-a", "run-b", "run-c"]
+
+    rows = generate_batch_reports(runs, str(tmp_path / "reports"), workers=2)
+    assert [row["run_id"] for row in rows] == [run_id for _, run_id in runs]
+    assert {row["run_id"]: row["winner"] for row in rows}["run-b"] == "Philosopher"
+    assert all(row["turns"] == 2 and row["error"] is None for row in rows)
+    assert sorted(os.listdir(tmp_path / "reports")) == ["debate_run-a.pdf", "debate_run-b.pdf",
+                                                        "debate_run-c.pdf", "index.pdf"]
+
+def test_batch_run_ids_must_exist(tmp_path):
+    logger = DebateLogger(log_file=str(tmp_path / "log.jsonl"), buffered=False)
+    _log_debate(logger, "run-a", "Is AI sentient?", "Scientist")
+    assert find_runs(logger.log_file, ["run-a"]) == [(logger.log_file, "run-a")]
+    with pytest.raises(KeyError):
+        find_runs(logger.log_file, ["run-a", "run-z"])
+
+def test_reports_read_compressed_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "LOG_ROTATE_BYTES", 300)
+    path = str(tmp_path / "log.jsonl")
+    logger = DebateLogger(log_file=path, buffered=False)
+    _log_debate(logger, "run-a", "Is AI sentient?", "Scientist")
+    _log_debate(logger, "run-b", "Should AI be regulated?", "Philosopher")
+    compress_pending(path)  # waits for the background compressor
+    os.remove(path)  # every event now lives in a compressed segment
+
+    assert [run_id for _, run_id in find_runs(str(tmp_path))] == ["run-a", "run-b"]
+    generate_pdf_report(path, str(tmp_path / "report.pdf"), "run-a")
+    assert os.path.getsize(tmp_path / "report.pdf") > 0
+
+def test_report_rounds_come_from_the_log(tmp_path):
+    log_path = str(tmp_path / "log.jsonl")
+    logger = DebateLogger(log_path)
+    logger.start_run("three-way")
+    logger.log_step("INITIALIZATION", "Starting debate between Scientist, Philosopher and Economist")
+    # A parallel round: turns are logged as they finish, not in seat order
+    for event in ("ROUND_1_PERSONA_3", "ROUND_1_SCIENTIST", "ROUND_1_PHILOSOPHER", "ROUND_2_SCIENTIST"):
+        logger.log_step(event, f"{event} argument")
+    logger.end_run()
+
+    summary = summarize_run(read_run(log_path, "three-way"))
+    assert [(round_num, agent) for round_num, agent, _ in summary["turns"]] == [
+        (1, "Scientist"), (1, "Philosopher"), (1, "Economist"), (2, "Scientist")]
+
+def test_legacy_runs_of_different_logs_get_their_own_reports(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    # Logs written before run ids: both get legacy-0 and legacy-<offset> ids
+    for name in ("first.jsonl", "second.jsonl"):
+        logger = DebateLogger(log_file=str(logs / name), buffered=False)
+        for topic in ("Is AI sentient?", "Should AI be regulated?"):
+            logger.log_step("USER_INPUT", f"Debate Topic: {topic}")
+            logger.log_step("JUDGE_WINNER", "Winner: Scientist")
+
+    runs = find_runs(str(logs))
+    assert len(runs) == 4 and len({run_id for _, run_id in runs}) == 2
+
+    rows = generate_batch_reports(runs, str(tmp_path / "reports"), workers=2)
+    assert len({row["run_id"] for row in rows}) == 4
+    assert len(os.listdir(tmp_path / "reports")) == 5  # four reports and index.pdf
+
+    # Bare legacy ids are ambiguous here; qualified ones pick one log's run
+    with pytest.raises(KeyError):
+        find_runs(str(logs), ["legacy-0"])
+    assert find_runs(str(logs), ["second.jsonl:legacy-0"]) == [(str(logs / "second.jsonl"), "legacy-0")]
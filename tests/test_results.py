@@ -0,0 +1,64 @@
+import pytest
+from utils.config import Config
+from utils.results import ResultsStore, get_results_store
+from scripts.import_results import import_logs
+from main import DebateSystem
+
+@pytest.fixture(autouse=True)
+def mock_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", None)
+    monkeypatch.setattr(Config, "LLM_BACKEND", "gemini")
+    monkeypatch.setattr(Config, "SPAN_SUMMARY", False)
+    monkeypatch.setattr(Config, "CHECKPOINT_ENABLED", False)
+    monkeypatch.setattr(Config, "RESULTS_ENABLED", True)
+    monkeypatch.setattr(Config, "RESULTS_PATH", str(tmp_path / "results.sqlite"))
+
+def test_completed_debates_are_recorded_with_turns(tmp_path):
+    system = DebateSystem(log_path=str(tmp_path / "log.jsonl"))
+    final_state = system.run_debate(topic="Should AI be regulated like medicine?", seed=1)
+    system.run_debate(topic="Is space exploration worth the cost?", seed=2)
+
+    store = get_results_store()
+    assert store.count() == 2
+    row = store.query("SELECT topic, agent_a, agent_b, winner, model, seed, rounds FROM debates "
+                      "WHERE debate_id = ?", [final_state["debate_id"]])[0]
+    assert row == ("Should AI be regulated like medicine?", "Scientist", "Philosopher",
+                   final_state["winner"], "mock", 1, Config.MAX_ROUNDS)
+    turns = store.query("SELECT agent, text FROM turns WHERE debate_id = ? ORDER BY turn",
+                        [final_state["debate_id"]])
+    assert turns == [(t["agent"], t["text"]) for t in final_state["turns"]]
+
+    rates = store.win_rates(topic_contains="regulat")
+    assert rates["Scientist"]["debates"] == rates["Philosopher"]["debates"] == 1
+    assert sum(rate["wins"] for rate in rates.values()) == 1
+
+def test_import_backfills_logs_without_duplicates(tmp_path, monkeypatch):
+    log_path = str(tmp_path / "log.jsonl")
+    monkeypatch.setattr(Config, "RESULTS_ENABLED", False)
+    final_state = DebateSystem(log_path=log_path).run_debate(topic="Should AI be regulated like medicine?")
+
+    store = ResultsStore(str(tmp_path / "imported.sqlite"))
+    assert import_logs(store, [str(tmp_path)])["imported"] == 1
+    assert import_logs(store, [log_path])["imported"] == 0
+
+    row = store.query("SELECT debate_id, winner, rounds FROM debates")[0]
+    assert row == (final_state["debate_id"], final_state["winner"], Config.MAX_ROUNDS)
+    agents = [agent for (agent,) in store.query("SELECT agent FROM turns ORDER BY turn")]
+    assert agents == [t["agent"] for t in final_state["turns"]]
+
+def test_every_persona_of_a_larger_debate_is_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "PARALLEL_ROUNDS", "all")
+    personas = ["Scientist", "Philosopher", "Economist"]
+    log_path = str(tmp_path / "log.jsonl")
+    final_state = DebateSystem(log_path=log_path).run_debate(topic="Should AI be regulated like medicine?",
+                                                             personas=personas)
+
+    rates = get_results_store().win_rates()
+    assert sorted(rates) == sorted(personas)
+    assert all(rate["debates"] == 1 for rate in rates.values())
+    assert rates[final_state["winner"]]["wins"] == 1
+
+    # Debates backfilled from the log keep every seat too
+    store = ResultsStore(str(tmp_path / "imported.sqlite"))
+    import_logs(store, [log_path])
+    assert store.query("SELECT persona FROM personas ORDER BY seat") == [(p,) for p in personas]
@@ -0,0 +1,110 @@
+import json
+import time
+import asyncio
+import pytest
+from utils.config import Config
+from utils import llm, scheduler
+from utils.scheduler import (CallScheduler, TokenBucket, RetryBudgetExhausted, PartialOutputError,
+                             start_retry_budget, stop_retry_budget, is_retryable)
+from main import DebateSystem
+
+class ResourceExhausted(Exception):
+    code = 429
+
+class Flaky:
+    """Callable failing with the given errors before succeeding"""
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(Config, "FAKE_LLM_LATENCY_MS", 0.0)
+    monkeypatch.setattr(Config, "CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "SPAN_SUMMARY", False)
+    monkeypatch.setattr(Config, "CHECKPOINT_ENABLED", False)
+    monkeypatch.setattr(Config, "RETRY_BASE_DELAY", 0.001)
+    llm.reset_models()
+    scheduler.reset_scheduler()
+    yield
+    llm.reset_models()
+    scheduler.reset_scheduler()
+
+def test_retries_rate_limit_errors_with_backoff():
+    fn = Flaky(ResourceExhausted("quota"), RuntimeError("503 Service Unavailable"))
+    assert CallScheduler(base_delay=0.001).call(fn) == "ok"
+    assert fn.calls == 3
+
+    fn = Flaky(ResourceExhausted("quota"))
+    assert asyncio.run(CallScheduler(base_delay=0.001).acall(lambda: asyncio.sleep(0, fn()))) == "ok"
+
+def test_non_retryable_errors_raise_immediately():
+    fn = Flaky(ValueError("Invalid prompt"))
+    with pytest.raises(ValueError):
+        CallScheduler(base_delay=0.001).call(fn)
+    assert fn.calls == 1
+    assert not is_retryable(PartialOutputError("429 after two chunks"))
+    # Exhausted quotas and billing problems don't clear by backing off
+    assert not is_retryable(RuntimeError("Quota exceeded for metric generate_requests, limit: 0"))
+    assert not is_retryable(ResourceExhausted("429 Billing account is disabled"))
+    assert not is_retryable(RuntimeError("Daily quota reached"))
+
+def test_retry_budget_is_shared_across_calls():
+    calls = CallScheduler(base_delay=0.001)
+    token = start_retry_budget(limit=2)
+    try:
+        assert calls.call(Flaky(ResourceExhausted("quota"))) == "ok"
+        with pytest.raises(RetryBudgetExhausted):
+            calls.call(Flaky(ResourceExhausted("quota"), ResourceExhausted("quota")))
+    finally:
+        stop_retry_budget(token)
+
+def test_token_bucket_delays_once_empty():
+    bucket = TokenBucket(rate_per_min=600)  # 10 per second
+    assert bucket.reserve(600) == 0.0
+    assert bucket.reserve(5) == pytest.approx(0.5, abs=0.05)
+    bucket.refund(5)
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.05)
+
+def test_request_limit_spaces_calls():
+    calls = CallScheduler(requests_per_min=1200)  # one every 50ms after a full bucket
+    calls.requests.reserve(1200)
+    started = time.perf_counter()
+    for _ in range(3):
+        calls.call(lambda: None)
+    assert time.perf_counter() - started >= 0.1
+
+def test_debate_survives_transient_backend_errors(tmp_path, fake_backend, monkeypatch):
+    # Half of all calls fail; generous limits keep the run from exhausting them by chance
+    monkeypatch.setattr(Config, "FAKE_LLM_ERROR_RATE", 0.5)
+    monkeypatch.setattr(Config, "MAX_RETRIES", 50)
+    monkeypatch.setattr(Config, "RETRY_BUDGET", 1000)
+    log_path = tmp_path / "debate.jsonl"
+    system = DebateSystem(log_path=str(log_path))
+    final_state = system.run_debate(topic="Should AI be regulated like medicine?", seed=3)
+    system.logger.close()
+
+    assert final_state is not None
+    assert not any("[Error" in turn["text"] for turn in final_state["turns"])
+    events = [json.loads(line) for line in log_path.read_text().splitlines()]
+    summary = next(e["payload"] for e in events if e["event_type"] == "SPAN_SUMMARY")
+    assert sum(node["retries"] for node in summary.values()) > 0
+
+def test_agent_failure_fails_the_debate(tmp_path, fake_backend, monkeypatch):
+    """Exhausted retries fail the run instead of recording error text as an argument"""
+    monkeypatch.setattr(Config, "FAKE_LLM_ERROR_RATE", 1.0)
+    monkeypatch.setattr(Config, "RETRY_BUDGET", 3)
+    log_path = tmp_path / "debate.jsonl"
+    system = DebateSystem(log_path=str(log_path))
+    assert system.run_debate(topic="Should AI be regulated like medicine?") is None
+    system.logger.close()
+
+    events = [json.loads(line)["event_type"] for line in log_path.read_text().splitlines()]
+    assert "ERROR_SCIENTIST" in events
+    assert "ERROR" in events
@@ -0,0 +1,77 @@
+import json
+import threading
+import urllib.request
+import urllib.error
+import pytest
+from utils.config import Config
+from service import DebateService, create_server
+
+@pytest.fixture(autouse=True)
+def mock_mode(monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", None)
+    monkeypatch.setattr(Config, "LLM_BACKEND", "gemini")
+    monkeypatch.setattr(Config, "SPAN_SUMMARY", False)
+
+def _serve(service):
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def _post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), method="POST",
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return response.status, json.loads(response.read())
+
+def test_job_streams_turns_until_done(tmp_path):
+    service = DebateService(workers=2, queue_size=4, log_dir=str(tmp_path))
+    service.start()
+    server, base = _serve(service)
+    try:
+        status, body = _post(f"{base}/debates", {"topic": "Should AI be regulated like medicine?",
+                                                 "agent_a": "Physicist", "max_rounds": 4})
+        assert status == 202
+
+        with urllib.request.urlopen(base + body["events"]) as response:
+            assert response.headers["Content-Type"] == "text/event-stream"
+            events = [line[len("event: "):] for line in response.read().decode().splitlines()
+                      if line.startswith("event: ")]
+
+        assert events[-1] == "done"
+        assert sum(1 for e in events if e.startswith("ROUND_")) == 4
+        with urllib.request.urlopen(f"{base}/debates/{body['id']}") as response:
+            job = json.loads(response.read())
+        assert job["status"] == "completed" and job["turns"] == 4
+    finally:
+        server.shutdown()
+        service.stop()
+
+def test_full_queue_and_bad_requests_are_rejected(tmp_path):
+    # No workers, so queued jobs stay queued
+    service = DebateService(workers=0, queue_size=1, log_dir=str(tmp_path))
+    server, base = _serve(service)
+    try:
+        assert _post(f"{base}/debates", {"topic": "Is remote work better for productivity?"})[0] == 202
+        with pytest.raises(urllib.error.HTTPError) as full:
+            _post(f"{base}/debates", {"topic": "Should cities ban cars downtown?"})
+        assert full.value.code == 503
+        assert full.value.headers["Retry-After"]
+
+        with pytest.raises(urllib.error.HTTPError) as invalid:
+            _post(f"{base}/debates", {"topic": "Valid topic here", "max_rounds": 0})
+        assert invalid.value.code == 400
+    finally:
+        server.shutdown()
+
+def test_boolean_rounds_and_seed_are_rejected(tmp_path):
+    service = DebateService(workers=0, queue_size=1, log_dir=str(tmp_path))
+    server, base = _serve(service)
+    try:
+        for field in ("max_rounds", "seed"):
+            with pytest.raises(urllib.error.HTTPError) as invalid:
+                _post(f"{base}/debates", {"topic": "Should cities ban cars downtown?", field: True})
+            assert invalid.value.code == 400
+        # Nothing was queued, so the one queue slot is still free
+        assert _post(f"{base}/debates", {"topic": "Should cities ban cars downtown?", "seed": 7})[0] == 202
+    finally:
+        server.shutdown()
@@ -0,0 +1,43 @@
+import random
+from utils.text import CoherenceScorer, RepetitionIndex, repetition_words, stem
+
+def _naive_is_repeated(latest, previous):
+    """The original pairwise check, kept as a reference"""
+    latest_words = repetition_words(latest)
+    if not latest_words:
+        return False
+    for prev in previous:
+        prev_words = repetition_words(prev)
+        if prev_words and len(latest_words & prev_words) > len(latest_words) * 0.7:
+            return True
+    return False
+
+def test_repetition_index_matches_pairwise_check():
+    rng = random.Random(7)
+    vocabulary = [f"word{i:03d}" for i in range(40)] + ["debate", "evidence", "ethics", "a", "is"]
+    index = RepetitionIndex(threshold=0.7)
+    previous = []
+
+    for _ in range(300):
+        # Mix fresh text with near-copies of earlier turns
+        words = rng.choice(previous).split() if previous else []
+        if words and rng.random() < 0.3:
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            text = " ".join(words)
+        else:
+            text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+
+        assert index.is_repeated(text) == _naive_is_repeated(text, previous)
+        index.add(text)
+        previous.append(text)
+
+def test_stemming_groups_word_forms():
+    assert stem("regulated") == stem("regulation") == stem("regulations") == stem("regulate")
+    assert stem("policy") == stem("policies")
+
+def test_drift_score_uses_whole_tokens():
+    scorer = CoherenceScorer("Should art be funded publicly?")
+    # "artificial" must not count as a mention of "art"
+    assert scorer.drift_score("Artificial intelligence is everywhere.") == 1.0
+    assert scorer.drift_score("Public funding keeps art alive.") == 0.0
+    assert CoherenceScorer("Should it be?").drift_score("Anything.") is None
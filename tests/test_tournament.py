@@ -0,0 +1,38 @@
+import json
+import pytest
+from utils.config import Config
+from tournament import TournamentRunner, load_jobs
+
+@pytest.fixture(autouse=True)
+def mock_mode(monkeypatch):
+    # Force Mock Mode so the tournament never touches the network
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", None)
+
+def test_load_jobs(tmp_path):
+    jobs_path = tmp_path / "jobs.jsonl"
+    jobs_path.write_text('{"topic": "Should AI be regulated like medicine?"}\n\n'
+                         '{"topic": "Is remote work better?", "agent_a": "Economist", "seed": 3}\n')
+    jobs = load_jobs(str(jobs_path))
+    assert len(jobs) == 2
+    assert jobs[1]["agent_a"] == "Economist"
+
+def test_tournament_writes_one_record_per_debate(tmp_path):
+    jobs = [
+        {"topic": "Should AI be regulated like medicine?", "agent_a": "Physicist", "agent_b": "Theologian", "seed": 1},
+        {"topic": "Is remote work better for productivity?"},
+        {"topic": "Should cities ban cars downtown?", "agent_b": "Economist"},
+    ]
+    runner = TournamentRunner(str(tmp_path), concurrency=2)
+    summary = runner.run(jobs)
+
+    assert summary["total"] == 3
+    assert summary["completed"] == 3
+    assert summary["failed"] == 0
+
+    with open(runner.results_path) as f:
+        results = sorted((json.loads(line) for line in f), key=lambda r: r["job_id"])
+    assert [r["job_id"] for r in results] == [1, 2, 3]
+    # Per-job personas must not leak between concurrently running debates
+    assert results[0]["winner"] == "Physicist"
+    assert results[2]["agent_b"] == "Economist"
+    assert all(r["turns"] == Config.MAX_ROUNDS for r in results)
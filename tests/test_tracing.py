@@ -0,0 +1,37 @@
+import json
+import pytest
+from utils.config import Config
+from main import DebateSystem
+from debate_graph import DebateGraph
+
+class FakeModel:
+    def generate_content(self, prompt, generation_config=None):
+        text = "WINNER: Scientist\nREASONING: Evidence." if "Who won" in prompt else "A measured argument."
+        return type("Response", (), {"text": text})()
+
+@pytest.fixture(autouse=True)
+def mock_mode(monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", None)
+    monkeypatch.setattr(Config, "SPAN_SUMMARY", False)
+
+def test_every_node_logs_spans(tmp_path):
+    log_path = tmp_path / "log.jsonl"
+    system = DebateSystem(log_path=str(log_path), graph=DebateGraph())
+    for node in (system.graph.agent_a, system.graph.agent_b, system.graph.judge):
+        node.client = True
+        node.model = FakeModel()
+
+    assert system.run_debate(topic="Should AI be regulated like medicine?")
+
+    with open(log_path) as f:
+        events = [json.loads(line) for line in f]
+    spans = [e["payload"] for e in events if e["event_type"] == "SPAN"]
+    assert {s["node"] for s in spans} == {"user_input", "controller", "agent_a", "agent_b", "memory", "judge"}
+
+    agent_spans = [s for s in spans if s["node"] == "agent_a"]
+    assert all(s["llm_calls"] == 1 and s["prompt_tokens"] > 0 for s in agent_spans)
+    assert all(s["llm_ms"] <= s["wall_ms"] for s in agent_spans)
+
+    summary = next(e["payload"] for e in events if e["event_type"] == "SPAN_SUMMARY")
+    assert summary["agent_a"]["calls"] == Config.MAX_ROUNDS // 2
+    assert summary["judge"]["llm_calls"] == 2
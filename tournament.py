@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Tournament runner for the Multi-Agent Debate DAG
+Runs a batch of (topic, persona A, persona B, seed) debates concurrently
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, TypedDict
+from utils.config import Config
+from utils import llm
+from utils.logger import flush_buffered_logs
+from main import DebateSystem
+
+class DebateJob(TypedDict, total=False):
+    topic: str
+    agent_a: str
+    agent_b: str
+    personas: List[str]  # two or more, instead of agent_a/agent_b
+    seed: Optional[int]
+
+def load_jobs(jobs_path: str) -> List[DebateJob]:
+    """Load debate jobs from a JSONL file (one job object per line)"""
+    jobs = []
+    with open(jobs_path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            job = json.loads(line)
+            if not job.get("topic"):
+                raise ValueError(f"Job on line {line_no} has no topic")
+            jobs.append(job)
+    return jobs
+
+class TournamentRunner:
+    """Runs many debates concurrently, bounded by a concurrency limit"""
+
+    def __init__(self, output_dir: str, concurrency: int = 4, async_mode: bool = False):
+        self.output_dir = output_dir
+        self.concurrency = max(1, concurrency)
+        self.async_mode = async_mode
+        self.results_path = os.path.join(output_dir, "results.jsonl")
+        self.summary_path = os.path.join(output_dir, "summary.json")
+        self.log_dir = os.path.join(output_dir, "logs")
+        self._lock = threading.Lock()
+        self._completed = 0
+
+    def run(self, jobs: List[DebateJob]) -> Dict[str, Any]:
+        """Run all jobs and return the tournament summary"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        # Start each tournament with a fresh results file
+        open(self.results_path, 'w').close()
+
+        mode = "async" if self.async_mode else "threads"
+        print(f"🏁 Running {len(jobs)} debates (concurrency: {self.concurrency}, mode: {mode})...")
+        started = time.perf_counter()
+
+        if self.async_mode:
+            results = asyncio.run(self._arun_jobs(jobs))
+        else:
+            results = self._run_jobs(jobs)
+
+        summary = self._summarize(results, time.perf_counter() - started)
+        with open(self.summary_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        print(f"\n🏆 Tournament finished: {summary['completed']}/{summary['total']} debates "
+              f"completed in {summary['wall_time_s']}s ({summary['debates_per_sec']} debates/sec)")
+        print(f"📝 Results saved to: {self.results_path}")
+        return summary
+
+    def _run_jobs(self, jobs: List[DebateJob]) -> List[Dict[str, Any]]:
+        """Run jobs on a thread pool, one blocking debate per worker"""
+        results = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._run_job, job_id, job)
+                       for job_id, job in enumerate(jobs, 1)]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                self._record_result(result, len(jobs))
+        return results
+
+    async def _arun_jobs(self, jobs: List[DebateJob]) -> List[Dict[str, Any]]:
+        """Run jobs as tasks on a single event loop"""
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run_bounded(job_id: int, job: DebateJob) -> Dict[str, Any]:
+            async with slots:
+                return await self._arun_job(job_id, job)
+
+        results = []
+        tasks = [run_bounded(job_id, job) for job_id, job in enumerate(jobs, 1)]
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            results.append(result)
+            self._record_result(result, len(jobs))
+        return results
+
+    def _new_result(self, job_id: int, job: DebateJob) -> Dict[str, Any]:
+        personas = job.get("personas") or [job.get("agent_a") or Config.AGENT_A_PERSONA,
+                                           job.get("agent_b") or Config.AGENT_B_PERSONA]
+        return {
+            "job_id": job_id,
+            "topic": job["topic"],
+            "agent_a": personas[0],
+            "agent_b": personas[1],
+            "personas": personas,
+            "seed": job.get("seed"),
+            "log_path": os.path.join(self.log_dir, f"debate_{job_id:04d}.jsonl"),
+        }
+
+    def _run_job(self, job_id: int, job: DebateJob) -> Dict[str, Any]:
+        """Run a single debate in its own DebateSystem with its own log file"""
+        result = self._new_result(job_id, job)
+
+        started = time.perf_counter()
+        debate_system = None
+        try:
+            debate_system = DebateSystem(log_path=result["log_path"])
+            final_state = debate_system.run_debate(topic=job["topic"],
+                                                   agent_a_persona=result["agent_a"],
+                                                   agent_b_persona=result["agent_b"],
+                                                   seed=job.get("seed"),
+                                                   personas=result["personas"])
+        except Exception as e:
+            final_state = None
+            result["error"] = str(e)
+        finally:
+            if debate_system:
+                debate_system.logger.close()
+
+        return self._finish_result(result, final_state, time.perf_counter() - started)
+
+    async def _arun_job(self, job_id: int, job: DebateJob) -> Dict[str, Any]:
+        """Async variant of _run_job; model calls share the event loop"""
+        result = self._new_result(job_id, job)
+
+        started = time.perf_counter()
+        debate_system = None
+        try:
+            debate_system = DebateSystem(log_path=result["log_path"], async_mode=True)
+            final_state = await debate_system.arun_debate(topic=job["topic"],
+                                                          agent_a_persona=result["agent_a"],
+                                                          agent_b_persona=result["agent_b"],
+                                                          seed=job.get("seed"),
+                                                          personas=result["personas"])
+        except Exception as e:
+            final_state = None
+            result["error"] = str(e)
+        finally:
+            if debate_system:
+                debate_system.logger.close()
+
+        return self._finish_result(result, final_state, time.perf_counter() - started)
+
+    def _finish_result(self, result: Dict[str, Any], final_state, duration: float) -> Dict[str, Any]:
+        result["duration_s"] = round(duration, 3)
+        if final_state:
+            result["status"] = "completed"
+            result["winner"] = final_state["winner"]
+            result["turns"] = len(final_state["turns"])
+        else:
+            result["status"] = "failed"
+            result["winner"] = None
+            result["turns"] = 0
+        return result
+
+    def _record_result(self, result: Dict[str, Any], total: int):
+        """Append one result record and print progress"""
+        with self._lock:
+            self._completed += 1
+            with open(self.results_path, 'a') as f:
+                f.write(json.dumps(result) + "\n")
+            status = "✅" if result["status"] == "completed" else "❌"
+            print(f"[{self._completed}/{total}] {status} Job {result['job_id']}: "
+                  f"{' vs '.join(result['personas'])} -> {result['winner']} "
+                  f"({result['duration_s']}s)")
+
+    def _summarize(self, results: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+        """Build the progress summary for the whole tournament"""
+        completed = [r for r in results if r["status"] == "completed"]
+        durations = [r["duration_s"] for r in completed]
+        return {
+            "total": len(results),
+            "completed": len(completed),
+            "failed": len(results) - len(completed),
+            "concurrency": self.concurrency,
+            "mode": "async" if self.async_mode else "threads",
+            "wall_time_s": round(wall_time, 3),
+            "debates_per_sec": round(len(completed) / wall_time, 3) if wall_time > 0 else 0.0,
+            "mean_debate_s": round(sum(durations) / len(durations), 3) if durations else 0.0,
+            "wins": dict(Counter(r["winner"] for r in completed)),
+            "cache": llm.get_cache().stats() if Config.CACHE_ENABLED else None,
+        }
+
+def parse_arguments():
+    """Parse CLI arguments"""
+    parser = argparse.ArgumentParser(description='Run a concurrent debate tournament')
+    parser.add_argument('jobs', type=str, help='JSONL file of jobs: {"topic", "agent_a", "agent_b", "personas", "seed"}')
+    parser.add_argument('--concurrency', type=int, default=4, help='Maximum debates running at once')
+    parser.add_argument('--async', dest='async_mode', action='store_true',
+                        help='Run all debates as asyncio tasks on one event loop')
+    parser.add_argument('--cache', action=argparse.BooleanOptionalAction, default=None,
+                        help='Serve repeated model calls from the on-disk response cache')
+    parser.add_argument('--buffered-log', action=argparse.BooleanOptionalAction, default=None,
+                        help='Queue log events and write them in batches from a background thread')
+    parser.add_argument('--output-dir', type=str, default='tournament_output',
+                        help='Directory for results, summary and per-debate logs')
+    return parser.parse_args()
+
+def main():
+    """Tournament entry point"""
+    args = parse_arguments()
+    if args.cache is not None:
+        Config.update(CACHE_ENABLED=args.cache)
+    if args.buffered_log is not None:
+        Config.update(LOG_BUFFERED=args.buffered_log)
+
+    try:
+        jobs = load_jobs(args.jobs)
+        summary = TournamentRunner(args.output_dir, args.concurrency, args.async_mode).run(jobs)
+        return 0 if summary["failed"] == 0 else 1
+    except KeyboardInterrupt:
+        print("\n\nTournament interrupted by user.")
+        flush_buffered_logs()
+        return 1
+    except Exception as e:
+        print(f"Fatal error: {str(e)}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
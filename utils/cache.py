@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+class ResponseCache:
+    """Content-addressed LLM response cache stored in SQLite
+
+    Entries are keyed on a hash of model name, full prompt and generation
+    config. Least-recently-used entries are evicted once the cache grows past
+    max_entries or max_bytes, and entries older than max_age_s are dropped.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000,
+                 max_bytes: int = 256 * 1024 * 1024, max_age_s: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One shared connection guarded by a lock; WAL lets other processes read while we write
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+
+        with self._lock:
+            self._entries, self._bytes = self._totals()
+            self._evict()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, generation_config: Any) -> str:
+        """Stable content hash of everything that determines a response"""
+        material = json.dumps({
+            "model": model_name,
+            "prompt": prompt,
+            "config": generation_config,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row and self.max_age_s is not None and now - row[1] > self.max_age_s:
+                self._delete(key)
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model_name: str, response: str):
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            replaced = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (key, model_name, response, size, now, now))
+            self._conn.commit()
+
+            if replaced:
+                self._bytes += size - replaced[0]
+            else:
+                self._entries += 1
+                self._bytes += size
+
+            if self._entries > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": self._entries,
+                "bytes": self._bytes,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _totals(self):
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return count, total
+
+    def _delete(self, key: str):
+        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._conn.commit()
+        self._entries, self._bytes = self._totals()
+
+    def _evict(self):
+        """Drop expired entries, then least-recently-used ones until within limits
+
+        Totals are re-read from disk first since other processes may share the file.
+        """
+        before = self._totals()[0]
+
+        if self.max_age_s is not None:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?",
+                               (time.time() - self.max_age_s,))
+
+        # Keep only the max_entries most recently used rows
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,))
+
+        # Then trim the oldest rows until the byte budget is met
+        entries, total = self._totals()
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            freed = 0
+            stale = []
+            for key, size in self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access ASC"):
+                stale.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+        self._conn.commit()
+        self._entries, self._bytes = self._totals()
+        self.evictions += before - self._entries
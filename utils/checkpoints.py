@@ -0,0 +1,60 @@
+import os
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from utils.config import Config
+
+# Non-builtin types stored in DebateState that checkpoints may rebuild
+STATE_TYPES = [("utils.state", "AgentType"), ("utils.state", "Turn")]
+
+# Process-wide saver for blocking runs, opened on first use when Config.CHECKPOINT_ENABLED is set
+_checkpointer = None
+_checkpointer_path = None
+_lock = threading.Lock()
+
+def _serde():
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    return JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES)
+
+def _prepare_path(path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+def get_checkpointer() -> Optional[Any]:
+    """Shared SQLite checkpointer for invoke(), or None when checkpointing is off
+
+    One connection serves every thread; the saver serializes access to it.
+    """
+    global _checkpointer, _checkpointer_path
+    if not Config.CHECKPOINT_ENABLED:
+        return None
+    with _lock:
+        if _checkpointer is None or _checkpointer_path != Config.CHECKPOINT_PATH:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+            _prepare_path(Config.CHECKPOINT_PATH)
+            conn = sqlite3.connect(Config.CHECKPOINT_PATH, check_same_thread=False)
+            # A checkpoint is written after every node; WAL keeps those writes cheap
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            _checkpointer = SqliteSaver(conn, serde=_serde())
+            _checkpointer_path = Config.CHECKPOINT_PATH
+        return _checkpointer
+
+@asynccontextmanager
+async def open_async_checkpointer() -> AsyncIterator[Optional[Any]]:
+    """SQLite checkpointer for ainvoke() on the running event loop, or None when off
+
+    aiosqlite connections belong to one event loop, so each async run opens its own.
+    """
+    if not Config.CHECKPOINT_ENABLED:
+        yield None
+        return
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    _prepare_path(Config.CHECKPOINT_PATH)
+    async with aiosqlite.connect(Config.CHECKPOINT_PATH) as conn:
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        yield AsyncSqliteSaver(conn, serde=_serde())
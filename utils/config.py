@@ -13,10 +13,104 @@ class Config:
     # Model Configuration
     GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
     
+    # "gemini" calls the API; "fake" uses the local stand-in model (offline runs and benchmarks)
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+    FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "200"))
+    FAKE_LLM_LATENCY_DIST = os.getenv("FAKE_LLM_LATENCY_DIST", "lognormal")  # fixed | uniform | lognormal
+    FAKE_LLM_JITTER = float(os.getenv("FAKE_LLM_JITTER", "0.3"))
+    FAKE_LLM_OUTPUT_TOKENS = int(os.getenv("FAKE_LLM_OUTPUT_TOKENS", "60"))
+    FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0.0"))
+    
+    # Shared model handles per model name (requests on one handle already run concurrently)
+    MODEL_POOL_SIZE = int(os.getenv("MODEL_POOL_SIZE", "1"))
+    
     # Debate Configuration
     MAX_ROUNDS = int(os.getenv("MAX_ROUNDS", "8"))
     AGENT_A_PERSONA = os.getenv("AGENT_A_PERSONA", "Scientist")
     AGENT_B_PERSONA = os.getenv("AGENT_B_PERSONA", "Philosopher")
+    # Comma-separated personas in speaking order for debates with more than two sides
+    # (empty: AGENT_A_PERSONA and AGENT_B_PERSONA)
+    PERSONAS = [p.strip() for p in os.getenv("PERSONAS", "").split(",") if p.strip()]
+    # Rounds whose turns are generated in parallel, each persona seeing only earlier rounds:
+    # "none" (strict alternation), "opening" (the opening statements) or "all"
+    PARALLEL_ROUNDS = os.getenv("PARALLEL_ROUNDS", "none")
+    
+    # Approximate token budget for the history slice each agent sees
+    MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "400"))
+    
+    # Drift scores at or above this threshold raise a topic drift warning
+    # (1.0 = warn only when an argument mentions none of the topic's terms)
+    DRIFT_THRESHOLD = float(os.getenv("DRIFT_THRESHOLD", "1.0"))
+    
+    # Judge Configuration
+    # "sequential": summary then verdict, "concurrent": both requests at once,
+    # "structured": one JSON call returning summary, winner and reasoning
+    JUDGE_MODE = os.getenv("JUDGE_MODE", "sequential")
+    # Fold each new turn into a running summary while the next turn is generated, and judge
+    # from that summary plus the latest exchange instead of the full transcript
+    RUNNING_SUMMARY = os.getenv("RUNNING_SUMMARY", "false").lower() in ("1", "true", "yes")
+    RUNNING_SUMMARY_TOKENS = int(os.getenv("RUNNING_SUMMARY_TOKENS", "250"))
+    # Panel of judges voting on the winner (sequential and concurrent modes; 0 or 1 = one judge).
+    # Judge i uses the i-th model, temperature and criterion (cycled); at most
+    # JUDGE_PANEL_CONCURRENCY run at once, and voting stops once the plurality is decided
+    JUDGE_PANEL_SIZE = int(os.getenv("JUDGE_PANEL_SIZE", "0"))
+    JUDGE_PANEL_MODELS = [m.strip() for m in os.getenv("JUDGE_PANEL_MODELS", "").split(",") if m.strip()]
+    JUDGE_PANEL_TEMPERATURES = [float(t) for t in os.getenv("JUDGE_PANEL_TEMPERATURES", "0.3,0.6,0.9").split(",") if t.strip()]
+    JUDGE_PANEL_CONCURRENCY = int(os.getenv("JUDGE_PANEL_CONCURRENCY", "3"))
+    
+    # Print model output to the console as it streams in
+    STREAM = os.getenv("STREAM", "false").lower() in ("1", "true", "yes")
+    
+    # Concurrency Configuration
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "16"))
+    
+    # Rate Limit and Retry Configuration (0 = no limit)
+    RATE_LIMIT_RPM = float(os.getenv("RATE_LIMIT_RPM", "0"))
+    RATE_LIMIT_TPM = float(os.getenv("RATE_LIMIT_TPM", "0"))
+    MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
+    RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "1.0"))
+    RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "30"))
+    # Retries one debate may spend in total, so a failing backend can't stall a batch
+    RETRY_BUDGET = int(os.getenv("RETRY_BUDGET", "20"))
+    
+    # Response Cache Configuration
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+    CACHE_PATH = os.getenv("CACHE_PATH", "cache/llm_cache.sqlite")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "100000"))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    CACHE_MAX_AGE_DAYS = float(os.getenv("CACHE_MAX_AGE_DAYS", "30"))
+    
+    # Checkpoint debate state after every node so failed runs can be resumed (--resume <id>);
+    # opt-in, since every node then commits to one shared SQLite connection
+    CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "false").lower() in ("1", "true", "yes")
+    CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "checkpoints/debates.sqlite")
+    
+    # Record every completed debate (and its turns) in an indexed SQLite results store;
+    # opt-in, so mock, fake-backend and test runs don't skew the recorded win rates
+    RESULTS_ENABLED = os.getenv("RESULTS_ENABLED", "false").lower() in ("1", "true", "yes")
+    RESULTS_PATH = os.getenv("RESULTS_PATH", "results/debates.sqlite")
+    
+    # Logging Configuration
+    LOG_BUFFERED = os.getenv("LOG_BUFFERED", "false").lower() in ("1", "true", "yes")
+    LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "0.5"))
+    # fsync policy: never | event (every event) | batch (every buffered batch; unbuffered
+    # logs once per run) | close (when a buffered file is released; unbuffered once per run)
+    LOG_FSYNC = os.getenv("LOG_FSYNC", "never")
+    # Rotate the log into numbered segments past a size (bytes) or age (seconds); 0 disables
+    LOG_ROTATE_BYTES = int(os.getenv("LOG_ROTATE_BYTES", "0"))
+    LOG_ROTATE_SECONDS = float(os.getenv("LOG_ROTATE_SECONDS", "0"))
+    # gzip closed segments in the background
+    LOG_COMPRESS = os.getenv("LOG_COMPRESS", "true").lower() in ("1", "true", "yes")
+    LOG_COMPRESS_LEVEL = int(os.getenv("LOG_COMPRESS_LEVEL", "6"))
+    
+    # Debate Service Configuration (service.py)
+    SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+    SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8080"))
+    SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "4"))
+    SERVICE_QUEUE_SIZE = int(os.getenv("SERVICE_QUEUE_SIZE", "64"))
+    
+    # Print the per-node timing table at the end of each run
+    SPAN_SUMMARY = os.getenv("SPAN_SUMMARY", "true").lower() in ("1", "true", "yes")
     
     # Runtime Configuration
     SEED = None
@@ -0,0 +1,144 @@
+import time
+import json
+import random
+import asyncio
+import threading
+from typing import Any, Iterator, List, Optional
+
+class FakeLLMError(Exception):
+    """Injected failure from the fake backend"""
+
+class _Usage:
+    def __init__(self, prompt_tokens: int, response_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = response_tokens
+
+class FakeResponse:
+    def __init__(self, text: str, usage: Optional[_Usage] = None):
+        self.text = text
+        self.usage_metadata = usage
+
+class _AsyncStream:
+    def __init__(self, chunks: List[FakeResponse], delays: List[float]):
+        self._chunks = chunks
+        self._delays = delays
+
+    async def __aiter__(self):
+        for chunk, delay in zip(self._chunks, self._delays):
+            await asyncio.sleep(delay)
+            yield chunk
+
+class FakeGenerativeModel:
+    """Local stand-in for genai.GenerativeModel used for offline runs and benchmarks
+
+    Mirrors the parts of the Gemini API the nodes use (generate_content,
+    generate_content_async, streaming) with a configurable latency
+    distribution, output length and error rate. Judge prompts get replies
+    in the format the judge parses, so full debates complete normally.
+    """
+
+    WORDS = ("evidence", "reasoning", "ethics", "data", "society", "risk", "value", "trust",
+             "policy", "harm", "benefit", "principle", "regulation", "progress", "autonomy")
+
+    def __init__(self, model_name: str = "fake-model", latency_ms: float = 200.0,
+                 latency_dist: str = "lognormal", jitter: float = 0.3, output_tokens: int = 60,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.model_name = f"fake/{model_name}"
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist  # fixed | uniform | lognormal
+        self.jitter = jitter
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, model_name: str) -> "FakeGenerativeModel":
+        from utils.config import Config
+        return cls(model_name=model_name,
+                   latency_ms=Config.FAKE_LLM_LATENCY_MS,
+                   latency_dist=Config.FAKE_LLM_LATENCY_DIST,
+                   jitter=Config.FAKE_LLM_JITTER,
+                   output_tokens=Config.FAKE_LLM_OUTPUT_TOKENS,
+                   error_rate=Config.FAKE_LLM_ERROR_RATE,
+                   seed=Config.SEED)
+
+    def generate_content(self, prompt: str, generation_config: Any = None, stream: bool = False):
+        latency, failed, words = self._sample()
+        if stream:
+            return self._stream(prompt, words, latency, failed)
+        time.sleep(latency)
+        if failed:
+            raise FakeLLMError("Injected fake backend failure (429 Resource exhausted)")
+        return self._respond(prompt, words)
+
+    async def generate_content_async(self, prompt: str, generation_config: Any = None, stream: bool = False):
+        latency, failed, words = self._sample()
+        if stream:
+            chunks = self._chunks(prompt, words)
+            # First chunk carries most of the latency, as with a real model
+            delays = [latency * 0.6] + [latency * 0.4 / max(1, len(chunks) - 1)] * (len(chunks) - 1)
+            if failed:
+                await asyncio.sleep(latency)
+                raise FakeLLMError("Injected fake backend failure (429 Resource exhausted)")
+            return _AsyncStream(chunks, delays)
+        await asyncio.sleep(latency)
+        if failed:
+            raise FakeLLMError("Injected fake backend failure (429 Resource exhausted)")
+        return self._respond(prompt, words)
+
+    def _sample(self):
+        with self._lock:
+            if self.latency_dist == "fixed":
+                latency = self.latency_ms
+            elif self.latency_dist == "uniform":
+                spread = self.latency_ms * self.jitter
+                latency = self._rng.uniform(self.latency_ms - spread, self.latency_ms + spread)
+            else:
+                # Lognormal with the configured mean; jitter is the sigma of the underlying normal
+                mu = 0.0 - self.jitter ** 2 / 2
+                latency = self.latency_ms * self._rng.lognormvariate(mu, self.jitter)
+            failed = self._rng.random() < self.error_rate
+            words = [self._rng.choice(self.WORDS) for _ in range(max(1, self.output_tokens))]
+        return max(0.0, latency) / 1000, failed, " ".join(words)
+
+    def _text(self, prompt: str, words: str) -> str:
+        if "JSON object" in prompt:
+            return json.dumps({"summary": f"Both sides debated {words[:80]}.",
+                               "winner": self._pick_winner(prompt),
+                               "reasoning": f"Stronger use of {words[:60]}."})
+        if "WINNER:" in prompt:
+            return f"WINNER: {self._pick_winner(prompt)}\nREASONING: Stronger use of {words[:60]}."
+        return words.capitalize() + "."
+
+    def _pick_winner(self, prompt: str) -> str:
+        # Prompts ask "Who won? The <A> or the <B>[ or the <C>...]?"; fall back to a fixed name
+        marker = "Who won? The "
+        if marker in prompt:
+            names = prompt.split(marker, 1)[1].split("?", 1)[0].split(" or the ")
+            if len(names) >= 2:
+                with self._lock:
+                    return self._rng.choice(names).strip()
+        return "Scientist"
+
+    def _respond(self, prompt: str, words: str) -> FakeResponse:
+        text = self._text(prompt, words)
+        return FakeResponse(text, _Usage(len(prompt) // 4, self.output_tokens))
+
+    def _chunks(self, prompt: str, words: str) -> List[FakeResponse]:
+        text = self._text(prompt, words)
+        pieces = [text[i:i + 40] for i in range(0, len(text), 40)] or [""]
+        chunks = [FakeResponse(piece) for piece in pieces]
+        chunks[-1].usage_metadata = _Usage(len(prompt) // 4, self.output_tokens)
+        return chunks
+
+    def _stream(self, prompt: str, words: str, latency: float, failed: bool) -> Iterator[FakeResponse]:
+        chunks = self._chunks(prompt, words)
+        time.sleep(latency * 0.6)
+        if failed:
+            raise FakeLLMError("Injected fake backend failure (429 Resource exhausted)")
+        rest = latency * 0.4 / max(1, len(chunks) - 1)
+        for index, chunk in enumerate(chunks):
+            if index:
+                time.sleep(rest)
+            yield chunk
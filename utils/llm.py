@@ -0,0 +1,315 @@
+import time
+import asyncio
+import itertools
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.config import Config
+from utils.cache import ResponseCache
+from utils.fake_llm import FakeGenerativeModel
+from utils.scheduler import PartialOutputError, get_scheduler
+from utils.text import estimate_tokens
+from utils.tracing import record_llm_call
+
+# One semaphore per event loop: asyncio primitives cannot be shared across loops
+_request_semaphores = weakref.WeakKeyDictionary()
+
+# Process-wide model handles, keyed by (backend, model name) and created on first use
+_model_pools: Dict[Tuple[str, str], "ModelPool"] = {}
+_model_lock = threading.Lock()
+_configured_key = None
+
+# Process-wide response cache, opened on first use when Config.CACHE_ENABLED is set
+_cache = None
+_cache_lock = threading.Lock()
+
+def model_available() -> bool:
+    """True when a backend is configured; nodes fall back to Mock Mode otherwise"""
+    return Config.LLM_BACKEND == "fake" or bool(Config.GEMINI_API_KEY)
+
+def create_model(model_name: Optional[str] = None):
+    """Build a new generative model handle for the configured backend
+    
+    Nodes should use get_model() instead, which shares handles process-wide.
+    """
+    global _configured_key
+    model_name = model_name or Config.GEMINI_MODEL
+    if Config.LLM_BACKEND == "fake":
+        return FakeGenerativeModel.from_config(model_name)
+    
+    import google.generativeai as genai
+    # configure() drops the SDK's cached clients, so only call it when the key changes
+    with _model_lock:
+        if _configured_key != Config.GEMINI_API_KEY:
+            genai.configure(api_key=Config.GEMINI_API_KEY)
+            _configured_key = Config.GEMINI_API_KEY
+    return genai.GenerativeModel(model_name)
+
+class ModelPool:
+    """A fixed number of lazily created handles for one model, handed out round-robin"""
+
+    def __init__(self, model_name: str, size: int):
+        self.model_name = model_name
+        self.size = max(1, size)
+        self.handles: List[Any] = []
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        index = next(self._next) % self.size
+        if index < len(self.handles):
+            return self.handles[index]
+        with self._lock:
+            while len(self.handles) <= index:
+                self.handles.append(create_model(self.model_name))
+            return self.handles[index]
+
+def _pool(model_name: str) -> ModelPool:
+    key = (Config.LLM_BACKEND, model_name)
+    pool = _model_pools.get(key)
+    if pool is None:
+        with _model_lock:
+            pool = _model_pools.setdefault(key, ModelPool(model_name, Config.MODEL_POOL_SIZE))
+    return pool
+
+class SharedModel:
+    """Cheap stand-in for a model handle that resolves to the shared pool on each call
+    
+    Creating one makes no client; the first request for a model builds its
+    handles, and every node and debate in the process reuses them.
+    """
+
+    def __init__(self, model_name: str):
+        self.name = model_name
+
+    @property
+    def model_name(self) -> str:
+        # Same name the backend's own handle reports, so cache keys don't change
+        if Config.LLM_BACKEND == "fake":
+            return f"fake/{self.name}"
+        return self.name if "/" in self.name else f"models/{self.name}"
+
+    def generate_content(self, *args, **kwargs):
+        return _pool(self.name).acquire().generate_content(*args, **kwargs)
+
+    async def generate_content_async(self, *args, **kwargs):
+        return await _pool(self.name).acquire().generate_content_async(*args, **kwargs)
+
+def get_model(model_name: Optional[str] = None) -> SharedModel:
+    """Shared, lazily created handle for model_name (defaults to Config.GEMINI_MODEL)"""
+    return SharedModel(model_name or Config.GEMINI_MODEL)
+
+def reset_models():
+    """Drop all pooled handles (e.g. after changing backend settings)"""
+    with _model_lock:
+        _model_pools.clear()
+
+def get_request_semaphore() -> asyncio.Semaphore:
+    """Semaphore capping in-flight model requests on the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _request_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        _request_semaphores[loop] = semaphore
+    return semaphore
+
+def get_cache() -> Optional[ResponseCache]:
+    """Return the shared response cache, or None when caching is off for this run"""
+    global _cache
+    if not Config.CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.path != Config.CACHE_PATH:
+            _cache = ResponseCache(
+                Config.CACHE_PATH,
+                max_entries=Config.CACHE_MAX_ENTRIES,
+                max_bytes=Config.CACHE_MAX_BYTES,
+                max_age_s=Config.CACHE_MAX_AGE_DAYS * 86400 if Config.CACHE_MAX_AGE_DAYS else None
+            )
+        return _cache
+
+def _model_name(model) -> str:
+    return getattr(model, "model_name", None) or Config.GEMINI_MODEL
+
+def _lookup(model, prompt: str, generation_config: Any) -> Tuple[Optional[ResponseCache], Optional[str], Optional[str]]:
+    """Return (cache, key, cached_text); cache is None when caching is off"""
+    cache = get_cache()
+    if not cache:
+        return None, None, None
+    key = cache.make_key(_model_name(model), prompt, generation_config)
+    return cache, key, cache.get(key)
+
+def _estimate_call_tokens(prompt: str, generation_config: Any) -> int:
+    """Tokens a call is expected to use, reserved against the rate limit before it's made"""
+    max_output = 0
+    if isinstance(generation_config, dict):
+        max_output = generation_config.get("max_output_tokens") or 0
+    return estimate_tokens(prompt) + max_output
+
+def _finish(model, prompt: str, text: str, started: float, response: Any = None,
+            cache: Optional[ResponseCache] = None, key: Optional[str] = None, cached: bool = False) -> int:
+    """Store a fresh response in the cache and attribute the call to the current span
+
+    Returns the tokens the call used.
+    """
+    if cache and not cached:
+        cache.put(key, _model_name(model), text)
+    
+    # Prefer the API's own token accounting; estimate when it's unavailable
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) or estimate_tokens(prompt)
+    response_tokens = getattr(usage, "candidates_token_count", 0) or estimate_tokens(text)
+    record_llm_call(prompt, text, time.perf_counter() - started, prompt_tokens, response_tokens, cached=cached)
+    return prompt_tokens + response_tokens
+
+def generate(model, prompt: str, generation_config: Any) -> str:
+    """Blocking text generation, served from the response cache when possible
+
+    Calls go through the shared scheduler, which applies the rate limits and
+    retries transient failures.
+    """
+    started = time.perf_counter()
+    cache, key, cached = _lookup(model, prompt, generation_config)
+    if cached is not None:
+        _finish(model, prompt, cached, started, cached=True)
+        return cached
+
+    scheduler = get_scheduler()
+    estimated = _estimate_call_tokens(prompt, generation_config)
+    response = scheduler.call(lambda: model.generate_content(prompt, generation_config=generation_config),
+                              estimated)
+    text = response.text.strip()
+
+    scheduler.settle(estimated, _finish(model, prompt, text, started, response, cache, key))
+    return text
+
+async def agenerate(model, prompt: str, generation_config: Any) -> str:
+    """Async text generation, bounded by the shared request semaphore"""
+    started = time.perf_counter()
+    cache, key, cached = _lookup(model, prompt, generation_config)
+    if cached is not None:
+        _finish(model, prompt, cached, started, cached=True)
+        return cached
+
+    async def attempt():
+        # Hold the semaphore per attempt so backoff waits don't block other calls
+        async with get_request_semaphore():
+            return await model.generate_content_async(prompt, generation_config=generation_config)
+
+    scheduler = get_scheduler()
+    estimated = _estimate_call_tokens(prompt, generation_config)
+    response = await scheduler.acall(attempt, estimated)
+    text = response.text.strip()
+
+    scheduler.settle(estimated, _finish(model, prompt, text, started, response, cache, key))
+    return text
+
+def print_chunk(text: str):
+    """on_chunk callback that echoes streamed text to the console"""
+    print(text, end="", flush=True)
+
+def _chunk_text(chunk) -> str:
+    # Chunks without text parts (e.g. a trailing finish reason) raise on .text
+    try:
+        return chunk.text or ""
+    except ValueError:
+        return ""
+
+def _timings(started: float, first_token: Optional[float], finished: float) -> Dict[str, float]:
+    first_token = first_token or finished
+    return {
+        "ttft_ms": round((first_token - started) * 1000, 1),
+        "generation_ms": round((finished - started) * 1000, 1)
+    }
+
+def generate_stream(model, prompt: str, generation_config: Any,
+                    on_chunk: Callable[[str], None]) -> Tuple[str, Dict[str, float]]:
+    """Streaming text generation
+    
+    Calls on_chunk with each piece of text as it arrives and returns the
+    assembled text with time-to-first-token and total generation time.
+    A cache hit is delivered as a single chunk.
+    """
+    started = time.perf_counter()
+    cache, key, cached = _lookup(model, prompt, generation_config)
+    if cached is not None:
+        on_chunk(cached)
+        _finish(model, prompt, cached, started, cached=True)
+        finished = time.perf_counter()
+        return cached, _timings(started, finished, finished)
+
+    chunks = []
+    first_token = None
+    last_chunk = None
+
+    def attempt():
+        nonlocal first_token, last_chunk
+        try:
+            for chunk in model.generate_content(prompt, generation_config=generation_config, stream=True):
+                last_chunk = chunk
+                piece = _chunk_text(chunk)
+                if not piece:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter()
+                chunks.append(piece)
+                on_chunk(piece)
+        except Exception as e:
+            # Text already shown can't be taken back, so only a clean failure is retried
+            if chunks:
+                raise PartialOutputError(f"Stream failed after {len(chunks)} chunks: {e}") from e
+            raise
+
+    scheduler = get_scheduler()
+    estimated = _estimate_call_tokens(prompt, generation_config)
+    scheduler.call(attempt, estimated)
+    finished = time.perf_counter()
+    text = "".join(chunks).strip()
+
+    # Usage metadata arrives with the final chunk
+    scheduler.settle(estimated, _finish(model, prompt, text, started, last_chunk, cache, key))
+    return text, _timings(started, first_token, finished)
+
+async def agenerate_stream(model, prompt: str, generation_config: Any,
+                           on_chunk: Callable[[str], None]) -> Tuple[str, Dict[str, float]]:
+    """Async variant of generate_stream, bounded by the shared request semaphore"""
+    started = time.perf_counter()
+    cache, key, cached = _lookup(model, prompt, generation_config)
+    if cached is not None:
+        on_chunk(cached)
+        _finish(model, prompt, cached, started, cached=True)
+        finished = time.perf_counter()
+        return cached, _timings(started, finished, finished)
+
+    chunks = []
+    first_token = None
+    last_chunk = None
+
+    async def attempt():
+        nonlocal first_token, last_chunk
+        try:
+            async with get_request_semaphore():
+                response = await model.generate_content_async(prompt, generation_config=generation_config,
+                                                               stream=True)
+                async for chunk in response:
+                    last_chunk = chunk
+                    piece = _chunk_text(chunk)
+                    if not piece:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    chunks.append(piece)
+                    on_chunk(piece)
+        except Exception as e:
+            if chunks:
+                raise PartialOutputError(f"Stream failed after {len(chunks)} chunks: {e}") from e
+            raise
+
+    scheduler = get_scheduler()
+    estimated = _estimate_call_tokens(prompt, generation_config)
+    await scheduler.acall(attempt, estimated)
+    finished = time.perf_counter()
+    text = "".join(chunks).strip()
+
+    scheduler.settle(estimated, _finish(model, prompt, text, started, last_chunk, cache, key))
+    return text, _timings(started, first_token, finished)
\ No newline at end of file
@@ -0,0 +1,238 @@
+import os
+import json
+import mmap
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from utils.config import Config
+from utils.log_storage import (index_path, is_compressed, open_log, segment_paths, close_segment,
+                               CLOSED_SEGMENT)
+
+# Sidecar index next to each log file: one JSON line per extent, i.e. a run of
+# consecutive events from the same debate, {"run_id", "offset", "length", "events"}.
+# A run has several extents when debates interleave in one file, a run is resumed,
+# or the log rotates mid-run (see utils/log_storage).
+
+Extent = Tuple[str, int, int, int]  # (file, offset, length, events)
+
+class ExtentTracker:
+    """Groups the events written to one log file into per-run extents
+
+    Writers report each event's byte offset and length; an extent is appended
+    to the index once it ends (another run writes, or end_extent is called),
+    so the index costs one small write per extent rather than per event.
+    The tracker also rotates the file when Config.LOG_ROTATE_BYTES or
+    Config.LOG_ROTATE_SECONDS is set.
+    """
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        # Also held by writers so an event's offset, its write and rotation can't interleave
+        self.lock = threading.RLock()
+        self._extent: Optional[List[Any]] = None  # [run_id, offset, length, events]
+        self._size: Optional[int] = None  # bytes in the active file, for rotation
+        self._started = 0.0
+
+    def record(self, run_id: Optional[str], offset: int, length: int):
+        with self.lock:
+            extent = self._extent
+            if extent and extent[0] == run_id and extent[1] + extent[2] == offset:
+                extent[2] += length
+                extent[3] += 1
+                return
+            self._write(extent)
+            # Events outside a run (no run_id) aren't indexed
+            self._extent = [run_id, offset, length, 1] if run_id else None
+
+    def end_extent(self):
+        with self.lock:
+            self._write(self._extent)
+            self._extent = None
+
+    def before_write(self, length: int) -> bool:
+        """Rotate the file first if length more bytes would exceed its size or age limit
+
+        Returns True when the file was rotated, so writers holding it open reopen it.
+        """
+        if not (Config.LOG_ROTATE_BYTES or Config.LOG_ROTATE_SECONDS):
+            return False
+        with self.lock:
+            if self._size is None:
+                # Age counts from when this process first wrote to the file
+                self._size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+                self._started = time.time()
+            rotate = self._size > 0 and (
+                (Config.LOG_ROTATE_BYTES and self._size + length > Config.LOG_ROTATE_BYTES) or
+                (Config.LOG_ROTATE_SECONDS and time.time() - self._started >= Config.LOG_ROTATE_SECONDS))
+            if rotate:
+                self.end_extent()
+                close_segment(self.log_path)
+                self._size = 0
+                self._started = time.time()
+            self._size += length
+            return bool(rotate)
+
+    def _write(self, extent: Optional[List[Any]]):
+        if not extent:
+            return
+        run_id, offset, length, events = extent
+        entry = {"run_id": run_id, "offset": offset, "length": length, "events": events}
+        try:
+            with open(index_path(self.log_path), 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            # Readers rebuild missing entries by scanning, so a lost extent only costs speed
+            print(f"⚠️ Warning: failed to update log index for {self.log_path}: {e}")
+
+_trackers: Dict[str, ExtentTracker] = {}
+_trackers_lock = threading.Lock()
+
+def get_tracker(log_path: str) -> ExtentTracker:
+    """The process-wide tracker for log_path, shared by every logger writing to it"""
+    key = os.path.abspath(log_path)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = ExtentTracker(log_path)
+        return tracker
+
+@atexit.register
+def end_all_extents():
+    with _trackers_lock:
+        trackers = list(_trackers.values())
+    for tracker in trackers:
+        tracker.end_extent()
+
+def _read_entries(path: str, runs: "OrderedDict[str, Dict[Tuple[str, int], Extent]]") -> int:
+    """Add one file's index entries to runs; returns the end of the indexed bytes"""
+    indexed_end = 0
+    try:
+        with open(index_path(path)) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn write at the end of the index
+                extents = runs.setdefault(entry["run_id"], {})
+                offset, length = entry["offset"], entry["length"]
+                # An extent indexed by both a reader and its writer appears twice; keep the longer
+                if (path, offset) not in extents or extents[(path, offset)][2] < length:
+                    extents[(path, offset)] = (path, offset, length, entry["events"])
+                indexed_end = max(indexed_end, offset + length)
+    except FileNotFoundError:
+        pass
+    return indexed_end
+
+def _scan(path: str, start: int, legacy_prefix: str = "") -> Iterator[Tuple[str, int, int]]:
+    """(run_id, offset, length) for each complete event after byte start
+
+    Events logged before run ids existed are grouped into one run per debate,
+    starting at its USER_INPUT event, with the id legacy-<offset>.
+    """
+    legacy_run = None
+    with open_log(path) as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # an event still being written
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                offset += len(line)
+                continue
+            run_id = entry.get("run_id")
+            if not run_id:
+                if entry.get("event_type") == "USER_INPUT" or legacy_run is None:
+                    legacy_run = f"legacy-{legacy_prefix}{offset}"
+                run_id = legacy_run
+            yield run_id, offset, len(line)
+            offset += len(line)
+
+def _needs_scan(path: str, indexed_end: int, indexed: bool) -> bool:
+    if is_compressed(path) or CLOSED_SEGMENT.match(os.path.basename(path)):
+        # Closed segments never grow, and their index was completed when they closed
+        return not indexed
+    return os.path.getsize(path) > indexed_end
+
+def load_index(log_path: str, update: bool = False) -> "OrderedDict[str, List[Extent]]":
+    """Extents of every run in log_path, across its rotated segments, in the order the runs started
+
+    Events past the end of a file's index (a run still in progress, a crashed
+    writer, or a log written before indexing) are found by scanning just that
+    tail; with update=True the scanned extents are appended to the index so
+    the next load doesn't scan them again.
+    """
+    runs: "OrderedDict[str, Dict[Tuple[str, int], Extent]]" = OrderedDict()
+    files = segment_paths(log_path)
+    for path in files:
+        indexed_end = _read_entries(path, runs)
+        if not _needs_scan(path, indexed_end, os.path.exists(index_path(path))):
+            continue
+
+        tracker = ExtentTracker(path) if update else None
+        legacy_prefix = "" if path == log_path else f"{os.path.basename(path)}@"
+        last: Dict[str, Tuple[str, int]] = {}
+        for run_id, offset, length in _scan(path, indexed_end, legacy_prefix):
+            extents = runs.setdefault(run_id, {})
+            key = last.get(run_id)
+            if key and extents[key][1] + extents[key][2] == offset:
+                _, start, size, events = extents[key]
+                extents[key] = (path, start, size + length, events + 1)
+            else:
+                key = last[run_id] = (path, offset)
+                extents[key] = (path, offset, length, 1)
+            if tracker:
+                tracker.record(run_id, offset, length)
+        if tracker:
+            tracker.end_extent()
+
+    order = {path: position for position, path in enumerate(files)}
+    def start(extent: Extent):
+        return order[extent[0]], extent[1]
+    return OrderedDict((run_id, sorted(extents.values(), key=start))
+                       for run_id, extents in sorted(runs.items(), key=lambda item: min(map(start, item[1].values()))))
+
+def qualified_run_id(log_path: str, run_id: str) -> str:
+    """run_id made unique across log files: legacy ids are byte offsets, so they get the log's name"""
+    return f"{os.path.basename(log_path)}:{run_id}" if run_id.startswith("legacy-") else run_id
+
+def list_runs(log_path: str) -> List[Tuple[str, int]]:
+    """(run_id, event count) for every run in the log"""
+    return [(run_id, sum(extent[3] for extent in extents))
+            for run_id, extents in load_index(log_path).items()]
+
+def _read_extents(path: str, extents: List[Extent]) -> Iterator[bytes]:
+    if is_compressed(path):
+        # gzip can't jump to an offset, but extents are sorted so each segment is decompressed once
+        with open_log(path) as f:
+            for _, offset, length, _ in extents:
+                f.seek(offset)
+                yield f.read(length)
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for _, offset, length, _ in extents:
+            yield data[offset:offset + length]
+
+def read_run(log_path: str, run_id: Optional[str] = None,
+             index: Optional[Dict[str, List[Extent]]] = None) -> List[Dict[str, Any]]:
+    """Events of one run (the latest when run_id is None), read straight from its byte ranges
+
+    Raises KeyError for an unknown run id.
+    """
+    index = load_index(log_path) if index is None else index
+    if not index:
+        return []
+    if run_id is None:
+        run_id = next(reversed(index))
+
+    events = []
+    # Extents are sorted by file, so each segment file is opened once
+    for path, extents in groupby(index[run_id], key=itemgetter(0)):
+        for data in _read_extents(path, list(extents)):
+            events.extend(json.loads(line) for line in data.splitlines())
+    return events
@@ -0,0 +1,132 @@
+import os
+import re
+import gzip
+import json
+import shutil
+import threading
+from typing import Any, Dict, Iterator, List
+from utils.config import Config
+
+# A log path names its active segment (logs/debate_log.jsonl). Rotation renames it
+# to a numbered closed segment (logs/debate_log.jsonl.00001), which is then
+# compressed (logs/debate_log.jsonl.00001.gz). Each segment has its own index,
+# whose offsets always refer to the uncompressed bytes.
+INDEX_SUFFIX = ".idx"
+COMPRESSED_SUFFIX = ".gz"
+CLOSED_SEGMENT = re.compile(r"^(?P<base>.+)\.(?P<seq>\d{5,})(?P<gz>\.gz)?$")
+
+# One compression at a time, so overlapping rotations never compress the same segment twice
+_compress_lock = threading.Lock()
+
+def index_path(log_path: str) -> str:
+    return log_path + INDEX_SUFFIX
+
+def is_compressed(path: str) -> bool:
+    return path.endswith(COMPRESSED_SUFFIX)
+
+def open_log(path: str, mode: str = "rb"):
+    """Open a log segment, decompressing transparently"""
+    return gzip.open(path, mode) if is_compressed(path) else open(path, mode)
+
+def _closed_segments(log_path: str) -> Dict[int, str]:
+    directory, base = os.path.split(log_path)
+    segments: Dict[int, str] = {}
+    try:
+        names = os.listdir(directory or ".")
+    except FileNotFoundError:
+        return segments
+    for name in names:
+        match = CLOSED_SEGMENT.match(name)
+        if match and match.group("base") == base:
+            seq = int(match.group("seq"))
+            # While a segment is being compressed both copies exist; either is complete
+            if match.group("gz") or seq not in segments:
+                segments[seq] = os.path.join(directory, name)
+    return segments
+
+def segment_paths(log_path: str) -> List[str]:
+    """Files holding log_path's events, oldest first: closed segments, then the active file
+
+    A closed segment passed directly is read on its own.
+    """
+    if CLOSED_SEGMENT.match(os.path.basename(log_path)) and os.path.exists(log_path):
+        return [log_path]
+    segments = _closed_segments(log_path)
+    paths = [segments[seq] for seq in sorted(segments)]
+    if os.path.exists(log_path):
+        paths.append(log_path)
+    return paths
+
+def find_logs(directory: str) -> List[str]:
+    """Log paths in a directory: every .jsonl file, and every log that only has closed segments"""
+    logs = set()
+    for name in os.listdir(directory):
+        match = CLOSED_SEGMENT.match(name)
+        if match:
+            logs.add(os.path.join(directory, match.group("base")))
+        elif name.endswith(".jsonl"):
+            logs.add(os.path.join(directory, name))
+    return sorted(logs)
+
+def iter_events(log_path: str) -> Iterator[Dict[str, Any]]:
+    """Every event of a log across its segments, in write order"""
+    for path in segment_paths(log_path):
+        with open_log(path) as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    yield json.loads(line)
+
+def next_segment_path(log_path: str) -> str:
+    segments = _closed_segments(log_path)
+    return f"{log_path}.{max(segments, default=0) + 1:05d}"
+
+def close_segment(log_path: str) -> str:
+    """Rename the active segment and its index to the next closed segment; returns its path
+
+    Callers must hold the log's ExtentTracker lock so no event is written mid-rename.
+    Compression runs in the background when Config.LOG_COMPRESS is set.
+    """
+    closed = next_segment_path(log_path)
+    os.replace(log_path, closed)
+    if os.path.exists(index_path(log_path)):
+        os.replace(index_path(log_path), index_path(closed))
+    if Config.LOG_COMPRESS:
+        # Not a daemon: interpreter exit waits for the segment to be written out
+        threading.Thread(target=compress_pending, args=(log_path,), name="log-compressor").start()
+    return closed
+
+def compress_segment(path: str, level: int = None) -> str:
+    """gzip a closed segment (streaming, constant memory) and replace it; returns the new path
+
+    The compressed file appears atomically, with its index in place first, so
+    readers always find one complete copy of the segment.
+    """
+    target = path + COMPRESSED_SUFFIX
+    partial = target + ".partial"
+    level = Config.LOG_COMPRESS_LEVEL if level is None else level
+    try:
+        with open(path, 'rb') as source, gzip.open(partial, 'wb', compresslevel=level) as sink:
+            shutil.copyfileobj(source, sink, 1024 * 1024)
+        if os.path.exists(index_path(path)):
+            shutil.copyfile(index_path(path), index_path(target))
+        os.replace(partial, target)
+    except OSError as e:
+        # The plain segment stays readable; compression is retried on the next rotation
+        print(f"⚠️ Warning: failed to compress log segment {path}: {e}")
+        if os.path.exists(partial):
+            os.remove(partial)
+        return path
+    os.remove(path)
+    if os.path.exists(index_path(path)):
+        os.remove(index_path(path))
+    return target
+
+def compress_pending(log_path: str):
+    """Compress every closed segment of log_path that isn't compressed yet
+
+    Also picks up segments left behind by a crash mid-compression.
+    """
+    with _compress_lock:
+        for path in _closed_segments(log_path).values():
+            if not is_compressed(path):
+                compress_segment(path)
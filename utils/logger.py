@@ -1,16 +1,185 @@
 import json
 import os
+import queue
+import atexit
+import threading
 from datetime import datetime
-from typing import Dict, Any
+from contextvars import ContextVar
+from typing import Callable, Dict, Any, Optional
+from utils.config import Config
+from utils.log_index import get_tracker
+
+# Logger of the debate run executing in the current context (see RunLogger)
+_current_logger: ContextVar[Optional["DebateLogger"]] = ContextVar("current_logger", default=None)
+
+class BufferedLogWriter:
+    """Process-wide background writer used by buffered DebateLoggers
+    
+    log_step() only enqueues a pre-serialized line; a single writer thread
+    drains the queue in batches, keeping one append handle open per log file,
+    so concurrent debates don't pay an open/write/close per event. A writer
+    that was stopped (see flush_buffered_logs) restarts on the next event.
+    """
+    
+    MAX_BATCH = 1024
+    
+    def __init__(self, flush_interval: float = 0.5, fsync: str = "never"):
+        self.flush_interval = flush_interval
+        self.fsync = fsync  # "never" | "event" | "batch" | "close" ("event" syncs every batch)
+        self._queue = queue.Queue()
+        self._handles = {}
+        # Orders enqueueing against stopping, so no event lands behind a "stop"
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def _put(self, message: tuple):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="debate-log-writer", daemon=True)
+                self._thread.start()
+            self._queue.put(message)
+    
+    def write(self, path: str, line: str, run_id: Optional[str] = None):
+        self._put(("line", path, line, run_id))
+    
+    def flush(self):
+        """Block until every line enqueued so far is on disk"""
+        self._put(("flush", None, None, None))
+        self._queue.join()
+    
+    def release(self, path: str):
+        """Flush and close the handle for one log file"""
+        self._put(("close", path, None, None))
+        self._queue.join()
+    
+    def close(self):
+        """Write out queued events and stop the thread (a later event starts it again)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return
+            self._queue.put(("stop", None, None, None))
+            self._queue.join()
+            self._thread.join()
+    
+    def _run(self):
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            # Collect more events until the interval elapses or a control message arrives
+            while batch[-1][0] == "line" and len(batch) < self.MAX_BATCH:
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    break
+            running = self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+        self._close_handles()
+    
+    def _write_batch(self, batch) -> bool:
+        pending: Dict[str, list] = {}
+        for kind, path, line, run_id in batch:
+            if kind == "line":
+                pending.setdefault(path, []).append((line, run_id))
+        
+        for path, lines in pending.items():
+            try:
+                tracker = get_tracker(path)
+                with tracker.lock:
+                    if tracker.before_write(sum(len(line) for line, _ in lines)):
+                        # Rotated: our handle still points at the closed segment
+                        self._close_handle(path)
+                    handle = self._handles.get(path)
+                    if handle is None:
+                        handle = self._handles[path] = open(path, 'a')
+                    # Other writers may have appended since; the index needs the true offset
+                    offset = handle.seek(0, os.SEEK_END)
+                    handle.write("".join(line for line, _ in lines))
+                    handle.flush()
+                    # Lines are ASCII (json.dumps escapes the rest), so characters are bytes
+                    for line, run_id in lines:
+                        tracker.record(run_id, offset, len(line))
+                        offset += len(line)
+                if self.fsync in ("event", "batch"):
+                    os.fsync(handle.fileno())
+            except OSError as e:
+                print(f"⚠️ Warning: failed to write {len(lines)} log events to {path}: {e}")
+        
+        kind, path, _, _ = batch[-1]
+        if kind == "close":
+            self._close_handle(path)
+        elif kind == "stop":
+            return False
+        return True
+    
+    def _close_handle(self, path: str):
+        handle = self._handles.pop(path, None)
+        if handle is not None:
+            get_tracker(path).end_extent()
+            if self.fsync != "never":
+                os.fsync(handle.fileno())
+            handle.close()
+    
+    def _close_handles(self):
+        for path in list(self._handles):
+            self._close_handle(path)
+
+_buffered_writer = None
+_buffered_writer_lock = threading.Lock()
+
+def get_buffered_writer() -> BufferedLogWriter:
+    """Start the shared writer thread on first use"""
+    global _buffered_writer
+    with _buffered_writer_lock:
+        if _buffered_writer is None:
+            _buffered_writer = BufferedLogWriter(flush_interval=Config.LOG_FLUSH_INTERVAL,
+                                                 fsync=Config.LOG_FSYNC)
+        return _buffered_writer
+
+@atexit.register
+def flush_buffered_logs():
+    """Write out anything still queued (runs on normal exit and after KeyboardInterrupt)"""
+    if _buffered_writer is not None:
+        _buffered_writer.close()
 
 class DebateLogger:
-    def __init__(self, log_file: str = None):
+    def __init__(self, log_file: str = None, buffered: Optional[bool] = None,
+                 on_event: Optional[Callable[[Dict[str, Any]], None]] = None):
         if log_file:
             self.log_file = log_file
         else:
             # Default to timestamped jsonl file if none provided
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             self.log_file = f"debate_log_{timestamp}.jsonl"
+        
+        self.buffered = Config.LOG_BUFFERED if buffered is None else buffered
+        self._writer = get_buffered_writer() if self.buffered else None
+        # Called with every entry after it is logged (e.g. to stream progress to a client)
+        self.on_event = on_event
+        # Debate the logged events belong to; indexed so readers can seek to one run
+        self.run_id = None
+        self._tracker = get_tracker(self.log_file)
+    
+    def start_run(self, run_id: str):
+        """Tag every following event with run_id (the debate id)"""
+        self.end_run()
+        self.run_id = run_id
+    
+    def end_run(self):
+        """Stop tagging events and index the run's last extent"""
+        if self.run_id is not None and not self._writer:
+            # Buffered loggers index theirs when the writer releases the file
+            self._tracker.end_extent()
+            if Config.LOG_FSYNC in ("batch", "close"):
+                # Unbuffered events are written one by one; sync them once per run
+                self._sync_log()
+        self.run_id = None
+    
+    def _sync_log(self):
+        with self._tracker.lock:
+            if os.path.exists(self.log_file):
+                with open(self.log_file, 'a') as f:
+                    os.fsync(f.fileno())
             
     def log_step(self, step_name: str, content: Any):
         """Log a step in JSONL format"""
@@ -19,6 +188,61 @@ class DebateLogger:
             "event_type": step_name,
             "payload": content
         }
+        if self.run_id is not None:
+            entry["run_id"] = self.run_id
+        # Serialize now so later mutations of the payload can't leak into the log
+        line = json.dumps(entry) + "\n"
+        
+        if self._writer:
+            self._writer.write(self.log_file, line, self.run_id)
+        else:
+            tracker = self._tracker
+            with tracker.lock:
+                tracker.before_write(len(line))
+                with open(self.log_file, 'a') as f:
+                    offset = f.tell()
+                    f.write(line)
+                    if Config.LOG_FSYNC == "event":
+                        f.flush()
+                        os.fsync(f.fileno())
+                tracker.record(self.run_id, offset, len(line))
         
-        with open(self.log_file, 'a') as f:
-            f.write(json.dumps(entry) + "\n")
\ No newline at end of file
+        if self.on_event:
+            self.on_event(entry)
+    
+    def flush(self):
+        """Wait until all buffered events of this process are written"""
+        if getattr(self, "_writer", None):
+            self._writer.flush()
+    
+    def close(self):
+        """Flush this logger's events and release its file handle"""
+        if getattr(self, "_writer", None):
+            self._writer.release(self.log_file)
+
+class RunLogger:
+    """Logger for graph nodes shared by many debate runs
+    
+    Forwards each event to the DebateLogger bound to the run executing in the
+    current context (see bind_logger), so one compiled graph can serve
+    concurrent debates that each write their own log file.
+    """
+    
+    def __init__(self):
+        self._default = None
+    
+    def log_step(self, step_name: str, content: Any):
+        logger = _current_logger.get()
+        if logger is None:
+            # Outside a bound run (e.g. a node called directly): use the configured log
+            if self._default is None:
+                self._default = DebateLogger(log_file=Config.LOG_PATH)
+            logger = self._default
+        logger.log_step(step_name, content)
+
+def bind_logger(logger: DebateLogger) -> Any:
+    """Route RunLogger events in this context to logger; returns a token for unbind_logger"""
+    return _current_logger.set(logger)
+
+def unbind_logger(token: Any):
+    _current_logger.reset(token)
\ No newline at end of file
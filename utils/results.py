@@ -0,0 +1,213 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from utils.config import Config
+from utils.state import debate_personas, role_seat, split_personas
+
+# Personas are logged by seat role in event names (ROUND_3_SCIENTIST, ROUND_3_PERSONA_3),
+# by name everywhere else
+ROUND_EVENT = re.compile(r"ROUND_(\d+)_(SCIENTIST|PHILOSOPHER|PERSONA_\d+)$")
+PERSONAS_PAYLOAD = re.compile(r"Starting debate between (.+ and .+)$")
+
+class ResultsStore:
+    """Completed debates in SQLite, one row per debate plus one per persona and per turn
+
+    Indexed on topic, personas, winner, model and completion time so outcome
+    queries don't have to scan and parse logs. agent_a/agent_b hold the first
+    two seats; the personas table has every seat.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One shared connection guarded by a lock; WAL lets other processes read while we write
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS debates (
+                debate_id TEXT PRIMARY KEY,
+                topic TEXT NOT NULL,
+                agent_a TEXT NOT NULL,
+                agent_b TEXT NOT NULL,
+                winner TEXT,
+                judgment TEXT,
+                model TEXT,
+                seed INTEGER,
+                rounds INTEGER NOT NULL,
+                completed_at REAL NOT NULL,
+                log_path TEXT
+            );
+            CREATE TABLE IF NOT EXISTS turns (
+                debate_id TEXT NOT NULL REFERENCES debates(debate_id) ON DELETE CASCADE,
+                turn INTEGER NOT NULL,
+                round INTEGER NOT NULL,
+                agent TEXT NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (debate_id, turn)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS personas (
+                debate_id TEXT NOT NULL REFERENCES debates(debate_id) ON DELETE CASCADE,
+                seat INTEGER NOT NULL,
+                persona TEXT NOT NULL,
+                PRIMARY KEY (debate_id, seat)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_personas_persona ON personas(persona);
+            CREATE INDEX IF NOT EXISTS idx_debates_topic ON debates(topic);
+            CREATE INDEX IF NOT EXISTS idx_debates_agent_a ON debates(agent_a, winner);
+            CREATE INDEX IF NOT EXISTS idx_debates_agent_b ON debates(agent_b, winner);
+            CREATE INDEX IF NOT EXISTS idx_debates_winner ON debates(winner);
+            CREATE INDEX IF NOT EXISTS idx_debates_model ON debates(model);
+            CREATE INDEX IF NOT EXISTS idx_debates_completed_at ON debates(completed_at);
+        """)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            # Stores written before the personas table only know the first two seats
+            self._conn.executescript("""
+                INSERT OR IGNORE INTO personas (debate_id, seat, persona) SELECT debate_id, 0, agent_a FROM debates;
+                INSERT OR IGNORE INTO personas (debate_id, seat, persona) SELECT debate_id, 1, agent_b FROM debates;
+                PRAGMA user_version = 1;
+            """)
+        self._conn.commit()
+
+    def record(self, result: Dict[str, Any], replace: bool = True) -> bool:
+        """Store one debate (see result_from_state); returns False if it was already stored and not replaced"""
+        return self.record_many([result], replace) == 1
+
+    def record_many(self, results: Iterable[Dict[str, Any]], replace: bool = True) -> int:
+        """Store debates in one transaction; returns how many were written"""
+        written = 0
+        with self._lock:
+            for result in results:
+                if not replace and self._conn.execute("SELECT 1 FROM debates WHERE debate_id = ?",
+                                                      (result["debate_id"],)).fetchone():
+                    continue
+                # Deleting first also drops the old turns (ON DELETE CASCADE)
+                self._conn.execute("DELETE FROM debates WHERE debate_id = ?", (result["debate_id"],))
+                self._conn.execute(
+                    "INSERT INTO debates (debate_id, topic, agent_a, agent_b, winner, judgment, model, seed, "
+                    "rounds, completed_at, log_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (result["debate_id"], result["topic"], result["agent_a"], result["agent_b"],
+                     result.get("winner"), result.get("judgment"), result.get("model"), result.get("seed"),
+                     len(result["turns"]), result["completed_at"], result.get("log_path")))
+                self._conn.executemany(
+                    "INSERT INTO personas (debate_id, seat, persona) VALUES (?, ?, ?)",
+                    [(result["debate_id"], seat, persona) for seat, persona in enumerate(result["personas"])])
+                self._conn.executemany(
+                    "INSERT INTO turns (debate_id, turn, round, agent, text) VALUES (?, ?, ?, ?, ?)",
+                    [(result["debate_id"], index, turn["round"], turn["agent"], turn["text"])
+                     for index, turn in enumerate(result["turns"])])
+                written += 1
+            self._conn.commit()
+        return written
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> List[tuple]:
+        """Run a read-only query against the store"""
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def count(self) -> int:
+        return self.query("SELECT COUNT(*) FROM debates")[0][0]
+
+    def win_rates(self, topic_contains: Optional[str] = None,
+                  since: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Debates, wins and win rate per persona (every seat), optionally for topics containing a phrase"""
+        filters, params = [], []
+        if topic_contains:
+            filters.append("topic LIKE ?")
+            params.append(f"%{topic_contains}%")
+        if since is not None:
+            filters.append("completed_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        rows = self.query(f"""
+            SELECT persona, COUNT(*), SUM(winner IS persona)
+            FROM personas JOIN debates USING (debate_id) {where}
+            GROUP BY persona ORDER BY persona""", params)
+        return {persona: {"debates": debates, "wins": wins, "win_rate": round(wins / debates, 3)}
+                for persona, debates, wins in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def result_from_state(state: Dict[str, Any], log_path: Optional[str] = None,
+                      model: Optional[str] = None) -> Dict[str, Any]:
+    """Results row for a finished debate's final state"""
+    return {
+        "debate_id": state["debate_id"],
+        "topic": state["topic"],
+        "agent_a": state["agent_a_persona"],
+        "agent_b": state["agent_b_persona"],
+        "personas": debate_personas(state),
+        "winner": state.get("winner"),
+        "judgment": state.get("judgment"),
+        "model": model,
+        "seed": state.get("seed"),
+        "turns": [{"round": turn.get("round", index + 1), "agent": turn["agent"], "text": turn["text"]}
+                  for index, turn in enumerate(state["turns"])],
+        "completed_at": datetime.now().timestamp(),
+        "log_path": log_path,
+    }
+
+def result_from_events(debate_id: str, events: List[Dict[str, Any]],
+                       log_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Results row rebuilt from one run's log events, or None if the debate never got a verdict"""
+    result = {"debate_id": debate_id, "topic": None, "agent_a": Config.AGENT_A_PERSONA,
+              "agent_b": Config.AGENT_B_PERSONA, "winner": None, "judgment": None, "model": None,
+              "seed": None, "turns": [], "completed_at": None, "log_path": log_path}
+    personas = result["personas"] = [result["agent_a"], result["agent_b"]]
+    summary, reasoning = "", ""
+
+    for entry in events:
+        event, payload = entry.get("event_type") or "", entry.get("payload")
+        round_event = ROUND_EVENT.match(event)
+        if event == "USER_INPUT" and str(payload).startswith("Debate Topic: "):
+            result["topic"] = payload.split(": ", 1)[1]
+        elif event == "INITIALIZATION" and PERSONAS_PAYLOAD.match(str(payload)):
+            personas = result["personas"] = split_personas(PERSONAS_PAYLOAD.match(payload).group(1))
+            result["agent_a"], result["agent_b"] = personas[:2]
+        elif round_event:
+            seat = role_seat(round_event.group(2))
+            agent = personas[seat] if seat < len(personas) else round_event.group(2).title()
+            result["turns"].append({"round": int(round_event.group(1)), "agent": agent, "text": str(payload),
+                                    "seat": seat})
+        elif event == "JUDGE_SUMMARY":
+            summary = str(payload)
+        elif event == "JUDGE_WINNER":
+            result["winner"] = str(payload).replace("Winner: ", "")
+            result["completed_at"] = datetime.fromisoformat(entry["timestamp"]).timestamp()
+        elif event == "JUDGE_REASONING":
+            reasoning = str(payload)
+
+    if result["winner"] is None or result["topic"] is None:
+        return None
+    # Turns of a parallel round are logged as they finish; the debate orders them by seat
+    result["turns"].sort(key=lambda turn: (turn["round"], turn["seat"]))
+    for turn in result["turns"]:
+        del turn["seat"]
+    # Same layout as the judge's state["judgment"]
+    result["judgment"] = f"{summary}\n\nWinner: {result['winner']}\nReasoning: {reasoning}"
+    return result
+
+# Process-wide store, opened on first use when Config.RESULTS_ENABLED is set
+_store = None
+_store_lock = threading.Lock()
+
+def get_results_store() -> Optional[ResultsStore]:
+    """Return the shared results store, or None when recording results is off"""
+    global _store
+    if not Config.RESULTS_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None or _store.path != Config.RESULTS_PATH:
+            _store = ResultsStore(Config.RESULTS_PATH)
+        return _store
@@ -0,0 +1,183 @@
+import time
+import random
+import asyncio
+import threading
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from utils.config import Config
+from utils.tracing import record_retry
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: rate limiting and transient server-side failures
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+RETRYABLE_NAMES = {"ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+                   "DeadlineExceeded", "GatewayTimeout", "Aborted", "TimeoutError", "ConnectionError"}
+# Message fallbacks for errors without a status: rate limiting and unavailability only
+RETRYABLE_MARKERS = ("429", "resource exhausted", "rate limit", "503", "unavailable")
+# Quota or billing failures that won't clear by waiting, even when reported as a 429
+PERMANENT_MARKERS = ("billing", "insufficient_quota", "exceeded your current quota", "limit: 0")
+
+class RetryBudgetExhausted(Exception):
+    """The current debate has used up its retries"""
+
+class PartialOutputError(Exception):
+    """A streamed call failed after output was delivered; retrying would repeat it"""
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate_per_min, holding at most one minute's worth
+
+    reserve() never blocks: it takes the tokens (possibly going into debt) and
+    returns how long the caller must wait before using them, so the same
+    bucket serves threads (time.sleep) and event loops (asyncio.sleep).
+    """
+
+    def __init__(self, rate_per_min: float):
+        self.rate = rate_per_min / 60.0
+        self.capacity = float(rate_per_min)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Requests larger than the bucket would never fit; cap them to a full bucket
+            self._tokens -= min(amount, self.capacity)
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float):
+        """Return over-reserved tokens (negative amounts charge the difference)"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+class RetryBudget:
+    """Retries one debate may spend across all of its model calls"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+# Budget of the debate running in the current context (None: unlimited)
+_current_budget: ContextVar[Optional[RetryBudget]] = ContextVar("current_retry_budget", default=None)
+
+def start_retry_budget(limit: Optional[int] = None) -> Any:
+    """Give the current run a fresh retry budget; returns a token for stop_retry_budget"""
+    return _current_budget.set(RetryBudget(Config.RETRY_BUDGET if limit is None else limit))
+
+def stop_retry_budget(token: Any):
+    _current_budget.reset(token)
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limiting (429) and transient server or network errors"""
+    if isinstance(error, (RetryBudgetExhausted, PartialOutputError)):
+        return False
+    message = str(error).lower()
+    if any(marker in message for marker in PERMANENT_MARKERS):
+        return False
+    code = getattr(error, "code", None)
+    code = getattr(code, "value", code)  # grpc status codes wrap the number
+    if isinstance(code, int) and code in RETRYABLE_STATUS:
+        return True
+    if type(error).__name__ in RETRYABLE_NAMES or isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return any(marker in message for marker in RETRYABLE_MARKERS)
+
+class CallScheduler:
+    """Admits model calls under request and token rate limits and retries transient failures
+
+    Waits use the token buckets so batch runs stay just under quota; failed
+    calls back off exponentially with full jitter so concurrent debates that
+    hit a 429 together don't retry in lockstep.
+    """
+
+    def __init__(self, requests_per_min: float = 0, tokens_per_min: float = 0, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 30.0):
+        self.requests = TokenBucket(requests_per_min) if requests_per_min > 0 else None
+        self.tokens = TokenBucket(tokens_per_min) if tokens_per_min > 0 else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = random.Random()
+
+    def _admission_delay(self, estimated_tokens: int) -> float:
+        delay = 0.0
+        if self.requests:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens:
+            delay = max(delay, self.tokens.reserve(estimated_tokens))
+        return delay
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token bucket once a call's real usage is known"""
+        if self.tokens:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number attempt (1-based), or raise if retrying isn't allowed"""
+        if attempt > self.max_retries or not is_retryable(error):
+            raise error
+        budget = _current_budget.get()
+        if budget is not None and not budget.take():
+            raise RetryBudgetExhausted(f"Retry budget of {budget.limit} exhausted: {error}") from error
+        record_retry()
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def call(self, fn: Callable[[], T], estimated_tokens: int = 0) -> T:
+        attempt = 0
+        while True:
+            delay = self._admission_delay(estimated_tokens)
+            if delay:
+                time.sleep(delay)
+            try:
+                return fn()
+            except Exception as e:
+                self.settle(estimated_tokens, 0)
+                attempt += 1
+                time.sleep(self._backoff(attempt, e))
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], estimated_tokens: int = 0) -> T:
+        attempt = 0
+        while True:
+            delay = self._admission_delay(estimated_tokens)
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                return await fn()
+            except Exception as e:
+                self.settle(estimated_tokens, 0)
+                attempt += 1
+                await asyncio.sleep(self._backoff(attempt, e))
+
+# Process-wide scheduler, so every debate draws from the same quota
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> CallScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = CallScheduler(
+                requests_per_min=Config.RATE_LIMIT_RPM,
+                tokens_per_min=Config.RATE_LIMIT_TPM,
+                max_retries=Config.MAX_RETRIES,
+                base_delay=Config.RETRY_BASE_DELAY,
+                max_delay=Config.RETRY_MAX_DELAY
+            )
+        return _scheduler
+
+def reset_scheduler():
+    """Rebuild the scheduler from Config on next use (e.g. after changing limits)"""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
@@ -1,42 +1,165 @@
-from typing import Dict, List, Optional, TypedDict, Any
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field, fields, asdict
+from typing import Annotated, Dict, List, Optional, TypedDict, Any
 from enum import Enum
+from utils.config import Config
 
 class AgentType(Enum):
     SCIENTIST = "Scientist"
     PHILOSOPHER = "Philosopher"
 
+def seat_role(seat: int) -> str:
+    """Role of a persona seat in event names (ROUND_3_SCIENTIST)
+    
+    The first two seats keep their AgentType names; further seats are PERSONA_<n>.
+    """
+    agent_types = list(AgentType)
+    return agent_types[seat].name if seat < len(agent_types) else f"PERSONA_{seat + 1}"
+
+def role_seat(role: str) -> Optional[int]:
+    """Inverse of seat_role (None for an unknown role)"""
+    if role in AgentType.__members__:
+        return list(AgentType.__members__).index(role)
+    if role.startswith("PERSONA_") and role[len("PERSONA_"):].isdigit():
+        return int(role[len("PERSONA_"):]) - 1
+    return None
+
+def join_personas(personas: List[str]) -> str:
+    """'A and B', 'A, B and C' (parsed back by split_personas)"""
+    return f"{', '.join(personas[:-1])} and {personas[-1]}"
+
+def split_personas(text: str) -> List[str]:
+    first, last = text.rsplit(" and ", 1)
+    return first.split(", ") + [last]
+
+@dataclass(slots=True)
+class Turn:
+    """One argument in the debate
+    
+    Slotted to keep long debates small; optional measurements stay None
+    unless recorded. Supports dict-style access (turn["text"], turn.get("round"))
+    so code written against plain turn dicts keeps working.
+    """
+    round: int
+    agent: str
+    text: str
+    # time.monotonic() when the turn was recorded (orders turns within a process)
+    timestamp: float = field(default_factory=time.monotonic)
+    drift_score: Optional[float] = None
+    ttft_ms: Optional[float] = None
+    generation_ms: Optional[float] = None
+    
+    def __post_init__(self):
+        # Every turn of a persona shares one name string, also after a checkpoint restore
+        self.agent = sys.intern(self.agent)
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key: str, value: Any):
+        if key not in TURN_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in TURN_FIELDS
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict without the unset measurements (e.g. for JSON)"""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+TURN_FIELDS = frozenset(f.name for f in fields(Turn))
+
+def debate_personas(state: Dict[str, Any]) -> List[str]:
+    """Personas of a debate in seat order (states saved before personas existed have two)"""
+    return state.get("personas") or [state["agent_a_persona"], state["agent_b_persona"]]
+
+def merge_pending(current: Optional[Dict[str, Turn]], update: Optional[Dict[str, Turn]]) -> Dict[str, Turn]:
+    """Reducer for turns generated in parallel: merge by persona, None clears
+    
+    Merging is idempotent, so nodes that return the whole state don't duplicate turns.
+    """
+    if update is None:
+        return {}
+    return {**(current or {}), **update}
+
 class DebateState(TypedDict):
+    debate_id: str
     topic: str
     current_round: int
     current_agent: Optional[AgentType]
     
-    # New structured memory format
-    # "turns": [{"round":1, "agent":"...", "text":"...", "meta":{...}}]
-    turns: List[Dict[str, Any]]
+    # Per-run participants in speaking order (default to the two Config personas);
+    # agent_a_persona/agent_b_persona mirror the first two seats
+    personas: List[str]
+    agent_a_persona: str
+    agent_b_persona: str
+    # Seats speaking next: one for a sequential turn, several for a parallel round
+    next_speakers: List[int]
+    seed: Optional[int]
+    max_rounds: int  # total turns before the judge (defaults to Config.MAX_ROUNDS)
+    
+    # Structured memory: one Turn per argument, in order
+    turns: List[Turn]
+    
+    # Turns of the speakers running now, by persona; MemoryNode moves them into turns
+    pending_turns: Annotated[Dict[str, Turn], merge_pending]
+    
+    # Per-persona indexes into turns, maintained incrementally by MemoryNode
+    persona_turns: Dict[str, List[int]]
     
     # Context slices for agents
     agent_a_memory: List[str] # Keeping as simplified list for now, or can be derived
     agent_b_memory: List[str]
     
+    # Memory context for each persona's next turn (the first two seats also in agent_*_context)
+    contexts: Dict[str, str]
     agent_a_context: str
     agent_b_context: str
     
     is_complete: bool
     winner: Optional[str]
     judgment: str
+    # Judge panel votes, when JUDGE_PANEL_SIZE > 1 (see JudgeNode._record_panel)
+    panel: Dict[str, Any]
+    
+    # Running summary of turns[:summarized_turns] for the judge (see RunningSummaryNode)
     summary: str
+    summarized_turns: int
 
 def create_initial_state() -> DebateState:
+    personas = list(Config.PERSONAS) or [Config.AGENT_A_PERSONA, Config.AGENT_B_PERSONA]
     return {
+        "debate_id": uuid.uuid4().hex,
         "topic": "",
         "current_round": 0,
         "current_agent": None,
+        "personas": personas,
+        "agent_a_persona": personas[0],
+        "agent_b_persona": personas[1],
+        "next_speakers": [],
+        "seed": Config.SEED,
+        "max_rounds": Config.MAX_ROUNDS,
         "turns": [],
+        "pending_turns": {},
+        "persona_turns": {},
         "agent_a_memory": [],
         "agent_b_memory": [],
+        "contexts": {},
         "agent_a_context": "",
         "agent_b_context": "",
         "is_complete": False,
         "winner": None,
-        "judgment": ""
+        "judgment": "",
+        "panel": {},
+        "summary": "",
+        "summarized_turns": 0
     }
\ No newline at end of file
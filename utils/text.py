@@ -0,0 +1,144 @@
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for budgeting prompts"""
+    return (len(text) + 3) // 4
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to roughly `max_tokens` tokens, marking the cut"""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max(0, max_chars - 3)].rstrip() + "..."
+
+def repetition_words(text: str) -> FrozenSet[str]:
+    """Words considered by the repetition check (lowercased, longer than 3 chars)"""
+    return frozenset(w for w in text.lower().split() if len(w) > 3)
+
+class RepetitionIndex:
+    """Incremental index of earlier turns for the 70%-overlap repetition check
+    
+    Turns are added once as they arrive. A check only has to look at turns
+    sharing one of the query's rarest words (prefix filtering): a turn that
+    overlaps more than `threshold` of the query's words must contain at least
+    one word of any (len(words) - required + 1)-word subset of the query.
+    """
+    
+    def __init__(self, threshold: float = 0.7):
+        self.threshold = threshold
+        self.turn_words: List[FrozenSet[str]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+    
+    @property
+    def size(self) -> int:
+        return len(self.turn_words)
+    
+    def add(self, text: str):
+        turn_id = len(self.turn_words)
+        words = repetition_words(text)
+        self.turn_words.append(words)
+        for word in words:
+            self.postings[word].append(turn_id)
+    
+    def extend(self, texts: Iterable[str]):
+        for text in texts:
+            self.add(text)
+    
+    def is_repeated(self, text: str) -> bool:
+        """True if `text` shares more than `threshold` of its words with an indexed turn"""
+        words = repetition_words(text)
+        if not words:
+            return False
+        
+        limit = len(words) * self.threshold
+        required = int(limit) + 1  # smallest overlap strictly greater than limit
+        
+        # Rarest words first; only their postings can hold a matching turn
+        ranked = sorted(words, key=lambda w: len(self.postings.get(w, ())))
+        candidates = set()
+        for word in ranked[:len(words) - required + 1]:
+            candidates.update(self.postings.get(word, ()))
+        
+        return any(len(words & self.turn_words[turn_id]) > limit for turn_id in candidates)
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just like me more most my myself no nor not now of off on once only or other our ours ourselves
+out over own same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which while
+who whom why will with would you your yours yourself yourselves
+""".split())
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# (suffix, replacement) pairs tried in order; first match wins within each step
+_PLURAL_SUFFIXES = (("sses", "ss"), ("ies", "i"), ("ss", "ss"), ("s", ""))
+_VERB_SUFFIXES = (("eed", "ee"), ("ing", ""), ("ed", ""))
+_DERIVATIONAL_SUFFIXES = (
+    ("ational", "ate"), ("ization", "ize"), ("fulness", "ful"), ("iveness", "ive"),
+    ("ousness", "ous"), ("tional", "tion"), ("ation", "ate"), ("ement", ""), ("ment", ""),
+    ("ness", ""), ("ity", ""), ("ful", ""), ("ly", ""), ("al", ""),
+)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+def _strip_suffix(word: str, suffixes) -> str:
+    for suffix, replacement in suffixes:
+        if word.endswith(suffix):
+            stem = word[:len(word) - len(suffix)] + replacement
+            return stem if len(stem) >= 3 else word
+    return word
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Small Porter-style stemmer: regulated, regulation and regulations all map to 'regulat'"""
+    if len(word) <= 3:
+        return word
+    word = _strip_suffix(word, _PLURAL_SUFFIXES)
+    word = _strip_suffix(word, _VERB_SUFFIXES)
+    word = _strip_suffix(word, _DERIVATIONAL_SUFFIXES)
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    elif len(word) > 3 and word.endswith("y"):
+        word = word[:-1] + "i"
+    return word
+
+def content_stems(text: str) -> Set[str]:
+    """Stemmed tokens of `text` with stopwords removed"""
+    return {stem(t) for t in tokenize(text) if t not in STOPWORDS}
+
+class CoherenceScorer:
+    """Topic model for drift scoring, built once per topic
+    
+    drift_score() is 0.0 when an argument mentions every topic term and 1.0
+    when it mentions none; each argument token costs one stem + set lookup.
+    """
+    
+    def __init__(self, topic: str):
+        self.topic = topic
+        self.topic_stems = frozenset(content_stems(topic))
+    
+    def drift_score(self, text: str) -> Optional[float]:
+        """Fraction of topic terms missing from `text`, or None if the topic has no terms"""
+        if not self.topic_stems:
+            return None
+        matched = set()
+        for token in tokenize(text):
+            if token in STOPWORDS:
+                continue
+            token_stem = stem(token)
+            if token_stem in self.topic_stems:
+                matched.add(token_stem)
+        return 1.0 - len(matched) / len(self.topic_stems)
+
+@lru_cache(maxsize=256)
+def coherence_scorer(topic: str) -> CoherenceScorer:
+    """Shared scorer per topic, so each debate builds its topic model once"""
+    return CoherenceScorer(topic)
\ No newline at end of file
@@ -0,0 +1,137 @@
+import time
+import inspect
+import functools
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Union
+from utils.logger import DebateLogger
+
+# Span of the graph node currently executing, and the recorder of the current run.
+# Context variables follow LangGraph into worker threads and asyncio tasks.
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_current_recorder: ContextVar[Optional["SpanRecorder"]] = ContextVar("current_recorder", default=None)
+
+class Span:
+    """Timing and model-usage counters for one execution of a graph node"""
+
+    FIELDS = ("llm_ms", "llm_calls", "cache_hits", "prompt_chars", "response_chars",
+              "prompt_tokens", "response_tokens", "retries")
+
+    def __init__(self, node: str):
+        self.node = node
+        self.wall_ms = 0.0
+        self.counters = dict.fromkeys(self.FIELDS, 0)
+        # Concurrent judge requests update the same span from two threads
+        self._lock = threading.Lock()
+
+    def add(self, **values):
+        with self._lock:
+            for key, value in values.items():
+                self.counters[key] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"node": self.node, "wall_ms": round(self.wall_ms, 2)}
+        data.update(self.counters)
+        data["llm_ms"] = round(data["llm_ms"], 2)
+        return data
+
+class SpanRecorder:
+    """Collects the spans of one debate run and summarizes them per node"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        totals: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            row = totals.setdefault(span.node, {"calls": 0, "wall_ms": 0.0, **dict.fromkeys(Span.FIELDS, 0)})
+            row["calls"] += 1
+            row["wall_ms"] += span.wall_ms
+            for key, value in span.counters.items():
+                row[key] += value
+        for row in totals.values():
+            row["wall_ms"] = round(row["wall_ms"], 2)
+            row["llm_ms"] = round(row["llm_ms"], 2)
+            # Time spent in the node outside model calls
+            row["overhead_ms"] = round(max(0.0, row["wall_ms"] - row["llm_ms"]), 2)
+        return totals
+
+    def format_table(self) -> str:
+        totals = self.summary()
+        run_ms = sum(row["wall_ms"] for row in totals.values()) or 1.0
+        lines = [f"{'node':<12}{'calls':>7}{'wall ms':>11}{'llm ms':>11}{'overhead':>10}"
+                 f"{'tokens in':>11}{'tokens out':>12}{'retries':>9}{'share':>8}"]
+        for node, row in sorted(totals.items(), key=lambda item: -item[1]["wall_ms"]):
+            lines.append(f"{node:<12}{row['calls']:>7}{row['wall_ms']:>11.1f}{row['llm_ms']:>11.1f}"
+                         f"{row['overhead_ms']:>10.1f}{row['prompt_tokens']:>11}{row['response_tokens']:>12}"
+                         f"{row['retries']:>9}{row['wall_ms'] / run_ms:>8.0%}")
+        return "\n".join(lines)
+
+def start_recording() -> Any:
+    """Begin collecting spans for the current run; returns a token for stop_recording"""
+    return _current_recorder.set(SpanRecorder())
+
+def stop_recording(token: Any) -> Optional[SpanRecorder]:
+    recorder = _current_recorder.get()
+    _current_recorder.reset(token)
+    return recorder
+
+def record_llm_call(prompt: str, response: str, elapsed_s: float, prompt_tokens: int,
+                    response_tokens: int, cached: bool = False):
+    """Attribute one model call to the node currently executing (no-op outside a span)"""
+    span = _current_span.get()
+    if span is None:
+        return
+    span.add(llm_ms=elapsed_s * 1000, llm_calls=0 if cached else 1, cache_hits=1 if cached else 0,
+             prompt_chars=len(prompt), response_chars=len(response),
+             prompt_tokens=prompt_tokens, response_tokens=response_tokens)
+
+def record_retry(count: int = 1):
+    span = _current_span.get()
+    if span is not None:
+        span.add(retries=count)
+
+def traced(node: Union[str, Callable[[Any], str]], fn: Callable, logger: DebateLogger) -> Callable:
+    """Wrap a graph node so each execution is logged as a SPAN event
+
+    node is the span name, or a function of the node's input returning it
+    (e.g. one name per persona for a node that serves several).
+    """
+    span_name = node if callable(node) else lambda state: node
+
+    def finish(span: Span, started: float):
+        span.wall_ms = (time.perf_counter() - started) * 1000
+        logger.log_step("SPAN", span.to_dict())
+        recorder = _current_recorder.get()
+        if recorder is not None:
+            recorder.add(span)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(state):
+            span = Span(span_name(state))
+            token = _current_span.set(span)
+            started = time.perf_counter()
+            try:
+                return await fn(state)
+            finally:
+                _current_span.reset(token)
+                finish(span, started)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(state):
+        span = Span(span_name(state))
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            return fn(state)
+        finally:
+            _current_span.reset(token)
+            finish(span, started)
+    return wrapper